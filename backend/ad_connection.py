@@ -1,13 +1,361 @@
-from ldap3 import Server, Connection, ALL, SUBTREE, ALL_ATTRIBUTES, MODIFY_REPLACE, MODIFY_ADD, MODIFY_DELETE
+from ldap3 import Server, Connection, ALL, BASE, LEVEL, SUBTREE, ALL_ATTRIBUTES, MODIFY_REPLACE, MODIFY_ADD, MODIFY_DELETE
+from ldap3.utils.ciDict import CaseInsensitiveDict
+from ldap3.core.exceptions import LDAPBindError
+from ldap3.utils.conv import escape_filter_chars
+from ldap3.utils.dn import parse_dn
+from ldap3.protocol.formatters.formatters import format_sid
 import ldap3
-from typing import List, Optional
-from datetime import datetime, timedelta
+import os
+import re
+import string
+import json
+import tempfile
+import threading
+import contextvars
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import LDAP_SEARCH_DURATION, LDAP_SEARCH_ENTRIES, LDAP_SEARCH_ERRORS, LDAP_BINDS, record_cache_access
+from tracing import record_operation
+from server_pool import get_dc_pool, create_transient_pool, DomainControllerPool, RECEIVE_TIMEOUT, SCHEMA_CACHE_DIR
+from ou_tree import OUTree, OBJECT_COMPUTER, OBJECT_USER, ou_path_to_dn, parent_dn
+from lookup import LookupIndex, rank
+from last_logon import LastLogonTable, LASTLOGON_DISCOVER_DCS, LASTLOGON_FILTER, sweep, to_filetime
+from password_expiry import PasswordExpiryIndex, compute_expiry, parse_max_pwd_age
+from paging import (
+    Snapshot, mark_vlv_rejected, page_bounds, page_result, snapshot_cache, sort_control, vlv_available,
+    vlv_control, vlv_result
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Global Catalog aramalarının kökü (boş: tüm orman)
+GC_BASE_DN = os.getenv("LDAP_GC_BASE_DN", "")
+
+# GC'ye çoğaltılan (Partial Attribute Set) ve bu uygulamanın kullandığı attribute'lar
+GC_PARTIAL_ATTRIBUTES = {
+    'distinguishedname', 'objectclass', 'objectcategory', 'objectsid', 'objectguid',
+    'cn', 'name', 'samaccountname', 'userprincipalname', 'displayname', 'givenname', 'sn',
+    'mail', 'useraccountcontrol', 'memberof', 'member', 'grouptype', 'dnshostname',
+    'operatingsystem', 'whencreated', 'whenchanged', 'description', 'managedby',
+}
+
+# Sayfalı aramalarda sayfa boyutu (AD MaxPageSize varsayılanı 1000)
+LDAP_PAGE_SIZE = int(os.getenv("LDAP_PAGE_SIZE", 1000))
+PAGED_RESULTS_OID = "1.2.840.113556.1.4.319"
+
+# DC başına boşta açık tutulan ek bağlantı sayısı (paralel aramalar, toplu yazmalar)
+LDAP_WORKER_CONNECTIONS = int(os.getenv("LDAP_WORKER_CONNECTIONS", 4))
+# Ek bağlantı havuzu tutulan en fazla (DC, kullanıcı) çifti; en eski kullanılanın bağlantıları kapatılır
+LDAP_WORKER_POOLS_MAX = 8
+
+# Toplu taşımada aynı anda çalışan modify_dn işlemleri (her biri ayrı bağlantıda)
+BULK_MOVE_MAX_WORKERS = int(os.getenv("BULK_MOVE_MAX_WORKERS", 4))
+# Toplu DN çözümlemede tek OR filtresine konan en fazla ad
+BULK_LOOKUP_CHUNK = 100
+# Üyelik eşitlemede tek modify işlemindeki en fazla member değeri
+MEMBERSHIP_MODIFY_CHUNK = int(os.getenv("MEMBERSHIP_MODIFY_CHUNK", 1000))
+
+# SID -> ad önbelleği: en fazla kayıt, kalıcı dosya, bulunamayan SID'lerin tekrar aranmadığı süre (saniye)
+SID_CACHE_MAX = int(os.getenv("SID_CACHE_MAX", 50000))
+SID_CACHE_FILE = os.getenv("SID_CACHE_FILE") or os.path.join(SCHEMA_CACHE_DIR, "sid_names.json")
+SID_CACHE_NEGATIVE_TTL = float(os.getenv("SID_CACHE_NEGATIVE_TTL", 300))
+# Yeni SID'ler bu süre (saniye) biriktirilip dosyaya tek seferde yazılır; kapanışta kalanlar yazılır
+SID_CACHE_FLUSH_DELAY = float(os.getenv("SID_CACHE_FLUSH_DELAY", 30))
+
+# Dizinde obje karşılığı olmayan (veya her domain'de aynı olan) iyi bilinen SID'ler
+WELL_KNOWN_SIDS = {
+    'S-1-0-0': 'Nobody',
+    'S-1-1-0': 'Everyone',
+    'S-1-2-0': 'Local',
+    'S-1-3-0': 'Creator Owner',
+    'S-1-3-1': 'Creator Group',
+    'S-1-5-2': 'Network',
+    'S-1-5-4': 'Interactive',
+    'S-1-5-6': 'Service',
+    'S-1-5-7': 'Anonymous Logon',
+    'S-1-5-9': 'Enterprise Domain Controllers',
+    'S-1-5-10': 'Principal Self',
+    'S-1-5-11': 'Authenticated Users',
+    'S-1-5-15': 'This Organization',
+    'S-1-5-18': 'Local System',
+    'S-1-5-19': 'Local Service',
+    'S-1-5-20': 'Network Service',
+    'S-1-5-32-544': 'Administrators',
+    'S-1-5-32-545': 'Users',
+    'S-1-5-32-546': 'Guests',
+    'S-1-5-32-548': 'Account Operators',
+    'S-1-5-32-549': 'Server Operators',
+    'S-1-5-32-550': 'Print Operators',
+    'S-1-5-32-551': 'Backup Operators',
+    'S-1-5-32-552': 'Replicator',
+    'S-1-5-32-554': 'Pre-Windows 2000 Compatible Access',
+    'S-1-5-32-555': 'Remote Desktop Users',
+    'S-1-5-32-556': 'Network Configuration Operators',
+    'S-1-5-32-560': 'Windows Authorization Access Group',
+    'S-1-5-32-562': 'Distributed COM Users',
+    'S-1-5-32-568': 'IIS_IUSRS',
+    'S-1-5-32-569': 'Cryptographic Operators',
+    'S-1-5-32-573': 'Event Log Readers',
+    'S-1-5-32-574': 'Certificate Service DCOM Access',
+    'S-1-5-32-580': 'Remote Management Users',
+}
+
+
+class SidResolver:
+    """
+    SID -> ad (cn) çözümleyici (thread-safe).
+    İyi bilinen SID'ler tablodan, diğerleri LRU önbellekten gelir; önbellekte olmayanlar çağıranın
+    lookup fonksiyonuyla tek seferde aranır. Önbellek yeniden başlatmada dosyadan okunur; yeni kayıtlar
+    istek thread'inde değil, flush_delay sonra arka planda (ve flush ile kapanışta) tek yazımla
+    dosyaya aktarılır. SID objenin ömrü boyunca değişmez; yeniden adlandırılan objenin eski adı
+    LRU'dan düşene veya dosya silinene kadar görünür. Bulunamayan SID'ler SID_CACHE_NEGATIVE_TTL
+    boyunca tekrar aranmaz.
+    """
+
+    def __init__(self, path: Optional[str] = SID_CACHE_FILE, max_entries: int = SID_CACHE_MAX,
+                 negative_ttl: float = SID_CACHE_NEGATIVE_TTL, flush_delay: float = SID_CACHE_FLUSH_DELAY):
+        self.path = path
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.flush_delay = flush_delay
+        self._names: "OrderedDict[str, str]" = OrderedDict()
+        self._unresolved: Dict[str, float] = {}
+        self._loaded = False
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Dosya yazımları sırayla yapılır
+        self._save_lock = threading.Lock()
+
+    def _load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                # Dosya en eskiden en yeniye sıralıdır
+                for sid, name in json.load(f):
+                    self._names[sid] = name
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"SID önbelleği okunamadı ({self.path}): {str(e)}")
+
+    def _schedule_flush(self):
+        """_lock altında çağrılır: bekleyen zamanlayıcı yoksa flush_delay sonra yazım planla"""
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Değişiklik varsa önbelleği dosyaya yaz"""
+        with self._save_lock:
+            with self._lock:
+                timer, self._timer = self._timer, None
+                if not self._dirty or not self.path:
+                    return
+                self._dirty = False
+                items = list(self._names.items())
+            if timer is not None:
+                timer.cancel()
+            tmp_path = None
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # Yarım yazılmış dosya okunmasın diye yazım başına ayrı geçici dosya kullanılır
+                fd, tmp_path = tempfile.mkstemp(prefix=".sid_names.", suffix=".tmp", dir=directory)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(items, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"SID önbelleği yazılamadı ({self.path}): {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                with self._lock:
+                    self._dirty = True
+
+    def resolve(self, sids: Iterable[str], lookup: Callable[[List[str]], Dict[str, str]]) -> Dict[str, str]:
+        """Çözümlenebilen SID'ler için {SID: ad}; lookup yalnızca bilinmeyen SID'lerle bir kez çağrılır"""
+        sids = list(dict.fromkeys(sids))
+        names: Dict[str, str] = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            for sid in sids:
+                if sid in WELL_KNOWN_SIDS:
+                    names[sid] = WELL_KNOWN_SIDS[sid]
+                elif sid in self._names:
+                    self._names.move_to_end(sid)
+                    names[sid] = self._names[sid]
+                elif now - self._unresolved.get(sid, float('-inf')) > self.negative_ttl:
+                    missing.append(sid)
+        record_cache_access("sid_names", not missing)
+        if not missing:
+            return names
+
+        found = lookup(missing)
+        names.update(found)
+        with self._lock:
+            for sid in missing:
+                if sid in found:
+                    self._names[sid] = found[sid]
+                    self._names.move_to_end(sid)
+                    self._unresolved.pop(sid, None)
+                else:
+                    self._unresolved[sid] = now
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+            if found and self.path:
+                self._schedule_flush()
+        return names
+
+    def clear(self):
+        with self._lock:
+            self._names.clear()
+            self._unresolved.clear()
+
+
+sid_resolver = SidResolver()
+
+# "member;range=1500-2999" / "member;range=3000-*"
+_RANGE_PATTERN = re.compile(r';range=(\d+)-(\d+|\*)$', re.IGNORECASE)
+
+# Grup üye sayıları: (DC, grup DN) -> (uSNChanged, üye sayısı). Üyelik değişince grubun
+# uSNChanged'i artar; USN DC'ye özel olduğu için anahtar DC'yi de içerir. En fazla
+# MEMBER_COUNT_CACHE_MAX kayıt tutulur (en eski kullanılan düşer).
+MEMBER_COUNT_CACHE_MAX = int(os.getenv("MEMBER_COUNT_CACHE_MAX", 20000))
+_MEMBER_COUNT_CACHE: "OrderedDict[Tuple[str, str], Tuple[int, int]]" = OrderedDict()
+_member_count_lock = threading.Lock()
+
+
+def _ranged_values(entry: CaseInsensitiveDict, attribute: str) -> Tuple[List, Optional[int]]:
+    """
+    Kayıttaki attribute değerleri ve (range ile kesilmişse) son değerin sırası.
+    "member;range=0-1499" -> (değerler, 1499); parçasız veya "member;range=1500-*" -> (değerler, None)
+    """
+    for name, value in entry.items():
+        base_name, _, options = name.partition(';')
+        if base_name.lower() != attribute.lower():
+            continue
+        match = _RANGE_PATTERN.search(name) if options else None
+        end = match.group(2) if match else '*'
+        return value, None if end == '*' else int(end)
+    return [], None
+
+
+# Boştaki ek bağlantılar: (host, port, ssl, kullanıcı) -> bağlantılar. İstek başına oluşturulan
+# ADConnection nesneleri arasında paylaşılır; böylece her istek yeniden bind yapmaz.
+_WORKER_POOLS: "OrderedDict[Tuple[str, int, bool, str], List[Connection]]" = OrderedDict()
+_worker_pools_lock = threading.Lock()
+
+
+def _unbind_quietly(conn: Connection):
+    try:
+        conn.unbind()
+    except Exception:
+        pass
+
+
+def rdn_value(dn: str) -> str:
+    """
+    DN'in ilk RDN değeri, kaçışlar çözülmüş olarak:
+    'CN=Sales\\, EMEA,OU=Groups,...' -> 'Sales, EMEA' ('\\c4\\b1' gibi onaltılık kaçışlar UTF-8 olarak)
+    """
+    try:
+        value = parse_dn(str(dn))[0][1]
+    except Exception:
+        return str(dn).split(',')[0].split('=', 1)[-1]
+    raw = bytearray()
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == '\\' and index + 1 < len(value):
+            pair = value[index + 1:index + 3]
+            if len(pair) == 2 and all(c in string.hexdigits for c in pair):
+                raw.append(int(pair, 16))
+                index += 3
+                continue
+            char = value[index + 1]
+            index += 1
+        raw.extend(char.encode('utf-8'))
+        index += 1
+    return raw.decode('utf-8', errors='replace')
+
+
+def groups_from_member_of(member_of: Optional[List]) -> List[str]:
+    """memberOf DN'lerinden grup adları (cn)"""
+    return [rdn_value(group_dn) for group_dn in member_of or []]
+
+
+def _invalidate_member_count(group_dn: str):
+    """Uygulamanın kendi yaptığı üyelik değişikliğinden sonra grubun sayısını düşür"""
+    with _member_count_lock:
+        for key in [k for k in _MEMBER_COUNT_CACHE if k[1] == group_dn.lower()]:
+            del _MEMBER_COUNT_CACHE[key]
+
+# Domain maxPwdAge değeri (base_dn -> timedelta, None: süresiz); süreç boyunca bir kez okunur,
+# şifre bitiş indeksi her yeniden oluşturulduğunda tazelenir
+_MAX_PWD_AGE_CACHE: Dict[str, Optional[timedelta]] = {}
+
+USER_EXPIRY_ATTRIBUTE = 'msDS-UserPasswordExpiryTimeComputed'
+
+# Kullanıcı ve bilgisayar listelerinde istenen attribute'lar
+USER_LIST_ATTRIBUTES = [
+    'sAMAccountName',
+    'displayName',
+    'mail',
+    'memberOf',
+    'pwdLastSet',
+    'userAccountControl',
+    USER_EXPIRY_ATTRIBUTE,
+    'whenCreated',
+    'whenChanged',
+    'distinguishedName'
+]
+COMPUTER_LIST_ATTRIBUTES = [
+    'sAMAccountName',
+    'cn',
+    'dNSHostName',
+    'operatingSystem',
+    'operatingSystemVersion',
+    'operatingSystemServicePack',
+    'lastLogon',
+    'lastLogonTimestamp',
+    'distinguishedName',
+    'whenCreated',
+    'whenChanged',
+    'userAccountControl',
+    'description',
+    'managedBy',
+    'location',
+    'memberOf'
+]
+
+# Sayfalı listelerin sıralama alanları: API adı -> (LDAP attribute, model alanı); AD'de hepsi indeksli
+USER_SORT_FIELDS = {
+    "sam_account_name": ("sAMAccountName", "sam_account_name"),
+    "display_name": ("displayName", "display_name"),
+}
+COMPUTER_SORT_FIELDS = {
+    "name": ("cn", "name"),
+}
+
+
+def _dn_to_domain(dn: str) -> str:
+    """CN=x,OU=y,DC=child,DC=sirket,DC=local -> child.sirket.local"""
+    return ".".join(p.split("=", 1)[1] for p in dn.split(",") if p.strip().upper().startswith("DC="))
+
 # Pydantic modelleri (models.py'den ayrı olarak burada da tanımlıyoruz)
 class UserAttribute(BaseModel):
     name: str
@@ -70,34 +418,80 @@ class ComputerInfo(BaseModel):
     attributes: List[UserAttribute] = []
 
 class ADConnection:
-    def __init__(self, server: str, domain: str, username: str, password: str, base_dn: str):
+    def __init__(self, server: str, domain: str, username: str, password: str, base_dn: str,
+                 gc_server: Optional[str] = None, transient: bool = False):
         self.server = server
         self.domain = domain
         self.username = username
         self.password = password
         self.base_dn = base_dn
         self.conn = None
+        # Global Catalog (3268/3269) - verilmezse orman genelindeki aramalar domain DC'ye düşer
+        self.gc_server = gc_server
+        self.gc_conn = None
+        # Geçici bağlantı (ör. bağlantı testi): DC havuzları süreç geneline kaydedilmez, sağlık kontrolü
+        # başlatılmaz ve ek bağlantılar paylaşılan havuza bırakılmaz
+        self.transient = transient
+        self._transient_pools: Dict[str, DomainControllerPool] = {}
+    
+    def _dc_pool(self, server_setting: str) -> DomainControllerPool:
+        if not self.transient:
+            return get_dc_pool(server_setting)
+        pool = self._transient_pools.get(server_setting)
+        if pool is None:
+            pool = self._transient_pools[server_setting] = create_transient_pool(server_setting)
+        return pool
+    
+    def _open_connection(self, server_setting: str, **connection_options) -> Connection:
+        """
+        Havuzdaki DC'leri sırayla deneyerek bağlantı aç.
+        Zaman aşımı veya erişim hatasında sıradaki DC'ye geçilir.
+        """
+        # Kullanıcı adını formatla (UPN, NetBIOS veya sadece username)
+        if "@" in self.username or "\\" in self.username:
+            user_dn = self.username
+        else:
+            user_dn = f"{self.username}@{self.domain}"
         
+        options = {"receive_timeout": RECEIVE_TIMEOUT}
+        options.update(connection_options)
+        pool = self._dc_pool(server_setting)
+        last_error = None
+        for dc in pool.candidates():
+            try:
+                conn = Connection(
+                    dc.server,
+                    user=user_dn,
+                    password=self.password,
+                    auto_bind=True,
+                    **options
+                )
+            except LDAPBindError:
+                # DC yanıt verdi ama kimlik bilgileri reddedildi; başka DC denemek anlamsız
+                pool.mark_success(dc)
+                raise
+            except Exception as e:
+                pool.mark_failure(dc, e)
+                last_error = e
+                logger.warning(f"DC'ye bağlanılamadı, sıradaki deneniyor: {dc.address} ({str(e)})")
+                continue
+            pool.mark_success(dc)
+            dc.prepare_connection(conn)
+            logger.info(f"LDAP bağlantısı başarılı: {user_dn} @ {dc.address}")
+            return conn
+        raise last_error or Exception("Yapılandırılmış LDAP sunucusu yok")
+    
     def connect(self):
-        """LDAP sunucusuna bağlan"""
+        """
+        LDAP sunucusuna bağlan.
+        LDAP_SERVER birden fazla DC içeriyorsa havuzdaki sıraya göre denenir.
+        """
         try:
-            ldap_server = Server(self.server, get_info=ALL)
-            
-            # Kullanıcı adını formatla (UPN, NetBIOS veya sadece username)
-            if "@" in self.username or "\\" in self.username:
-                user_dn = self.username
-            else:
-                user_dn = f"{self.username}@{self.domain}"
-                
-            self.conn = Connection(
-                ldap_server,
-                user=user_dn,
-                password=self.password,
-                auto_bind=True
-            )
-            logger.info(f"LDAP bağlantısı başarılı: {user_dn}")
+            self.conn = self._open_connection(self.server)
+            LDAP_BINDS.inc(result="success")
             return True
         except Exception as e:
+            LDAP_BINDS.inc(result="failure")
             logger.error(f"LDAP bağlantı hatası: {str(e)}")
             raise
     
@@ -106,6 +500,55 @@ class ADConnection:
         if self.conn:
             self.conn.unbind()
             self.conn = None
+        if self.gc_conn:
+            self.gc_conn.unbind()
+            self.gc_conn = None
+    
+    def _worker_key(self, conn: Connection) -> Tuple[str, int, bool, str]:
+        return conn.server.host.lower(), conn.server.port, bool(conn.server.ssl), (self.username or "").lower()
+    
+    def _borrow_connection(self) -> Connection:
+        """
+        Ana bağlantıyla aynı DC'ye ek bağlantı (DC'nin paylaşılan havuzundan, yoksa yeni açılır).
+        Aynı DC: ana bağlantıda okunan DN/USN'ler ek bağlantıda da geçerlidir.
+        """
+        server = self.conn.server
+        key = self._worker_key(self.conn)
+        with _worker_pools_lock:
+            idle = _WORKER_POOLS.get(key, [])
+            while idle:
+                conn = idle.pop()
+                if conn.bound:
+                    return conn
+        return self._open_connection(f"{'ldaps://' if server.ssl else ''}{server.host}:{server.port}")
+    
+    def _release_connection(self, conn: Connection, reusable: bool = True):
+        """Ek bağlantıyı DC havuzuna geri bırak; havuz doluysa veya bağlantı hatalıysa kapatılır"""
+        evicted: List[Connection] = []
+        if reusable and conn.bound and not self.transient:
+            key = self._worker_key(conn)
+            with _worker_pools_lock:
+                idle = _WORKER_POOLS.setdefault(key, [])
+                _WORKER_POOLS.move_to_end(key)
+                while len(_WORKER_POOLS) > LDAP_WORKER_POOLS_MAX:
+                    evicted.extend(_WORKER_POOLS.popitem(last=False)[1])
+                if len(idle) < LDAP_WORKER_CONNECTIONS:
+                    idle.append(conn)
+                    conn = None
+        for stale in evicted + ([conn] if conn is not None else []):
+            _unbind_quietly(stale)
+    
+    def _ensure_gc_connection(self):
+        """Global Catalog bağlantısının aktif olduğundan emin ol"""
+        if self.gc_conn and self.gc_conn.bound:
+            return
+        try:
+            self.gc_conn = self._open_connection(self.gc_server)
+            LDAP_BINDS.inc(result="success")
+        except Exception as e:
+            LDAP_BINDS.inc(result="failure")
+            logger.error(f"Global Catalog bağlantı hatası: {str(e)}")
+            raise
     
     def _ensure_connection(self):
         """Bağlantının aktif olduğundan emin ol"""
@@ -114,11 +557,325 @@ class ADConnection:
         elif not self.conn.bound:
             self.connect()
     
-    def _convert_ad_timestamp(self, timestamp: Optional[int]) -> Optional[str]:
+    def _search(self, search_base: str, search_filter: str, conn: Optional[Connection] = None, *,
+                method: str, **kwargs) -> List[CaseInsensitiveDict]:
+        """
+        LDAP araması yap ve sonuçları sözlük olarak döndür.
+        ldap3 Entry nesnelerinde .get() olmadığından her kayıt
+        {attribute: [değerler]} biçiminde büyük/küçük harf duyarsız sözlüğe çevrilir.
+        Süre ve kayıt sayısı, method etiketiyle (aramayı yapan metodun adı) metriklere ve
+        (açıksa) istek izlemesine yazılır.
+        """
+        conn = conn or self.conn
+        start = time.perf_counter()
+        try:
+            conn.search(search_base, search_filter, **kwargs)
+        except Exception as e:
+            duration = time.perf_counter() - start
+            LDAP_SEARCH_ERRORS.inc(method=method)
+            LDAP_SEARCH_DURATION.observe(duration, method=method)
+            record_operation("search", method, search_base, duration * 1000, search_filter,
+                             kwargs.get('attributes'), result=str(e))
+            raise
+        duration = time.perf_counter() - start
+        LDAP_SEARCH_DURATION.observe(duration, method=method)
+        entries = []
+        for entry in conn.entries:
+            values = CaseInsensitiveDict(entry.entry_attributes_as_dict)
+            # distinguishedName her zaman kaydın kendi DN'i ile aynıdır
+            values['distinguishedName'] = [entry.entry_dn]
+            entries.append(values)
+        LDAP_SEARCH_ENTRIES.inc(len(entries), method=method)
+        record_operation("search", method, search_base, duration * 1000, search_filter,
+                         kwargs.get('attributes'), entries=len(entries),
+                         result=conn.result.get('description') if conn.result else None)
+        return entries
+    
+    def _paged_search(self, search_base: str, search_filter: str, page_size: int = LDAP_PAGE_SIZE,
+                      conn: Optional[Connection] = None, *, method: str, **kwargs) -> List[CaseInsensitiveDict]:
+        """
+        Simple Paged Results kontrolüyle arama yap; tüm sayfaları birleştirip döndür.
+        Sunucunun MaxPageSize/size limit'ine takılmadan tüm dizin taranabilir.
+        """
+        conn = conn or self.conn
+        entries = []
+        cookie = None
+        while True:
+            entries.extend(self._search(search_base, search_filter, method=method, conn=conn, paged_size=page_size,
+                                        paged_cookie=cookie, **kwargs))
+            controls = (conn.result or {}).get('controls') or {}
+            cookie = controls.get(PAGED_RESULTS_OID, {}).get('value', {}).get('cookie')
+            if not cookie:
+                return entries
+    
+    def _search_concurrently(self, searches: Dict[str, Tuple[str, Dict]], *,
+                             method: str) -> Dict[str, List[CaseInsensitiveDict]]:
+        """
+        Birbirinden bağımsız sayfalı aramaları aynı anda çalıştır: {ad: (filtre, arama parametreleri)}.
+        İlk arama ana bağlantıda, diğerleri ek bağlantılarda yapılır; toplam süre en yavaş aramaya
+        yaklaşır. Metrik etiketi method'dur.
+        """
+        def run(name: str, conn: Connection) -> List[CaseInsensitiveDict]:
+            search_filter, kwargs = searches[name]
+            return self._paged_search(self.base_dn, search_filter, conn=conn, method=method, **kwargs)
+        
+        def run_on_worker(name: str) -> List[CaseInsensitiveDict]:
+            conn = self._borrow_connection()
+            try:
+                entries = run(name, conn)
+            except Exception:
+                self._release_connection(conn, reusable=False)
+                raise
+            self._release_connection(conn)
+            return entries
+        
+        names = list(searches)
+        results: Dict[str, List[CaseInsensitiveDict]] = {}
+        if len(names) <= 1:
+            return {name: run(name, self.conn) for name in names}
+        with ThreadPoolExecutor(max_workers=len(names) - 1, thread_name_prefix="ldap-search") as executor:
+            # İstek izlemesi (contextvars) çalışan thread'lere taşınır
+            futures = {
+                name: executor.submit(contextvars.copy_context().run, run_on_worker, name)
+                for name in names[1:]
+            }
+            results[names[0]] = run(names[0], self.conn)
+            for name, future in futures.items():
+                results[name] = future.result()
+        return {name: results[name] for name in names}
+    
+    def _iter_attribute_range(self, dn: str, attribute: str = 'member',
+                              conn: Optional[Connection] = None, start: int = 0, *,
+                              method: str) -> Iterator[str]:
+        """
+        Çok değerli attribute'u parça parça oku (member;range=N-*).
+        AD tek yanıtta en fazla MaxValRange (varsayılan 1500) değer döndürür; değerler parçalar
+        geldikçe üretilir, tamamı bellekte tutulmaz. Range desteklemeyen sunucular attribute'u
+        parçasız döndürür, o da aynı şekilde okunur. start: okumaya başlanacak değer sırası.
+        """
+        conn = conn or self.conn
+        # ldap3'ün otomatik range takibi kapatılır; aksi halde tüm değerler tek listede toplanır
+        auto_range, conn.auto_range = conn.auto_range, False
+        try:
+            while True:
+                entries = self._search(dn, '(objectClass=*)', method=method, conn=conn, search_scope=BASE,
+                                       attributes=[f'{attribute};range={start}-*'])
+                if not entries:
+                    return
+                values, end = _ranged_values(entries[0], attribute)
+                for value in values:
+                    yield str(value)
+                if end is None or not values:
+                    return
+                start = end + 1
+        finally:
+            conn.auto_range = auto_range
+    
+    def _member_count(self, group_dn: str, usn: Optional[int]) -> int:
+        """Tek grubun üye sayısı (bkz. _member_counts)"""
+        return self._member_counts([(group_dn, usn)])[group_dn.lower()]
+    
+    def _member_counts(self, groups: List[Tuple[str, Optional[int]]]) -> Dict[str, int]:
+        """
+        Grupların üye sayıları: {küçük harf DN: sayı}. Değişmemiş gruplar (aynı uSNChanged)
+        önbellekten gelir. Diğerleri tek tek değil, BULK_LOOKUP_CHUNK'lık distinguishedName OR
+        filtreleriyle toplu okunur; yalnızca MaxValRange'den büyük grupların kalan üyeleri ayrıca
+        parça parça sayılır. Soğuk önbellek tüm grup listesi için birkaç aramayla dolar.
+        """
+        server = f"{self.conn.server.host}:{self.conn.server.port}"
+        counts: Dict[str, int] = {}
+        missing: Dict[str, Tuple[str, Optional[int]]] = {}
+        with _member_count_lock:
+            for dn, usn in groups:
+                key = (server, dn.lower())
+                cached = _MEMBER_COUNT_CACHE.get(key)
+                if usn is not None and cached is not None and cached[0] == usn:
+                    _MEMBER_COUNT_CACHE.move_to_end(key)
+                    counts[dn.lower()] = cached[1]
+                else:
+                    missing[dn.lower()] = (dn, usn)
+        for _ in counts:
+            record_cache_access("group_member_count", True)
+        for _ in missing:
+            record_cache_access("group_member_count", False)
+        if not missing:
+            return counts
+        
+        pending = list(missing.values())
+        auto_range, self.conn.auto_range = self.conn.auto_range, False
+        try:
+            for start in range(0, len(pending), BULK_LOOKUP_CHUNK):
+                clauses = "".join(
+                    f"(distinguishedName={escape_filter_chars(dn)})" for dn, _ in pending[start:start + BULK_LOOKUP_CHUNK]
+                )
+                entries = self._paged_search(self.base_dn, f"(&(objectClass=group)(|{clauses}))",
+                                             method="_member_counts",
+                                             attributes=['member', 'uSNChanged'])
+                for entry in entries:
+                    dn = str(entry['distinguishedName'][0])
+                    values, end = _ranged_values(entry, 'member')
+                    count = len(values)
+                    if end is not None and values:
+                        count += sum(1 for _ in self._iter_attribute_range(dn, method="_member_counts", start=end + 1))
+                    counts[dn.lower()] = count
+        finally:
+            self.conn.auto_range = auto_range
+        
+        with _member_count_lock:
+            for key, (dn, usn) in missing.items():
+                # Aramada dönmeyen (silinmiş) grup 0 sayılır ve önbelleğe alınmaz
+                counts.setdefault(key, 0)
+                if usn is not None:
+                    _MEMBER_COUNT_CACHE[(server, key)] = (usn, counts[key])
+                    _MEMBER_COUNT_CACHE.move_to_end((server, key))
+            while len(_MEMBER_COUNT_CACHE) > MEMBER_COUNT_CACHE_MAX:
+                _MEMBER_COUNT_CACHE.popitem(last=False)
+        return counts
+    
+    def _gc_search(self, search_filter: str, attributes: List[str], size_limit: int = 0) -> List[CaseInsensitiveDict]:
+        """
+        Global Catalog üzerinden orman genelinde tek seferde ara.
+        GC'nin çoğaltmadığı attribute'lar (Partial Attribute Set dışı) yalnızca
+        istenmişse kaydın kendi DN'i üzerinden domain DC'den tamamlanır.
+        """
+        gc_attributes = [a for a in attributes if a.lower() in GC_PARTIAL_ATTRIBUTES]
+        missing = [a for a in attributes if a.lower() not in GC_PARTIAL_ATTRIBUTES]
+        self._ensure_gc_connection()
+        entries = self._search(
+            GC_BASE_DN,
+            search_filter,
+            method="_gc_search",
+            conn=self.gc_conn,
+            attributes=gc_attributes or ['distinguishedName'],
+            size_limit=size_limit
+        )
+        if missing and entries:
+            self._ensure_connection()
+            for entry in entries:
+                dn = str(entry['distinguishedName'][0])
+                try:
+                    # Başka domain'deki kayıtlar için DC referral'ı izlenir (ldap3 auto_referrals)
+                    extra = self._search(dn, '(objectClass=*)',
+                                         method="_gc_search", search_scope=BASE, attributes=missing)
+                    if extra:
+                        for name, value in extra[0].items():
+                            if name.lower() != 'distinguishedname':
+                                entry[name] = value
+                except Exception as e:
+                    logger.warning(f"GC dışı attribute'lar alınamadı {dn}: {str(e)}")
+        return entries
+    
+    def _gc_resolve_dn(self, search_filter: str) -> Optional[str]:
+        """Filtreye uyan ilk kaydın DN'ini orman genelinde (GC) bul"""
+        if not self.gc_server:
+            return None
+        try:
+            entries = self._gc_search(search_filter, ['distinguishedName'], size_limit=1)
+            if entries:
+                return str(entries[0]['distinguishedName'][0])
+            return None
+        except Exception as e:
+            logger.error(f"GC DN çözümleme hatası: {str(e)}")
+            return None
+    
+    def search_forest(self, query: str, object_type: str = "all", limit: int = 50) -> List[dict]:
+        """
+        Orman genelinde kullanıcı/grup/bilgisayar ara (ANR).
+        GC yapılandırılmamışsa yalnızca bu domain'de aranır.
+        """
+        try:
+            categories = {
+                "user": "(&(objectCategory=person)(objectClass=user))",
+                "group": "(objectCategory=group)",
+                "computer": "(objectCategory=computer)",
+            }
+            if object_type == "all":
+                type_filter = "(|" + "".join(categories.values()) + ")"
+            else:
+                type_filter = categories[object_type]
+            search_filter = f"(&(anr={escape_filter_chars(query)}){type_filter})"
+            attributes = ['sAMAccountName', 'displayName', 'cn', 'mail', 'objectClass']
+            
+            if self.gc_server:
+                entries = self._gc_search(search_filter, attributes, size_limit=limit)
+            else:
+                self._ensure_connection()
+                entries = self._search(self.base_dn, search_filter,
+                                       method="search_forest", attributes=attributes, size_limit=limit)
+            
+            results = []
+            for entry in entries[:limit]:
+                dn = str(entry['distinguishedName'][0])
+                classes = [str(c).lower() for c in entry.get('objectClass', [])]
+                if 'computer' in classes:
+                    kind = "computer"
+                elif 'group' in classes:
+                    kind = "group"
+                else:
+                    kind = "user"
+                sam = str(entry['sAMAccountName'][0]) if entry.get('sAMAccountName') else ''
+                name = str(entry['cn'][0]) if entry.get('cn') else sam
+                results.append({
+                    "object_type": kind,
+                    "sam_account_name": sam,
+                    "display_name": str(entry['displayName'][0]) if entry.get('displayName') else name,
+                    "email": str(entry['mail'][0]) if entry.get('mail') else None,
+                    "distinguished_name": dn,
+                    "domain": _dn_to_domain(dn)
+                })
+            return results
+        except Exception as e:
+            logger.error(f"Orman araması hatası: {str(e)}")
+            raise
+    
+    def _traced(self, op: str, method: str, dn: str, func, *args, conn: Optional[Connection] = None,
+                **kwargs) -> bool:
+        """Yazma işlemini çalıştır ve (açıksa) istek izlemesine method etiketiyle kaydet"""
+        conn = conn or self.conn
+        start = time.perf_counter()
+        try:
+            success = func(*args, **kwargs)
+        except Exception as e:
+            record_operation(op, method, dn, (time.perf_counter() - start) * 1000, result=str(e))
+            raise
+        record_operation(op, method, dn, (time.perf_counter() - start) * 1000,
+                         result=conn.result.get('description') if conn.result else None)
+        return success
+    
+    def _modify(self, dn: str, changes: dict, *, method: str) -> bool:
+        """LDAP modify"""
+        return self._traced("modify", method, dn, self.conn.modify, dn, changes)
+    
+    def _add(self, dn: str, attributes: dict, *, method: str) -> bool:
+        """LDAP add"""
+        return self._traced("add", method, dn, self.conn.add, dn, attributes=attributes)
+    
+    def _delete(self, dn: str, *, method: str) -> bool:
+        """LDAP delete"""
+        return self._traced("delete", method, dn, self.conn.delete, dn)
+    
+    def _modify_dn(self, dn: str, relative_dn: str, new_superior: Optional[str] = None,
+                   conn: Optional[Connection] = None, *, method: str) -> bool:
+        """LDAP modify_dn (taşıma / yeniden adlandırma)"""
+        conn = conn or self.conn
+        return self._traced("modify_dn", method, dn, conn.modify_dn, dn, relative_dn, new_superior=new_superior,
+                            conn=conn)
+    
+    def _convert_ad_timestamp(self, timestamp) -> Optional[str]:
         """AD timestamp'ini datetime'a çevir"""
         if not timestamp:
             return None
         try:
+            # Şema yüklüyse ldap3 değeri zaten datetime olarak döndürür
+            if isinstance(timestamp, datetime):
+                if timestamp.year <= 1601 or timestamp.year >= 9999:
+                    return None  # 0 (hiç) veya "süresiz" değerleri
+                if timestamp.tzinfo:
+                    timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+                return timestamp.isoformat()
+            timestamp = int(str(timestamp))
+            if timestamp <= 0 or timestamp >= 0x7FFFFFFFFFFFFFFF:
+                return None
             # AD timestamp: 1601-01-01'den itibaren 100-nanosecond intervals
             epoch = datetime(1601, 1, 1)
             dt = epoch + timedelta(microseconds=timestamp / 10)
@@ -127,115 +884,214 @@ class ADConnection:
             logger.error(f"Timestamp dönüştürme hatası: {str(e)}")
             return None
     
-    def _get_user_groups(self, user_dn: str) -> List[str]:
-        """Kullanıcının üye olduğu grupları getir"""
+    def _get_max_pwd_age(self, refresh: bool = False) -> Optional[timedelta]:
+        """Domain parola politikasındaki maxPwdAge (None: şifreler süresiz)"""
+        if not refresh and self.base_dn in _MAX_PWD_AGE_CACHE:
+            return _MAX_PWD_AGE_CACHE[self.base_dn]
+        self._ensure_connection()
+        entries = self._search(self.base_dn, '(objectClass=*)',
+                               method="_get_max_pwd_age", search_scope=BASE, attributes=['maxPwdAge'])
+        value = entries[0].get('maxPwdAge') if entries else None
+        _MAX_PWD_AGE_CACHE[self.base_dn] = parse_max_pwd_age(value[0] if value else None)
+        return _MAX_PWD_AGE_CACHE[self.base_dn]
+    
+    def _password_expiry(self, entry) -> Optional[datetime]:
+        """
+        Kaydın şifre bitiş zamanı (naive UTC).
+        msDS-UserPasswordExpiryTimeComputed varsa (fine-grained politikalar dahil) o kullanılır,
+        yoksa pwdLastSet + domain maxPwdAge. Süresiz veya değiştirilmesi gereken şifrede None.
+        """
+        computed = entry.get(USER_EXPIRY_ATTRIBUTE)
+        pwd_last_set = entry.get('pwdLastSet')
+        uac = entry.get('userAccountControl')
+        expires, _ = compute_expiry(
+            pwd_last_set[0] if pwd_last_set else None,
+            uac[0] if uac else None,
+            None if computed else self._get_max_pwd_age(),
+            computed[0] if computed else None
+        )
+        return expires
+    
+    def build_password_expiry_index(self) -> PasswordExpiryIndex:
+        """Tüm kullanıcıları tek (sayfalı) taramada okuyup şifre bitiş indeksini oluştur"""
         try:
             self._ensure_connection()
-            search_filter = f"(&(objectClass=group)(member={user_dn}))"
-            self.conn.search(
+            max_pwd_age = self._get_max_pwd_age(refresh=True)
+            entries = self._paged_search(
                 self.base_dn,
-                search_filter,
-                attributes=['cn', 'distinguishedName']
+                "(&(objectClass=user)(objectCategory=person))",
+                method="build_password_expiry_index",
+                attributes=['sAMAccountName', 'displayName', 'pwdLastSet', 'userAccountControl', USER_EXPIRY_ATTRIBUTE]
             )
-            groups = []
-            for entry in self.conn.entries:
-                if 'cn' in entry:
-                    groups.append(str(entry['cn']))
-            return groups
+            records = []
+            for entry in entries:
+                if not entry.get('sAMAccountName'):
+                    continue
+                computed = entry.get(USER_EXPIRY_ATTRIBUTE)
+                records.append({
+                    "sam_account_name": str(entry['sAMAccountName'][0]),
+                    "display_name": str(entry['displayName'][0]) if entry.get('displayName') else None,
+                    "pwd_last_set": entry['pwdLastSet'][0] if entry.get('pwdLastSet') else None,
+                    "user_account_control": entry['userAccountControl'][0] if entry.get('userAccountControl') else None,
+                    "computed": computed[0] if computed else None,
+                })
+            return PasswordExpiryIndex.build(records, max_pwd_age)
+        except Exception as e:
+            logger.error(f"Şifre bitiş indeksi hatası: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _sid_string(value) -> str:
+        """objectSid/tokenGroups değeri: şema biçimlendirdiyse metin, değilse ham ikili SID"""
+        return format_sid(value) if isinstance(value, (bytes, bytearray)) else str(value)
+    
+    def _resolve_sids(self, sids: List[str]) -> Dict[str, str]:
+        """SID -> ad; iyi bilinen ve önbellekteki SID'ler için LDAP'a gidilmez (bkz. SidResolver)"""
+        return sid_resolver.resolve(sids, self._lookup_sids)
+    
+    def _lookup_sids(self, sids: List[str]) -> Dict[str, str]:
+        """
+        SID'leri BULK_LOOKUP_CHUNK'lık objectSid OR filtreleriyle toplu ara: {SID: cn}.
+        Bu domain'de bulunamayanlar veya yalnızca ForeignSecurityPrincipal kaydı olanlar (cn'i SID'in
+        kendisidir) GC yapılandırılmışsa orman genelinde aynı şekilde aranır.
+        """
+        self._ensure_connection()
+        names = self._search_sids(sids)
+        remaining = [sid for sid in sids if sid not in names]
+        if remaining and self.gc_server:
+            names.update(self._search_sids(remaining, global_catalog=True))
+        return names
+    
+    def _search_sids(self, sids: List[str], global_catalog: bool = False) -> Dict[str, str]:
+        names: Dict[str, str] = {}
+        for start in range(0, len(sids), BULK_LOOKUP_CHUNK):
+            clauses = "".join(
+                f"(objectSid={escape_filter_chars(sid)})" for sid in sids[start:start + BULK_LOOKUP_CHUNK]
+            )
+            if global_catalog:
+                entries = self._gc_search(f"(|{clauses})", ['objectSid', 'cn', 'objectClass'])
+            else:
+                entries = self._paged_search(self.base_dn, f"(|{clauses})",
+                                             method="_search_sids", attributes=['objectSid', 'cn', 'objectClass'])
+            for entry in entries:
+                object_classes = {str(c).lower() for c in entry.get('objectClass') or []}
+                if not entry.get('objectSid') or not entry.get('cn') or 'foreignsecurityprincipal' in object_classes:
+                    continue
+                names[self._sid_string(entry['objectSid'][0])] = str(entry['cn'][0])
+        return names
+    
+    def _get_user_groups(self, user_dn: str, member_of: Optional[List] = None) -> List[str]:
+        """
+        Kullanıcının etkin grupları: tokenGroups (iç içe üyelikler ve birincil grup dahil, yalnızca
+        güvenlik grupları) ile doğrudan üyelikler (memberOf, dağıtım grupları dahil) birleşimi.
+        tokenGroups tek BASE okumasıyla gelir; SID'ler önbellekten veya toplu aramayla ada çevrilir.
+        """
+        try:
+            self._ensure_connection()
+            entries = self._search(user_dn, '(objectClass=*)',
+                                   method="_get_user_groups", search_scope=BASE, attributes=['tokenGroups'])
+            sids = [self._sid_string(v) for v in entries[0].get('tokenGroups') or []] if entries else []
+            if not sids:
+                # tokenGroups hesaplanmadı (ör. DC/sunucu desteklemiyor): doğrudan üyelik araması
+                return self._get_direct_user_groups(user_dn)
+            names = self._resolve_sids(sids)
+            groups = {name.lower(): name for name in (names.get(sid) for sid in sids) if name}
+            for name in groups_from_member_of(member_of):
+                groups.setdefault(name.lower(), name)
+            return sorted(groups.values(), key=str.lower)
         except Exception as e:
             logger.error(f"Grup getirme hatası: {str(e)}")
             return []
     
+    def _get_direct_user_groups(self, user_dn: str) -> List[str]:
+        """Kullanıcının doğrudan üye olduğu gruplar (member araması)"""
+        search_filter = f"(&(objectClass=group)(member={escape_filter_chars(user_dn)}))"
+        entries = self._search(
+            self.base_dn,
+            search_filter,
+            method="_get_direct_user_groups",
+            attributes=['cn', 'distinguishedName']
+        )
+        return [str(entry['cn'][0]) for entry in entries if entry.get('cn')]
+    
+    def _user_filter(self, group_filter: Optional[str] = None, search_filter: Optional[str] = None) -> str:
+        """Kullanıcı listesi LDAP filtresi"""
+        # Base search filter
+        search_base = f"(&(objectClass=user)(objectCategory=person)"
+        
+        # Grup filtresi ekle
+        if group_filter:
+            # Önce grubu bul
+            group_dn = self._get_group_dn(group_filter)
+            if group_dn:
+                search_base += f"(memberOf={group_dn})"
+        
+        # Arama filtresi ekle
+        if search_filter:
+            search_base += f"(|(cn=*{search_filter}*)(sAMAccountName=*{search_filter}*)(mail=*{search_filter}*))"
+        
+        return search_base + ")"
+    
+    def _entry_to_user_info(self, entry: CaseInsensitiveDict) -> UserInfo:
+        """Liste aramasındaki kaydı UserInfo'ya çevir"""
+        sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
+        display_name = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam_account
+        email = str(entry.get('mail', [''])[0]) if entry.get('mail') else None
+        user_dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
+        
+        # Listede doğrudan üyelikler: aramada gelen memberOf'tan (kullanıcı başına ek arama yapılmaz;
+        # iç içe üyelikler detayda tokenGroups ile okunur)
+        groups = groups_from_member_of(entry.get('memberOf'))
+        
+        # Şifre bilgileri
+        pwd_last_set = None
+        if entry.get('pwdLastSet'):
+            pwd_last_set = self._convert_ad_timestamp(entry.get('pwdLastSet')[0])
+        
+        # Şifre son kullanma (parola politikasına göre)
+        expires_dt = self._password_expiry(entry)
+        password_expires = expires_dt.isoformat() if expires_dt else None
+        
+        # Hesap durumu
+        uac = int(str(entry.get('userAccountControl', ['512'])[0]))
+        account_enabled = not bool(uac & 0x0002)  # ACCOUNTDISABLE flag
+        account_disabled = bool(uac & 0x0002)
+        
+        # Attributes
+        attributes = []
+        for attr_name in ['sAMAccountName', 'displayName', 'mail', 'distinguishedName', 'whenCreated', 'whenChanged']:
+            if entry.get(attr_name):
+                attr_value = str(entry.get(attr_name)[0])
+                attributes.append(UserAttribute(name=attr_name, value=attr_value))
+        
+        return UserInfo(
+            sam_account_name=sam_account,
+            display_name=display_name,
+            email=email,
+            groups=groups,
+            password_last_set=pwd_last_set,
+            password_expires=password_expires,
+            account_enabled=account_enabled,
+            account_disabled=account_disabled,
+            attributes=attributes
+        )
+    
     def get_users(self, group_filter: Optional[str] = None, search_filter: Optional[str] = None) -> List[UserInfo]:
         """Kullanıcıları getir"""
         try:
             self._ensure_connection()
             
-            # Base search filter
-            search_base = f"(&(objectClass=user)(objectCategory=person)"
-            
-            # Grup filtresi ekle
-            if group_filter:
-                # Önce grubu bul
-                group_dn = self._get_group_dn(group_filter)
-                if group_dn:
-                    search_base += f"(memberOf={group_dn})"
-            
-            # Arama filtresi ekle
-            if search_filter:
-                search_base += f"(|(cn=*{search_filter}*)(sAMAccountName=*{search_filter}*)(mail=*{search_filter}*))"
-            
-            search_base += ")"
-            
             # Kullanıcıları ara
-            self.conn.search(
+            entries = self._search(
                 self.base_dn,
-                search_base,
-                attributes=[
-                    'sAMAccountName',
-                    'displayName',
-                    'mail',
-                    'memberOf',
-                    'pwdLastSet',
-                    'userAccountControl',
-                    'whenCreated',
-                    'whenChanged',
-                    'distinguishedName'
-                ]
+                self._user_filter(group_filter, search_filter), method="get_users",
+                attributes=USER_LIST_ATTRIBUTES
             )
             
             users = []
-            for entry in self.conn.entries:
+            for entry in entries:
                 try:
-                    sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
-                    display_name = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam_account
-                    email = str(entry.get('mail', [''])[0]) if entry.get('mail') else None
-                    user_dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
-                    
-                    # Grupları getir
-                    groups = self._get_user_groups(user_dn)
-                    
-                    # Şifre bilgileri
-                    pwd_last_set = None
-                    if entry.get('pwdLastSet'):
-                        pwd_timestamp = int(str(entry.get('pwdLastSet')[0]))
-                        if pwd_timestamp > 0:
-                            pwd_last_set = self._convert_ad_timestamp(pwd_timestamp)
-                    
-                    # Şifre son kullanma (90 gün varsayılan)
-                    password_expires = None
-                    if pwd_last_set:
-                        try:
-                            last_set_dt = datetime.fromisoformat(pwd_last_set.replace('Z', '+00:00'))
-                            expires_dt = last_set_dt + timedelta(days=90)
-                            password_expires = expires_dt.isoformat()
-                        except:
-                            pass
-                    
-                    # Hesap durumu
-                    uac = int(str(entry.get('userAccountControl', ['512'])[0]))
-                    account_enabled = not bool(uac & 0x0002)  # ACCOUNTDISABLE flag
-                    account_disabled = bool(uac & 0x0002)
-                    
-                    # Attributes
-                    attributes = []
-                    for attr_name in ['sAMAccountName', 'displayName', 'mail', 'distinguishedName', 'whenCreated', 'whenChanged']:
-                        if entry.get(attr_name):
-                            attr_value = str(entry.get(attr_name)[0])
-                            attributes.append(UserAttribute(name=attr_name, value=attr_value))
-                    
-                    user_info = UserInfo(
-                        sam_account_name=sam_account,
-                        display_name=display_name,
-                        email=email,
-                        groups=groups,
-                        password_last_set=pwd_last_set,
-                        password_expires=password_expires,
-                        account_enabled=account_enabled,
-                        account_disabled=account_disabled,
-                        attributes=attributes
-                    )
-                    users.append(user_info)
+                    users.append(self._entry_to_user_info(entry))
                 except Exception as e:
                     logger.error(f"Kullanıcı işleme hatası: {str(e)}")
                     continue
@@ -251,44 +1107,38 @@ class ADConnection:
             self._ensure_connection()
             search_filter = f"(&(objectClass=user)(sAMAccountName={sam_account_name}))"
             
-            self.conn.search(
+            # Hesaplanan (constructed) attribute'lar ALL_ATTRIBUTES ile gelmez, ayrıca istenir
+            entries = self._search(
                 self.base_dn,
                 search_filter,
-                attributes=ALL_ATTRIBUTES
+                method="get_user",
+                attributes=[ALL_ATTRIBUTES, USER_EXPIRY_ATTRIBUTE]
             )
             
-            if not self.conn.entries:
+            if not entries:
                 return None
             
-            entry = self.conn.entries[0]
+            entry = entries[0]
             sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
             display_name = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam_account
             email = str(entry.get('mail', [''])[0]) if entry.get('mail') else None
             user_dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
             
-            groups = self._get_user_groups(user_dn)
+            groups = self._get_user_groups(user_dn, entry.get('memberOf'))
             
             pwd_last_set = None
             if entry.get('pwdLastSet'):
-                pwd_timestamp = int(str(entry.get('pwdLastSet')[0]))
-                if pwd_timestamp > 0:
-                    pwd_last_set = self._convert_ad_timestamp(pwd_timestamp)
+                pwd_last_set = self._convert_ad_timestamp(entry.get('pwdLastSet')[0])
             
-            password_expires = None
-            if pwd_last_set:
-                try:
-                    last_set_dt = datetime.fromisoformat(pwd_last_set.replace('Z', '+00:00'))
-                    expires_dt = last_set_dt + timedelta(days=90)
-                    password_expires = expires_dt.isoformat()
-                except:
-                    pass
+            expires_dt = self._password_expiry(entry)
+            password_expires = expires_dt.isoformat() if expires_dt else None
             
             uac = int(str(entry.get('userAccountControl', ['512'])[0]))
             account_enabled = not bool(uac & 0x0002)
             account_disabled = bool(uac & 0x0002)
             
             attributes = []
-            for attr_name, attr_value in entry.entry_attributes.items():
+            for attr_name, attr_value in entry.items():
                 if attr_value:
                     value = str(attr_value[0]) if isinstance(attr_value, list) and attr_value else str(attr_value)
                     attributes.append(UserAttribute(name=attr_name, value=value))
@@ -313,14 +1163,16 @@ class ADConnection:
         try:
             self._ensure_connection()
             search_filter = f"(&(objectClass=group)(cn={group_name}))"
-            self.conn.search(
+            entries = self._search(
                 self.base_dn,
                 search_filter,
+                method="_get_group_dn",
                 attributes=['distinguishedName']
             )
-            if self.conn.entries:
-                return str(self.conn.entries[0].get('distinguishedName')[0])
-            return None
+            if entries:
+                return str(entries[0].get('distinguishedName')[0])
+            # Bu domain'de yoksa orman genelinde (GC) ara
+            return self._gc_resolve_dn(search_filter)
         except Exception as e:
             logger.error(f"Grup DN getirme hatası: {str(e)}")
             return None
@@ -330,24 +1182,34 @@ class ADConnection:
         try:
             self._ensure_connection()
             search_filter = "(objectClass=group)"
-            self.conn.search(
+            # member istenmez: sayılar uSNChanged ile doğrulanan önbellekten, değişen gruplar için
+            # toplu okumadan gelir (grup başına ayrı arama yapılmaz)
+            entries = self._search(
                 self.base_dn,
                 search_filter,
-                attributes=['cn', 'distinguishedName', 'member']
+                method="get_groups",
+                attributes=['cn', 'distinguishedName', 'uSNChanged']
             )
             
+            keyed = [
+                (
+                    entry,
+                    str(entry['distinguishedName'][0]),
+                    int(str(entry['uSNChanged'][0])) if entry.get('uSNChanged') else None
+                )
+                for entry in entries
+            ]
+            counts = self._member_counts([(dn, usn) for _, dn, usn in keyed])
+            
             groups = []
-            for entry in self.conn.entries:
+            for entry, dn, usn in keyed:
                 try:
                     name = str(entry.get('cn', [''])[0]) if entry.get('cn') else ''
-                    dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
-                    members = entry.get('member', [])
-                    member_count = len(members) if members else 0
                     
                     groups.append(GroupInfo(
                         name=name,
                         distinguished_name=dn,
-                        member_count=member_count
+                        member_count=counts.get(dn.lower(), 0)
                     ))
                 except Exception as e:
                     logger.error(f"Grup işleme hatası: {str(e)}")
@@ -363,20 +1225,21 @@ class ADConnection:
         try:
             self._ensure_connection()
             search_filter = f"(&(objectClass=group)(cn={group_name}))"
-            self.conn.search(
+            entries = self._search(
                 self.base_dn,
                 search_filter,
-                attributes=['cn', 'distinguishedName', 'member']
+                method="get_group",
+                attributes=['cn', 'distinguishedName', 'uSNChanged']
             )
             
-            if not self.conn.entries:
+            if not entries:
                 return None
             
-            entry = self.conn.entries[0]
+            entry = entries[0]
             name = str(entry.get('cn', [''])[0]) if entry.get('cn') else ''
             dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
-            members = entry.get('member', [])
-            member_count = len(members) if members else 0
+            usn = int(str(entry['uSNChanged'][0])) if entry.get('uSNChanged') else None
+            member_count = self._member_count(dn, usn)
             
             return GroupInfo(
                 name=name,
@@ -395,95 +1258,102 @@ class ADConnection:
             if not group_dn:
                 raise ValueError(f"Grup bulunamadı: {group_name}")
             
-            # Grubun member attribute'unu al
-            self.conn.search(
-                group_dn,
-                '(objectClass=group)',
-                attributes=['member']
-            )
-            
-            if not self.conn.entries:
-                return []
-            
-            members_dn = self.conn.entries[0].get('member', [])
-            if not members_dn:
-                return []
-            
-            # Her üye için detaylı bilgi al
+            # Üye DN'leri 1500'lük parçalar halinde okunur (büyük gruplarda liste kesilmez); kullanıcı
+            # bilgileri üye başına değil, BULK_LOOKUP_CHUNK'lık distinguishedName OR filtreleriyle toplu okunur
             members = []
-            for member_dn in members_dn:
-                try:
-                    # Üyenin user olup olmadığını kontrol et
-                    self.conn.search(
-                        str(member_dn),
-                        '(objectClass=user)',
-                        attributes=['sAMAccountName', 'displayName', 'mail', 'distinguishedName']
-                    )
-                    
-                    if self.conn.entries:
-                        entry = self.conn.entries[0]
-                        sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
-                        display_name = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam_account
-                        email = str(entry.get('mail', [''])[0]) if entry.get('mail') else None
-                        dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
-                        
-                        if sam_account:  # Sadece kullanıcıları ekle (computer account'ları değil)
-                            members.append(GroupMemberInfo(
-                                sam_account_name=sam_account,
-                                display_name=display_name,
-                                email=email,
-                                distinguished_name=dn
-                            ))
-                except Exception as e:
-                    logger.warning(f"Üye bilgisi alınamadı {member_dn}: {str(e)}")
-                    continue
+            pending: List[str] = []
+            for member_dn in self._iter_attribute_range(group_dn, method="get_group_members"):
+                pending.append(member_dn)
+                if len(pending) == BULK_LOOKUP_CHUNK:
+                    members.extend(self._search_group_member_infos(pending))
+                    pending = []
+            if pending:
+                members.extend(self._search_group_member_infos(pending))
             
             return sorted(members, key=lambda x: x.display_name)
         except Exception as e:
             logger.error(f"Grup üyeleri getirme hatası: {str(e)}")
             raise
     
+    def _search_group_member_infos(self, member_dns: List[str]) -> List[GroupMemberInfo]:
+        """Üye DN'lerinden kullanıcı hesaplarını tek OR aramasıyla oku (diğer nesne türleri dönmez)"""
+        clauses = "".join(f"(distinguishedName={escape_filter_chars(dn)})" for dn in member_dns)
+        try:
+            entries = self._paged_search(
+                self.base_dn,
+                f"(&(objectClass=user)(|{clauses}))",
+                method="get_group_members",
+                attributes=['sAMAccountName', 'displayName', 'mail']
+            )
+        except Exception as e:
+            logger.warning(f"Üye bilgisi alınamadı ({len(member_dns)} üye): {str(e)}")
+            return []
+        members = []
+        for entry in entries:
+            sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
+            display_name = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam_account
+            email = str(entry.get('mail', [''])[0]) if entry.get('mail') else None
+            dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
+            if sam_account:
+                members.append(GroupMemberInfo(
+                    sam_account_name=sam_account,
+                    display_name=display_name,
+                    email=email,
+                    distinguished_name=dn
+                ))
+        # Aynı görünen adlı üyeler sıralamada member attribute'undaki sırayı korusun
+        order = {dn.lower(): index for index, dn in enumerate(member_dns)}
+        return sorted(members, key=lambda member: order.get(member.distinguished_name.lower(), len(order)))
+    
     def _get_user_dn(self, sam_account_name: str) -> Optional[str]:
         """Kullanıcı adından DN'yi getir"""
         try:
             self._ensure_connection()
+            if "@" in sam_account_name:
+                # UPN verilmişse doğrudan orman genelinde çöz
+                upn_filter = f"(&(objectClass=user)(userPrincipalName={sam_account_name}))"
+                if self.gc_server:
+                    return self._gc_resolve_dn(upn_filter)
+                entries = self._search(self.base_dn, upn_filter,
+                                       method="_get_user_dn", attributes=['distinguishedName'])
+                return str(entries[0].get('distinguishedName')[0]) if entries else None
             search_filter = f"(&(objectClass=user)(sAMAccountName={sam_account_name}))"
-            self.conn.search(
+            entries = self._search(
                 self.base_dn,
                 search_filter,
+                method="_get_user_dn",
                 attributes=['distinguishedName']
             )
-            if self.conn.entries:
-                return str(self.conn.entries[0].get('distinguishedName')[0])
-            return None
+            if entries:
+                return str(entries[0].get('distinguishedName')[0])
+            # Bu domain'de yoksa orman genelinde (GC) ara
+            return self._gc_resolve_dn(search_filter)
         except Exception as e:
             logger.error(f"Kullanıcı DN getirme hatası: {str(e)}")
             return None
     
+    def _find_computer_entry(self, sam_account_name: str, attributes: List[str]) -> Optional[CaseInsensitiveDict]:
+        """
+        Bilgisayarı tek indeksli sAMAccountName aramasıyla bul ('$'lı ve '$'sız ad aynı OR filtresinde;
+        '$'lı hesap önceliklidir). Yalnızca istenen attribute'lar döner.
+        """
+        name = sam_account_name.rstrip('$')
+        search_filter = (
+            f"(&(objectClass=computer)(|(sAMAccountName={escape_filter_chars(name + '$')})"
+            f"(sAMAccountName={escape_filter_chars(name)})))"
+        )
+        entries = self._search(self.base_dn, search_filter, method="_find_computer_entry",
+                               attributes=list(dict.fromkeys(attributes + ['sAMAccountName'])))
+        if not entries:
+            return None
+        return next((e for e in entries if str(e['sAMAccountName'][0]).endswith('$')), entries[0])
+    
     def _get_computer_dn(self, sam_account_name: str) -> Optional[str]:
         """Bilgisayar adından DN'yi getir"""
         try:
             self._ensure_connection()
-            # Computer account'ları genellikle $ ile biter
-            search_name = sam_account_name if sam_account_name.endswith('$') else sam_account_name + '$'
-            search_filter = f"(&(objectClass=computer)(sAMAccountName={search_name}))"
-            self.conn.search(
-                self.base_dn,
-                search_filter,
-                attributes=['distinguishedName']
-            )
-            if self.conn.entries:
-                return str(self.conn.entries[0].get('distinguishedName')[0])
-            # $ olmadan da dene
-            search_filter = f"(&(objectClass=computer)(sAMAccountName={sam_account_name}))"
-            self.conn.search(
-                self.base_dn,
-                search_filter,
-                attributes=['distinguishedName']
-            )
-            if self.conn.entries:
-                return str(self.conn.entries[0].get('distinguishedName')[0])
-            return None
+            entry = self._find_computer_entry(sam_account_name, ['distinguishedName'])
+            return str(entry['distinguishedName'][0]) if entry else None
         except Exception as e:
             logger.error(f"Bilgisayar DN getirme hatası: {str(e)}")
             return None
@@ -512,7 +1382,7 @@ class ADConnection:
                 attributes['description'] = description
             
             # Grubu oluştur
-            success = self.conn.add(group_dn, attributes=attributes)
+            success = self._add(group_dn, attributes, method="create_group")
             
             if success:
                 logger.info(f"Grup oluşturuldu: {group_name}")
@@ -536,7 +1406,7 @@ class ADConnection:
                 raise ValueError(f"Grup bulunamadı: {group_name}")
             
             # Grubu sil
-            success = self.conn.delete(group_dn)
+            success = self._delete(group_dn, method="delete_group")
             
             if success:
                 logger.info(f"Grup silindi: {group_name}")
@@ -554,14 +1424,15 @@ class ADConnection:
         try:
             self._ensure_connection()
             
-            self.conn.search(
+            entries = self._search(
                 self.base_dn,
                 "(objectClass=organizationalUnit)",
+                method="get_organizational_units",
                 attributes=['ou', 'distinguishedName', 'description']
             )
             
             ous = []
-            for entry in self.conn.entries:
+            for entry in entries:
                 ou_name = str(entry.get('ou', [''])[0]) if entry.get('ou') else ''
                 dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
                 desc = str(entry.get('description', [''])[0]) if entry.get('description') else None
@@ -579,6 +1450,91 @@ class ADConnection:
             logger.error(f"OU getirme hatası: {str(e)}")
             raise
     
+    def build_ou_tree(self) -> OUTree:
+        """OU ağacını ve OU başına kullanıcı/bilgisayar sayılarını tek (sayfalı) taramada oluştur"""
+        try:
+            self._ensure_connection()
+            entries = self._paged_search(
+                self.base_dn,
+                "(|(objectClass=organizationalUnit)(&(objectCategory=person)(objectClass=user))(objectCategory=computer))",
+                method="build_ou_tree",
+                attributes=['objectClass', 'ou', 'description', 'sAMAccountName']
+            )
+            ous, objects = [], []
+            for entry in entries:
+                dn = str(entry['distinguishedName'][0])
+                classes = [str(c).lower() for c in entry.get('objectClass', [])]
+                if 'organizationalunit' in classes:
+                    name = str(entry['ou'][0]) if entry.get('ou') else dn.split(',', 1)[0].split('=', 1)[-1]
+                    description = str(entry['description'][0]) if entry.get('description') else None
+                    ous.append((dn, name, description))
+                elif entry.get('sAMAccountName'):
+                    kind = OBJECT_COMPUTER if 'computer' in classes else OBJECT_USER
+                    objects.append((dn, kind, str(entry['sAMAccountName'][0])))
+            return OUTree.build(self.base_dn, ous, objects)
+        except Exception as e:
+            logger.error(f"OU ağacı hatası: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _lookup_object(entry: CaseInsensitiveDict) -> Optional[Tuple[str, str, str]]:
+        """Arama kaydını (obje türü, görünen ad, sAMAccountName) biçimine çevir"""
+        if not entry.get('sAMAccountName'):
+            return None
+        sam = str(entry['sAMAccountName'][0])
+        classes = [str(c).lower() for c in entry.get('objectClass', [])]
+        cn = str(entry['cn'][0]) if entry.get('cn') else sam.rstrip('$')
+        if 'computer' in classes:
+            return "computer", cn, sam
+        if 'group' in classes:
+            return "group", cn, sam
+        display_name = str(entry['displayName'][0]) if entry.get('displayName') else cn
+        return "user", display_name, sam
+    
+    def build_lookup_index(self) -> LookupIndex:
+        """Hızlı arama indeksini tek (sayfalı) taramada oluştur; yalnızca ad alanları istenir"""
+        try:
+            self._ensure_connection()
+            entries = self._paged_search(
+                self.base_dn,
+                "(|(&(objectCategory=person)(objectClass=user))(objectCategory=computer)(objectCategory=group))",
+                method="build_lookup_index",
+                attributes=['objectClass', 'sAMAccountName', 'displayName', 'cn']
+            )
+            return LookupIndex.build(filter(None, (self._lookup_object(entry) for entry in entries)))
+        except Exception as e:
+            logger.error(f"Arama indeksi hatası: {str(e)}")
+            raise
+    
+    def lookup(self, query: str, types: List[str], limit: int = 10) -> List[dict]:
+        """
+        İndeks hazır değilken hızlı arama: AD Ambiguous Name Resolution (anr=) ile ad, soyad,
+        görünen ad, sAMAccountName ve e-posta üzerinde önek araması; en fazla limit kayıt istenir.
+        """
+        try:
+            self._ensure_connection()
+            type_filters = {
+                "user": "(&(objectCategory=person)(objectClass=user))",
+                "group": "(objectCategory=group)",
+                "computer": "(objectCategory=computer)",
+            }
+            search_filter = f"(&(anr={escape_filter_chars(query)})(|{''.join(type_filters[t] for t in types)}))"
+            entries = self._search(
+                self.base_dn,
+                search_filter,
+                method="lookup",
+                attributes=['objectClass', 'sAMAccountName', 'displayName', 'cn'],
+                size_limit=limit
+            )
+            results = [
+                {"type": kind, "name": name, "sam_account_name": sam}
+                for kind, name, sam in filter(None, (self._lookup_object(entry) for entry in entries))
+            ]
+            return rank(results, query)[:limit]
+        except Exception as e:
+            logger.error(f"Hızlı arama hatası: {str(e)}")
+            raise
+    
     def move_computer_to_ou(self, sam_account_name: str, target_ou_dn: str) -> bool:
         """Bilgisayarı farklı bir OU'ya taşı"""
         try:
@@ -596,9 +1552,10 @@ class ADConnection:
             new_dn = f"{computer_cn},{target_ou_dn}"
             
             # Taşıma işlemi (modify_dn kullan)
-            success = self.conn.modify_dn(
+            success = self._modify_dn(
                 computer_dn,
                 computer_cn,
+                method="move_computer_to_ou",
                 new_superior=target_ou_dn
             )
             
@@ -613,80 +1570,271 @@ class ADConnection:
             logger.error(f"Bilgisayar taşıma hatası: {str(e)}")
             raise
     
+    def _search_sam_dns(self, object_filter: str, sam_account_names: List[str]) -> List[Tuple[str, str]]:
+        """sAMAccountName'leri BULK_LOOKUP_CHUNK'lık OR filtreleriyle ara: (sAMAccountName, DN) listesi"""
+        names = sorted(set(sam_account_names))
+        found = []
+        for start in range(0, len(names), BULK_LOOKUP_CHUNK):
+            clauses = "".join(
+                f"(sAMAccountName={escape_filter_chars(name)})" for name in names[start:start + BULK_LOOKUP_CHUNK]
+            )
+            entries = self._paged_search(
+                self.base_dn,
+                f"(&{object_filter}(|{clauses}))",
+                method="_search_sam_dns",
+                attributes=['sAMAccountName', 'distinguishedName']
+            )
+            found.extend(
+                (str(entry['sAMAccountName'][0]), str(entry['distinguishedName'][0])) for entry in entries
+            )
+        return found
+    
+    def _search_account_names(self, dns: List[str]) -> Dict[str, str]:
+        """
+        DN'lerden kullanıcı/bilgisayar hesaplarını BULK_LOOKUP_CHUNK'lık OR filtreleriyle ara:
+        {küçük harf DN: sAMAccountName}. Diğer nesneler (grup, kişi, yabancı güvenlik sorumlusu) dönmez.
+        """
+        found: Dict[str, str] = {}
+        for start in range(0, len(dns), BULK_LOOKUP_CHUNK):
+            clauses = "".join(
+                f"(distinguishedName={escape_filter_chars(dn)})" for dn in dns[start:start + BULK_LOOKUP_CHUNK]
+            )
+            entries = self._paged_search(
+                self.base_dn,
+                f"(&(objectClass=user)(|{clauses}))",
+                method="_search_account_names",
+                attributes=['sAMAccountName']
+            )
+            for entry in entries:
+                found[str(entry['distinguishedName'][0]).lower()] = str(entry['sAMAccountName'][0])
+        return found
+    
+    def _get_computer_dns(self, sam_account_names: List[str]) -> Dict[str, str]:
+        """Bilgisayar DN'lerini toplu getir: {küçük harf, '$'sız ad: DN}"""
+        names = {name.lower().rstrip('$') for name in sam_account_names if name.strip('$')}
+        dns: Dict[str, str] = {}
+        for sam, dn in self._search_sam_dns("(objectClass=computer)", [n + '$' for n in names] + list(names)):
+            key = sam.lower().rstrip('$')
+            # _get_computer_dn gibi '$'lı hesap önceliklidir
+            if sam.endswith('$') or key not in dns:
+                dns[key] = dn
+        return dns
+    
+    def _get_account_dns(self, sam_account_names: List[str]) -> Dict[str, str]:
+        """Kullanıcı/bilgisayar DN'lerini toplu getir: {küçük harf sAMAccountName: DN}"""
+        names = [name.lower() for name in sam_account_names if name]
+        dns = {sam.lower(): dn for sam, dn in self._search_sam_dns("(objectClass=user)", names)}
+        # Bu domain'de olmayanlar _get_user_dn gibi orman genelinde (GC) aranır
+        for name in names:
+            if name not in dns and self.gc_server:
+                dn = self._gc_resolve_dn(f"(&(objectClass=user)(sAMAccountName={escape_filter_chars(name)}))")
+                if dn:
+                    dns[name] = dn
+        return dns
+    
+    def move_computers_to_ou(self, sam_account_names: List[str], target_ou_dn: str,
+                             max_workers: int = BULK_MOVE_MAX_WORKERS,
+                             progress: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Birden fazla bilgisayarı aynı OU'ya taşı.
+        DN'ler tek seferde çözümlenir; modify_dn işlemleri en fazla max_workers ayrı bağlantıda
+        (ana bağlantıyla aynı DC'de) paralel çalışır. Her bilgisayar için sonuç döner, bir
+        bilgisayarın hatası diğerlerini durdurmaz; progress verilirse her sonuçla çağrılır.
+        """
+        try:
+            self._ensure_connection()
+            if not self._search(target_ou_dn, '(objectClass=*)',
+                                method="move_computers_to_ou", search_scope=BASE, attributes=['objectClass']):
+                raise ValueError(f"Hedef OU bulunamadı: {target_ou_dn}")
+            
+            names = list(dict.fromkeys(name.strip() for name in sam_account_names if name.strip()))
+            dns = self._get_computer_dns(names)
+            results: List[Dict] = []
+            tasks = []
+            for name in names:
+                dn = dns.get(name.lower().rstrip('$'))
+                result = {"sam_account_name": name, "success": False, "skipped": False,
+                          "error": None, "old_dn": dn, "new_dn": None}
+                results.append(result)
+                if dn is None:
+                    result["error"] = f"Bilgisayar bulunamadı: {name}"
+                elif parent_dn(dn).lower() == target_ou_dn.lower():
+                    result.update(success=True, skipped=True, new_dn=dn)
+                else:
+                    tasks.append(result)
+                    continue
+                if progress:
+                    progress(result)
+            
+            # Çalışan başına bir ek bağlantı; DN'ler ana bağlantının DC'sinde çözümlendi
+            local = threading.local()
+            connections: List[Connection] = []
+            connections_lock = threading.Lock()
+            
+            def move(result: Dict):
+                dn = result["old_dn"]
+                parent = parent_dn(dn)
+                relative_dn = dn[:len(dn) - len(parent) - 1] if parent else dn
+                try:
+                    conn = getattr(local, "conn", None)
+                    if conn is None:
+                        conn = local.conn = self._borrow_connection()
+                        with connections_lock:
+                            connections.append(conn)
+                    if self._modify_dn(dn, relative_dn,
+                                       method="move_computers_to_ou", new_superior=target_ou_dn, conn=conn):
+                        result.update(success=True, new_dn=f"{relative_dn},{target_ou_dn}")
+                    else:
+                        result["error"] = f"Bilgisayar taşınamadı: {conn.result.get('description', 'Bilinmeyen hata')}"
+                except Exception as e:
+                    result["error"] = str(e)
+                if progress:
+                    progress(result)
+            
+            try:
+                if tasks:
+                    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))),
+                                            thread_name_prefix="bulk-move") as executor:
+                        list(executor.map(move, tasks))
+            finally:
+                for conn in connections:
+                    self._release_connection(conn)
+            
+            moved = sum(1 for r in results if r["success"] and not r["skipped"])
+            failed = sum(1 for r in results if not r["success"])
+            logger.info(f"Toplu bilgisayar taşıma: {moved} taşındı, {failed} hata -> {target_ou_dn}")
+            return results
+        except Exception as e:
+            logger.error(f"Toplu bilgisayar taşıma hatası: {str(e)}")
+            raise
+    
+    def _vlv_window(self, search_base: str, search_filter: str, attributes: List[str], sort_attribute: str,
+                    page: int, page_size: int, start_with: Optional[str] = None,
+                    search_scope=SUBTREE) -> Optional[Tuple[List[CaseInsensitiveDict], int, int]]:
+        """
+        Sıralı listenin tek sayfasını VLV + sunucu tarafı sıralama ile oku: (kayıtlar, sayfa, toplam).
+        start_with verilirse sıralama değeri ona eşit veya büyük ilk kaydın sayfası döner.
+        DC kontrolleri desteklemiyor veya isteği reddediyorsa None (çağıran anlık görüntüye düşer).
+        """
+        server = f"{self.conn.server.host}:{self.conn.server.port}"
+        if not vlv_available(server, sort_attribute):
+            return None
+        
+        def window(vlv):
+            entries = self._search(search_base, search_filter,
+                                   method="_vlv_window", search_scope=search_scope, attributes=attributes,
+                                   controls=[sort_control(sort_attribute), vlv])
+            return entries, vlv_result(self.conn.result)
+        
+        if start_with:
+            # Yalnızca hedefin konumu istenir, sayfa sınırına hizalı pencere ayrıca okunur
+            _, response = window(vlv_control(0, 0, value=start_with))
+            if response is None and (self.conn.result or {}).get('result') == 32:
+                return [], 1, 0
+            if response is None:
+                mark_vlv_rejected(server, sort_attribute)
+                return None
+            position, total = response
+            page = (min(position, max(total, 1)) - 1) // page_size + 1
+        
+        page = max(1, page)
+        entries, response = window(vlv_control(0, page_size - 1, offset=(page - 1) * page_size + 1))
+        if response is None and (self.conn.result or {}).get('result') == 32:
+            # Arama kökü (OU) yok: boş liste, VLV desteğiyle ilgisi yok
+            return [], 1, 0
+        if response is None:
+            mark_vlv_rejected(server, sort_attribute)
+            logger.info(f"VLV kullanılamadı ({server}, {sort_attribute}): "
+                        f"{(self.conn.result or {}).get('description')}; anlık görüntüye geçiliyor")
+            return None
+        _, total = response
+        clamped, _ = page_bounds(page, page_size, total)
+        if clamped != page:
+            # Son sayfadan ötesi istendi; DC son kaydı döndürür, son sayfa yeniden okunur
+            page = clamped
+            entries, response = window(vlv_control(0, page_size - 1, offset=(page - 1) * page_size + 1))
+            if response is None:
+                mark_vlv_rejected(server, sort_attribute)
+                return None
+            _, total = response
+        return entries[:page_size], page, total
+    
+    def _snapshot_page(self, key: Tuple, load, sort_field: str, page: int, page_size: int,
+                       start_with: Optional[str] = None) -> Tuple[List, int, int]:
+        """Önbellekteki (yoksa load() ile oluşturulan) sıralı listeden sayfa: (kayıtlar, sayfa, toplam)"""
+        snapshot = snapshot_cache.get(key)
+        if snapshot is None:
+            snapshot = snapshot_cache.put(key, Snapshot(load(), lambda item: getattr(item, sort_field)))
+        if start_with:
+            page = snapshot.page_of(start_with, page_size)
+        items, page = snapshot.window(page, page_size)
+        return items, page, len(snapshot.items)
+    
     def get_users_paginated(self, page: int = 1, page_size: int = 50, 
                            group_filter: Optional[str] = None, 
-                           search_filter: Optional[str] = None) -> dict:
-        """Sayfalanmış kullanıcı listesi getir"""
+                           search_filter: Optional[str] = None,
+                           sort_by: str = "sam_account_name",
+                           start_with: Optional[str] = None) -> dict:
+        """
+        Sıralı, sayfalanmış kullanıcı listesi.
+        DC yalnızca istenen sayfayı döndürür (VLV); start_with ile o harfle/önekle başlayan
+        ilk kullanıcının sayfasına atlanır.
+        """
         try:
             self._ensure_connection()
-            
-            # Tüm kullanıcıları getir (önce filtreleme yapmak için)
-            all_users = self.get_users(group_filter=group_filter, search_filter=search_filter)
-            
-            # Sayfalama hesapla
-            total_count = len(all_users)
-            total_pages = (total_count + page_size - 1) // page_size
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            
-            # Sayfa dışı kontrolü
-            if page < 1:
-                page = 1
-            if page > total_pages and total_pages > 0:
-                page = total_pages
-                start_idx = (page - 1) * page_size
-                end_idx = start_idx + page_size
-            
-            paginated_users = all_users[start_idx:end_idx]
-            
-            return {
-                "users": paginated_users,
-                "page": page,
-                "page_size": page_size,
-                "total_count": total_count,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            sort_attribute, sort_field = USER_SORT_FIELDS[sort_by]
+            
+            window = self._vlv_window(self.base_dn, self._user_filter(group_filter, search_filter),
+                                      USER_LIST_ATTRIBUTES, sort_attribute, page, page_size, start_with)
+            if window is not None:
+                entries, page, total_count = window
+                users = []
+                for entry in entries:
+                    try:
+                        users.append(self._entry_to_user_info(entry))
+                    except Exception as e:
+                        logger.error(f"Kullanıcı işleme hatası: {str(e)}")
+                return page_result("users", users, page, page_size, total_count, sort_by=sort_by, paging="vlv")
+            
+            users, page, total_count = self._snapshot_page(
+                ("users", self.server, self.base_dn, self.username, group_filter, search_filter, sort_by),
+                lambda: self.get_users(group_filter=group_filter, search_filter=search_filter),
+                sort_field, page, page_size, start_with
+            )
+            return page_result("users", users, page, page_size, total_count, sort_by=sort_by, paging="snapshot")
         except Exception as e:
             logger.error(f"Sayfalanmış kullanıcı getirme hatası: {str(e)}")
             raise
     
     def get_computers_paginated(self, page: int = 1, page_size: int = 50,
                                search_filter: Optional[str] = None,
-                               ou_filter: Optional[str] = None) -> dict:
-        """Sayfalanmış bilgisayar listesi getir"""
+                               ou_filter: Optional[str] = None,
+                               ou_scope: str = "subtree",
+                               start_with: Optional[str] = None) -> dict:
+        """Ada göre sıralı, sayfalanmış bilgisayar listesi (VLV; yoksa anlık görüntü)"""
         try:
             self._ensure_connection()
-            
-            # Tüm bilgisayarları getir
-            all_computers = self.get_computers(search_filter=search_filter, ou_filter=ou_filter)
-            
-            # Sayfalama hesapla
-            total_count = len(all_computers)
-            total_pages = (total_count + page_size - 1) // page_size
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            
-            # Sayfa dışı kontrolü
-            if page < 1:
-                page = 1
-            if page > total_pages and total_pages > 0:
-                page = total_pages
-                start_idx = (page - 1) * page_size
-                end_idx = start_idx + page_size
-            
-            paginated_computers = all_computers[start_idx:end_idx]
-            
-            return {
-                "computers": paginated_computers,
-                "page": page,
-                "page_size": page_size,
-                "total_count": total_count,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            sort_attribute, sort_field = COMPUTER_SORT_FIELDS["name"]
+            base, scope = self._computer_search_base(ou_filter, ou_scope)
+            
+            window = self._vlv_window(base, self._computer_filter(search_filter), COMPUTER_LIST_ATTRIBUTES,
+                                      sort_attribute, page, page_size, start_with, search_scope=scope)
+            if window is not None:
+                entries, page, total_count = window
+                computers = []
+                for entry in entries:
+                    try:
+                        computers.append(self._entry_to_computer_info(entry))
+                    except Exception as e:
+                        logger.error(f"Bilgisayar işleme hatası: {str(e)}")
+                return page_result("computers", computers, page, page_size, total_count, paging="vlv")
+            
+            computers, page, total_count = self._snapshot_page(
+                ("computers", self.server, self.base_dn, self.username, search_filter, ou_filter, ou_scope),
+                lambda: self.get_computers(search_filter=search_filter, ou_filter=ou_filter, ou_scope=ou_scope),
+                sort_field, page, page_size, start_with
+            )
+            return page_result("computers", computers, page, page_size, total_count, paging="snapshot")
         except Exception as e:
             logger.error(f"Sayfalanmış bilgisayar getirme hatası: {str(e)}")
             raise
@@ -704,18 +1852,20 @@ class ADConnection:
             unicode_password = f'"{new_password}"'.encode('utf-16-le')
             
             # Şifreyi değiştir
-            success = self.conn.modify(
+            success = self._modify(
                 user_dn,
-                {'unicodePwd': [(MODIFY_REPLACE, [unicode_password])]}
+                {'unicodePwd': [(MODIFY_REPLACE, [unicode_password])]},
+                method="reset_password"
             )
             
             if success:
                 # Şifre değişimini zorunlu kıl (isteğe bağlı)
                 if must_change:
                     # pwdLastSet = 0 yaparak ilk girişte şifre değiştirmeyi zorunlu kıl
-                    self.conn.modify(
+                    self._modify(
                         user_dn,
-                        {'pwdLastSet': [(MODIFY_REPLACE, [0])]}
+                        {'pwdLastSet': [(MODIFY_REPLACE, [0])]},
+                        method="reset_password"
                     )
                 logger.info(f"Şifre başarıyla sıfırlandı: {sam_account_name}")
                 return True
@@ -736,16 +1886,17 @@ class ADConnection:
                 raise ValueError(f"Kullanıcı bulunamadı: {sam_account_name}")
             
             # Önce mevcut userAccountControl değerini al
-            self.conn.search(
+            entries = self._search(
                 user_dn,
                 '(objectClass=user)',
+                method="set_account_status",
                 attributes=['userAccountControl']
             )
             
-            if not self.conn.entries:
+            if not entries:
                 raise ValueError(f"Kullanıcı bilgileri alınamadı: {sam_account_name}")
             
-            current_uac = int(str(self.conn.entries[0].get('userAccountControl', ['512'])[0]))
+            current_uac = int(str(entries[0].get('userAccountControl', ['512'])[0]))
             
             # ACCOUNTDISABLE flag'i (0x0002)
             if enabled:
@@ -756,9 +1907,10 @@ class ADConnection:
                 new_uac = current_uac | 0x0002
             
             # Değişikliği uygula
-            success = self.conn.modify(
+            success = self._modify(
                 user_dn,
-                {'userAccountControl': [(MODIFY_REPLACE, [new_uac])]}
+                {'userAccountControl': [(MODIFY_REPLACE, [new_uac])]},
+                method="set_account_status"
             )
             
             if success:
@@ -786,12 +1938,14 @@ class ADConnection:
                 raise ValueError(f"Grup bulunamadı: {group_name}")
             
             # Gruba üye ekle
-            success = self.conn.modify(
+            success = self._modify(
                 group_dn,
-                {'member': [(MODIFY_ADD, [user_dn])]}
+                {'member': [(MODIFY_ADD, [user_dn])]},
+                method="add_user_to_group"
             )
             
             if success:
+                _invalidate_member_count(group_dn)
                 logger.info(f"Kullanıcı gruba eklendi: {sam_account_name} -> {group_name}")
                 return True
             else:
@@ -815,12 +1969,14 @@ class ADConnection:
                 raise ValueError(f"Grup bulunamadı: {group_name}")
             
             # Gruptan üye çıkar
-            success = self.conn.modify(
+            success = self._modify(
                 group_dn,
-                {'member': [(MODIFY_DELETE, [user_dn])]}
+                {'member': [(MODIFY_DELETE, [user_dn])]},
+                method="remove_user_from_group"
             )
             
             if success:
+                _invalidate_member_count(group_dn)
                 logger.info(f"Kullanıcı gruptan çıkarıldı: {sam_account_name} <- {group_name}")
                 return True
             else:
@@ -831,122 +1987,279 @@ class ADConnection:
             logger.error(f"Grup üyeliği çıkarma hatası: {str(e)}")
             raise
     
-    def get_computers(self, search_filter: Optional[str] = None, ou_filter: Optional[str] = None) -> List[ComputerInfo]:
-        """Bilgisayarları getir"""
+    def set_computer_status(self, sam_account_name: str, enabled: bool) -> bool:
+        """Bilgisayar hesabını aktif/pasif yap (DN ve userAccountControl tek aramada okunur)"""
         try:
             self._ensure_connection()
+            entry = self._find_computer_entry(sam_account_name, ['userAccountControl'])
+            if not entry:
+                raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+            computer_dn = str(entry['distinguishedName'][0])
+            
+            # WORKSTATION_TRUST_ACCOUNT (0x1000) varsayılanı; ACCOUNTDISABLE flag'i (0x0002)
+            current_uac = int(str(entry.get('userAccountControl', ['4096'])[0]))
+            new_uac = current_uac & ~0x0002 if enabled else current_uac | 0x0002
+            
+            success = self._modify(
+                computer_dn,
+                {'userAccountControl': [(MODIFY_REPLACE, [new_uac])]},
+                method="set_computer_status"
+            )
             
-            # Base search filter
-            search_base = "(&(objectClass=computer)"
+            if success:
+                status = "aktif" if enabled else "pasif"
+                logger.info(f"Bilgisayar {status} yapıldı: {sam_account_name}")
+                return True
+            else:
+                error_msg = self.conn.result.get('description', 'Bilinmeyen hata')
+                logger.error(f"Bilgisayar durumu değiştirme hatası: {error_msg}")
+                raise Exception(f"Bilgisayar durumu değiştirilemedi: {error_msg}")
+        except Exception as e:
+            logger.error(f"Bilgisayar durumu değiştirme hatası: {str(e)}")
+            raise
+    
+    def add_computer_to_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Bilgisayarı gruba ekle"""
+        try:
+            self._ensure_connection()
+            computer_dn = self._get_computer_dn(sam_account_name)
+            if not computer_dn:
+                raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
             
-            # Arama filtresi ekle
-            if search_filter:
-                search_base += f"(|(cn=*{search_filter}*)(dNSHostName=*{search_filter}*)(description=*{search_filter}*))"
+            group_dn = self._get_group_dn(group_name)
+            if not group_dn:
+                raise ValueError(f"Grup bulunamadı: {group_name}")
             
-            search_base += ")"
+            success = self._modify(
+                group_dn,
+                {'member': [(MODIFY_ADD, [computer_dn])]},
+                method="add_computer_to_group"
+            )
             
-            # Bilgisayarları ara
-            self.conn.search(
-                self.base_dn,
-                search_base,
-                attributes=[
-                    'sAMAccountName',
-                    'cn',
-                    'dNSHostName',
-                    'operatingSystem',
-                    'operatingSystemVersion',
-                    'operatingSystemServicePack',
-                    'lastLogon',
-                    'lastLogonTimestamp',
-                    'distinguishedName',
-                    'whenCreated',
-                    'whenChanged',
-                    'userAccountControl',
-                    'description',
-                    'managedBy',
-                    'location',
-                    'memberOf'
-                ]
+            if success:
+                _invalidate_member_count(group_dn)
+                logger.info(f"Bilgisayar gruba eklendi: {sam_account_name} -> {group_name}")
+                return True
+            else:
+                error_msg = self.conn.result.get('description', 'Bilinmeyen hata')
+                logger.error(f"Bilgisayar grup üyeliği ekleme hatası: {error_msg}")
+                raise Exception(f"Bilgisayar gruba eklenemedi: {error_msg}")
+        except Exception as e:
+            logger.error(f"Bilgisayar grup üyeliği ekleme hatası: {str(e)}")
+            raise
+    
+    def remove_computer_from_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Bilgisayarı gruptan çıkar"""
+        try:
+            self._ensure_connection()
+            computer_dn = self._get_computer_dn(sam_account_name)
+            if not computer_dn:
+                raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+            
+            group_dn = self._get_group_dn(group_name)
+            if not group_dn:
+                raise ValueError(f"Grup bulunamadı: {group_name}")
+            
+            success = self._modify(
+                group_dn,
+                {'member': [(MODIFY_DELETE, [computer_dn])]},
+                method="remove_computer_from_group"
+            )
+            
+            if success:
+                _invalidate_member_count(group_dn)
+                logger.info(f"Bilgisayar gruptan çıkarıldı: {sam_account_name} <- {group_name}")
+                return True
+            else:
+                error_msg = self.conn.result.get('description', 'Bilinmeyen hata')
+                logger.error(f"Bilgisayar grup üyeliği çıkarma hatası: {error_msg}")
+                raise Exception(f"Bilgisayar gruptan çıkarılamadı: {error_msg}")
+        except Exception as e:
+            logger.error(f"Bilgisayar grup üyeliği çıkarma hatası: {str(e)}")
+            raise
+    
+    def set_group_members(self, group_name: str, sam_account_names: List[str], dry_run: bool = False) -> Dict:
+        """
+        Grubun üyelerini verilen listeyle eşitle.
+        Mevcut üyelerle fark hesaplanır; eklemeler ve çıkarmalar MEMBERSHIP_MODIFY_CHUNK değerlik
+        çok değerli modify işlemleriyle uygulanır (küçük farklar tek atomik modify). Listede olmayan
+        kullanıcı/bilgisayar hesapları çıkarılır; liste yalnızca hesap adı içerebildiğinden diğer üyeler
+        (iç içe gruplar, kişiler, yabancı güvenlik sorumluları) korunur ve preserved'da sayılır.
+        added/removed sAMAccountName listeleridir; bulunamayan adlar not_found'da döner.
+        """
+        try:
+            self._ensure_connection()
+            group_dn = self._get_group_dn(group_name)
+            if not group_dn:
+                raise ValueError(f"Grup bulunamadı: {group_name}")
+            
+            names = list(dict.fromkeys(name.strip() for name in sam_account_names if name.strip()))
+            dns = self._get_account_dns(names)
+            not_found = [name for name in names if name.lower() not in dns]
+            desired = {dn.lower(): (name, dn) for name in names if (dn := dns.get(name.lower()))}
+            current = {dn.lower(): dn for dn in self._iter_attribute_range(group_dn, method="set_group_members")}
+            
+            adds = [desired[key] for key in desired if key not in current]
+            candidates = [current[key] for key in current if key not in desired]
+            accounts = self._search_account_names(candidates) if candidates else {}
+            removes = [(accounts[dn.lower()], dn) for dn in candidates if dn.lower() in accounts]
+            changes = [(MODIFY_ADD, dn) for _, dn in adds] + [(MODIFY_DELETE, dn) for _, dn in removes]
+            operations = 0
+            if not dry_run:
+                try:
+                    for start in range(0, len(changes), MEMBERSHIP_MODIFY_CHUNK):
+                        chunk = changes[start:start + MEMBERSHIP_MODIFY_CHUNK]
+                        member_changes = [
+                            (operation, [dn for op, dn in chunk if op == operation])
+                            for operation in (MODIFY_ADD, MODIFY_DELETE)
+                            if any(op == operation for op, _ in chunk)
+                        ]
+                        if not self._modify(group_dn, {'member': member_changes}, method="set_group_members"):
+                            error_msg = self.conn.result.get('description', 'Bilinmeyen hata')
+                            raise Exception(
+                                f"Grup üyeliği güncellenemedi ({start}/{len(changes)} değişiklik uygulandı): {error_msg}"
+                            )
+                        operations += 1
+                finally:
+                    if operations:
+                        _invalidate_member_count(group_dn)
+                logger.info(f"Grup üyeliği eşitlendi: {group_name} (+{len(adds)} / -{len(removes)}, {operations} modify)")
+            
+            return {
+                "group_name": group_name,
+                "group_dn": group_dn,
+                "added": [name for name, _ in adds],
+                "removed": [name for name, _ in removes],
+                "unchanged": len(desired) - len(adds),
+                "preserved": len(candidates) - len(removes),
+                "not_found": not_found,
+                "operations": operations,
+                "dry_run": dry_run
+            }
+        except Exception as e:
+            logger.error(f"Grup üyeliği eşitleme hatası: {str(e)}")
+            raise
+    
+    def _ou_search_base(self, ou_filter: str) -> str:
+        """OU filtresi (DN veya 'Devices/Istanbul' biçiminde yol) -> arama kökü DN"""
+        if '=' in ou_filter:
+            return ou_filter
+        return ou_path_to_dn(ou_filter, self.base_dn)
+    
+    def _computer_search_base(self, ou_filter: Optional[str] = None, ou_scope: str = "subtree"):
+        """
+        Bilgisayar aramasının kökü ve kapsamı.
+        ou_filter verilirse arama o OU'dan başlar (subtree: alt OU'lar dahil, one: yalnızca doğrudan).
+        """
+        if ou_filter:
+            return self._ou_search_base(ou_filter), LEVEL if ou_scope == "one" else SUBTREE
+        return self.base_dn, SUBTREE
+    
+    def _computer_filter(self, search_filter: Optional[str] = None) -> str:
+        """Bilgisayar listesi LDAP filtresi"""
+        # Base search filter
+        search_base = "(&(objectClass=computer)"
+        
+        # Arama filtresi ekle
+        if search_filter:
+            search_base += f"(|(cn=*{search_filter}*)(dNSHostName=*{search_filter}*)(description=*{search_filter}*))"
+        
+        return search_base + ")"
+    
+    def _entry_to_computer_info(self, entry: CaseInsensitiveDict) -> ComputerInfo:
+        """Liste aramasındaki kaydı ComputerInfo'ya çevir"""
+        sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
+        name = str(entry.get('cn', [''])[0]) if entry.get('cn') else sam_account.rstrip('$')
+        dns_host_name = str(entry.get('dNSHostName', [''])[0]) if entry.get('dNSHostName') else None
+        os_name = str(entry.get('operatingSystem', [''])[0]) if entry.get('operatingSystem') else None
+        os_version = str(entry.get('operatingSystemVersion', [''])[0]) if entry.get('operatingSystemVersion') else None
+        os_sp = str(entry.get('operatingSystemServicePack', [''])[0]) if entry.get('operatingSystemServicePack') else None
+        dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
+        description = str(entry.get('description', [''])[0]) if entry.get('description') else None
+        managed_by = str(entry.get('managedBy', [''])[0]) if entry.get('managedBy') else None
+        location = str(entry.get('location', [''])[0]) if entry.get('location') else None
+        
+        # OU bilgisini çıkar
+        ou = self._computer_ou(dn) if dn else None
+        
+        # Last logon bilgileri
+        last_logon = None
+        if entry.get('lastLogon'):
+            last_logon = self._convert_ad_timestamp(entry.get('lastLogon')[0])
+        
+        last_logon_ts = None
+        if entry.get('lastLogonTimestamp'):
+            last_logon_ts = self._convert_ad_timestamp(entry.get('lastLogonTimestamp')[0])
+        
+        # When created/changed
+        when_created = str(entry.get('whenCreated', [''])[0]) if entry.get('whenCreated') else None
+        when_changed = str(entry.get('whenChanged', [''])[0]) if entry.get('whenChanged') else None
+        
+        # Hesap durumu
+        uac = int(str(entry.get('userAccountControl', ['4096'])[0]))
+        account_enabled = not bool(uac & 0x0002)
+        account_disabled = bool(uac & 0x0002)
+        
+        # Grupları getir
+        groups = groups_from_member_of(entry.get('memberOf'))
+        
+        return ComputerInfo(
+            sam_account_name=sam_account,
+            name=name,
+            dns_host_name=dns_host_name,
+            operating_system=os_name,
+            operating_system_version=os_version,
+            operating_system_service_pack=os_sp,
+            last_logon=last_logon,
+            last_logon_timestamp=last_logon_ts,
+            last_logged_on_user=None,  # WMI ile doldurulacak
+            distinguished_name=dn,
+            organizational_unit=ou,
+            location=location,
+            when_created=when_created,
+            when_changed=when_changed,
+            groups=groups,
+            account_enabled=account_enabled,
+            account_disabled=account_disabled,
+            description=description,
+            managed_by=managed_by,
+            ip_address=None,
+            mac_address=None,
+            attributes=[]
+        )
+    
+    def get_computer(self, sam_account_name: str) -> Optional[ComputerInfo]:
+        """Belirli bir bilgisayarı getir (tek arama, yalnızca detay görünümünün attribute'ları)"""
+        try:
+            self._ensure_connection()
+            entry = self._find_computer_entry(sam_account_name, COMPUTER_LIST_ATTRIBUTES)
+            return self._entry_to_computer_info(entry) if entry else None
+        except Exception as e:
+            logger.error(f"Bilgisayar getirme hatası: {str(e)}")
+            raise
+    
+    def get_computers(self, search_filter: Optional[str] = None, ou_filter: Optional[str] = None,
+                      ou_scope: str = "subtree") -> List[ComputerInfo]:
+        """
+        Bilgisayarları getir.
+        ou_filter verilirse arama o OU'dan başlar (subtree: alt OU'lar dahil, one: yalnızca doğrudan).
+        """
+        try:
+            self._ensure_connection()
+            base, scope = self._computer_search_base(ou_filter, ou_scope)
+            
+            # Bilgisayarları ara (OU yoksa noSuchObject: boş liste)
+            entries = self._search(
+                base,
+                self._computer_filter(search_filter), method="get_computers",
+                search_scope=scope,
+                attributes=COMPUTER_LIST_ATTRIBUTES
             )
             
             computers = []
-            for entry in self.conn.entries:
+            for entry in entries:
                 try:
-                    sam_account = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
-                    name = str(entry.get('cn', [''])[0]) if entry.get('cn') else sam_account.rstrip('$')
-                    dns_host_name = str(entry.get('dNSHostName', [''])[0]) if entry.get('dNSHostName') else None
-                    os_name = str(entry.get('operatingSystem', [''])[0]) if entry.get('operatingSystem') else None
-                    os_version = str(entry.get('operatingSystemVersion', [''])[0]) if entry.get('operatingSystemVersion') else None
-                    os_sp = str(entry.get('operatingSystemServicePack', [''])[0]) if entry.get('operatingSystemServicePack') else None
-                    dn = str(entry.get('distinguishedName', [''])[0]) if entry.get('distinguishedName') else ''
-                    description = str(entry.get('description', [''])[0]) if entry.get('description') else None
-                    managed_by = str(entry.get('managedBy', [''])[0]) if entry.get('managedBy') else None
-                    location = str(entry.get('location', [''])[0]) if entry.get('location') else None
-                    
-                    # OU bilgisini çıkar
-                    ou = None
-                    if dn:
-                        ou_parts = [p.split('=')[1] for p in dn.split(',') if p.startswith('OU=')]
-                        ou = '/'.join(reversed(ou_parts)) if ou_parts else None
-                    
-                    # OU filtresi kontrolü
-                    if ou_filter and ou and ou_filter.lower() not in ou.lower():
-                        continue
-                    
-                    # Last logon bilgileri
-                    last_logon = None
-                    if entry.get('lastLogon'):
-                        logon_timestamp = int(str(entry.get('lastLogon')[0]))
-                        if logon_timestamp > 0:
-                            last_logon = self._convert_ad_timestamp(logon_timestamp)
-                    
-                    last_logon_ts = None
-                    if entry.get('lastLogonTimestamp'):
-                        logon_ts = int(str(entry.get('lastLogonTimestamp')[0]))
-                        if logon_ts > 0:
-                            last_logon_ts = self._convert_ad_timestamp(logon_ts)
-                    
-                    # When created/changed
-                    when_created = str(entry.get('whenCreated', [''])[0]) if entry.get('whenCreated') else None
-                    when_changed = str(entry.get('whenChanged', [''])[0]) if entry.get('whenChanged') else None
-                    
-                    # Hesap durumu
-                    uac = int(str(entry.get('userAccountControl', ['4096'])[0]))
-                    account_enabled = not bool(uac & 0x0002)
-                    account_disabled = bool(uac & 0x0002)
-                    
-                    # Grupları getir
-                    groups = []
-                    if entry.get('memberOf'):
-                        for group_dn in entry.get('memberOf'):
-                            group_cn = str(group_dn).split(',')[0].replace('CN=', '')
-                            groups.append(group_cn)
-                    
-                    computer_info = ComputerInfo(
-                        sam_account_name=sam_account,
-                        name=name,
-                        dns_host_name=dns_host_name,
-                        operating_system=os_name,
-                        operating_system_version=os_version,
-                        operating_system_service_pack=os_sp,
-                        last_logon=last_logon,
-                        last_logon_timestamp=last_logon_ts,
-                        last_logged_on_user=None,  # WMI ile doldurulacak
-                        distinguished_name=dn,
-                        organizational_unit=ou,
-                        location=location,
-                        when_created=when_created,
-                        when_changed=when_changed,
-                        groups=groups,
-                        account_enabled=account_enabled,
-                        account_disabled=account_disabled,
-                        description=description,
-                        managed_by=managed_by,
-                        ip_address=None,
-                        mac_address=None,
-                        attributes=[]
-                    )
-                    computers.append(computer_info)
+                    computers.append(self._entry_to_computer_info(entry))
                 except Exception as e:
                     logger.error(f"Bilgisayar işleme hatası: {str(e)}")
                     continue
@@ -956,6 +2269,91 @@ class ADConnection:
             logger.error(f"Bilgisayar getirme hatası: {str(e)}")
             raise
     
+    def _computer_ou(self, dn: str) -> Optional[str]:
+        """DN'deki OU'ları kökten yaprağa doğru '/' ile birleştir"""
+        ou_parts = [p.split('=')[1] for p in dn.split(',') if p.startswith('OU=')]
+        return '/'.join(reversed(ou_parts)) if ou_parts else None
+    
+    def get_inactive_computers(self, days: int) -> List[dict]:
+        """
+        lastLogonTimestamp'i N günden eski bilgisayarlar.
+        Eşik LDAP filtresinde (indeksli lastLogonTimestamp<=FILETIME) uygulanır ve yalnızca rapor
+        alanları istenir; sunucudan sadece pasif makineler gelir. Hiç oturum açmamış (attribute'u
+        olmayan) bilgisayarlar dahil edilmez.
+        """
+        try:
+            self._ensure_connection()
+            cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+            cutoff_filetime = int((cutoff - datetime(1601, 1, 1)).total_seconds() * 10_000_000)
+            entries = self._paged_search(
+                self.base_dn,
+                f"(&(objectCategory=computer)(lastLogonTimestamp<={cutoff_filetime}))",
+                method="get_inactive_computers",
+                attributes=['sAMAccountName', 'cn', 'lastLogonTimestamp', 'operatingSystem', 'distinguishedName']
+            )
+            
+            inactive = []
+            for entry in entries:
+                sam_account = str(entry['sAMAccountName'][0]) if entry.get('sAMAccountName') else ''
+                dn = str(entry['distinguishedName'][0])
+                inactive.append({
+                    "name": str(entry['cn'][0]) if entry.get('cn') else sam_account.rstrip('$'),
+                    "sam_account_name": sam_account,
+                    "last_logon": self._convert_ad_timestamp(entry['lastLogonTimestamp'][0]) if entry.get('lastLogonTimestamp') else None,
+                    "operating_system": str(entry['operatingSystem'][0]) if entry.get('operatingSystem') else None,
+                    "organizational_unit": self._computer_ou(dn)
+                })
+            return inactive
+        except Exception as e:
+            logger.error(f"Pasif bilgisayar getirme hatası: {str(e)}")
+            raise
+    
+    def _discover_domain_controllers(self) -> List[str]:
+        """
+        Domain'deki tüm DC'lerin adresleri (SERVER_TRUST_ACCOUNT bayraklı bilgisayarlar).
+        LDAP_SERVER yalnızca bir kısmını içerebilir; lastLogon her DC'de ayrı tutulur.
+        """
+        configured = self._dc_pool(self.server).controllers
+        if not LASTLOGON_DISCOVER_DCS:
+            return [dc.address for dc in configured]
+        self._ensure_connection()
+        entries = self._search(
+            self.base_dn,
+            "(&(objectCategory=computer)(userAccountControl:1.2.840.113556.1.4.803:=8192))",
+            method="_discover_domain_controllers",
+            attributes=['dNSHostName']
+        )
+        # Yapılandırmadaki LDAPS tercihi keşfedilen DC'lere de uygulanır
+        prefix = "ldaps://" if configured and configured[0].use_ssl else ""
+        servers = sorted(prefix + str(e['dNSHostName'][0]).lower() for e in entries if e.get('dNSHostName'))
+        return servers or [dc.address for dc in configured]
+    
+    def _read_last_logon(self, server: str) -> Dict[str, int]:
+        """Tek bir DC'deki lastLogon değerleri: {sAMAccountName: FILETIME}"""
+        conn = self._open_connection(server)
+        try:
+            entries = self._paged_search(
+                self.base_dn, LASTLOGON_FILTER, method="_read_last_logon", conn=conn,
+                attributes=['sAMAccountName', 'lastLogon']
+            )
+            return {
+                str(e['sAMAccountName'][0]): to_filetime(e['lastLogon'][0])
+                for e in entries if e.get('sAMAccountName') and e.get('lastLogon')
+            }
+        finally:
+            conn.unbind()
+    
+    def build_last_logon_table(self) -> LastLogonTable:
+        """Tüm DC'lerde lastLogon'u paralel oku, obje başına en güncelini tabloya yaz"""
+        try:
+            servers = self._discover_domain_controllers()
+            table = sweep(servers, self._read_last_logon)
+            logger.info(f"lastLogon tablosu oluşturuldu: {len(table)} obje, {len(servers)} DC")
+            return table
+        except Exception as e:
+            logger.error(f"lastLogon toplama hatası: {str(e)}")
+            raise
+    
     def get_recent_changes(self, hours: int = 24, object_type: str = "all") -> List[dict]:
         """
         Son X saat içinde değişen objeler (RSAT veya diğer araçlardan yapılan değişiklikler dahil)
@@ -965,78 +2363,44 @@ class ADConnection:
             self._ensure_connection()
             
             # Zaman hesapla
-            from datetime import timezone
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
             # AD generalized time format: YYYYMMDDHHmmss.0Z
             cutoff_str = cutoff_time.strftime("%Y%m%d%H%M%S.0Z")
             
-            changes = []
-            
-            # Kullanıcı değişiklikleri
+            searches = {}
             if object_type in ["all", "user"]:
-                user_filter = f"(&(objectClass=user)(objectCategory=person)(whenChanged>={cutoff_str}))"
-                self.conn.search(
-                    self.base_dn,
-                    user_filter,
-                    attributes=['sAMAccountName', 'displayName', 'whenChanged', 'whenCreated', 'modifyTimeStamp']
+                searches["user"] = (
+                    f"(&(objectClass=user)(objectCategory=person)(whenChanged>={cutoff_str}))",
+                    {"attributes": ['sAMAccountName', 'displayName', 'whenChanged', 'whenCreated', 'modifyTimeStamp']}
                 )
-                
-                for entry in self.conn.entries:
-                    sam = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
-                    display = str(entry.get('displayName', [''])[0]) if entry.get('displayName') else sam
-                    when_changed = str(entry.get('whenChanged', [''])[0]) if entry.get('whenChanged') else ''
-                    when_created = str(entry.get('whenCreated', [''])[0]) if entry.get('whenCreated') else ''
-                    
-                    changes.append({
-                        "object_type": "user",
-                        "sam_account_name": sam,
-                        "display_name": display,
-                        "when_changed": when_changed,
-                        "when_created": when_created,
-                        "change_type": "created" if when_changed == when_created else "modified"
-                    })
-            
-            # Bilgisayar değişiklikleri
             if object_type in ["all", "computer"]:
-                computer_filter = f"(&(objectClass=computer)(whenChanged>={cutoff_str}))"
-                self.conn.search(
-                    self.base_dn,
-                    computer_filter,
-                    attributes=['sAMAccountName', 'cn', 'whenChanged', 'whenCreated']
+                searches["computer"] = (
+                    f"(&(objectClass=computer)(whenChanged>={cutoff_str}))",
+                    {"attributes": ['sAMAccountName', 'cn', 'whenChanged', 'whenCreated']}
                 )
-                
-                for entry in self.conn.entries:
-                    sam = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
-                    name = str(entry.get('cn', [''])[0]) if entry.get('cn') else sam
-                    when_changed = str(entry.get('whenChanged', [''])[0]) if entry.get('whenChanged') else ''
-                    when_created = str(entry.get('whenCreated', [''])[0]) if entry.get('whenCreated') else ''
-                    
-                    changes.append({
-                        "object_type": "computer",
-                        "sam_account_name": sam,
-                        "display_name": name,
-                        "when_changed": when_changed,
-                        "when_created": when_created,
-                        "change_type": "created" if when_changed == when_created else "modified"
-                    })
-            
-            # Grup değişiklikleri
             if object_type in ["all", "group"]:
-                group_filter = f"(&(objectClass=group)(whenChanged>={cutoff_str}))"
-                self.conn.search(
-                    self.base_dn,
-                    group_filter,
-                    attributes=['cn', 'whenChanged', 'whenCreated', 'member']
+                searches["group"] = (
+                    f"(&(objectClass=group)(whenChanged>={cutoff_str}))",
+                    {"attributes": ['cn', 'whenChanged', 'whenCreated']}
                 )
-                
-                for entry in self.conn.entries:
-                    name = str(entry.get('cn', [''])[0]) if entry.get('cn') else ''
+            # Kullanıcı, bilgisayar ve grup aramaları ayrı bağlantılarda aynı anda yapılır
+            results = self._search_concurrently(searches, method="get_recent_changes")
+            
+            changes = []
+            for kind, entries in results.items():
+                for entry in entries:
+                    if kind == "group":
+                        sam = name = str(entry.get('cn', [''])[0]) if entry.get('cn') else ''
+                    else:
+                        sam = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
+                        name_attr = 'displayName' if kind == "user" else 'cn'
+                        name = str(entry.get(name_attr, [''])[0]) if entry.get(name_attr) else sam
                     when_changed = str(entry.get('whenChanged', [''])[0]) if entry.get('whenChanged') else ''
                     when_created = str(entry.get('whenCreated', [''])[0]) if entry.get('whenCreated') else ''
                     
                     changes.append({
-                        "object_type": "group",
-                        "sam_account_name": name,
+                        "object_type": kind,
+                        "sam_account_name": sam,
                         "display_name": name,
                         "when_changed": when_changed,
                         "when_created": when_created,
@@ -1070,14 +2434,21 @@ class ADConnection:
                 "expiring_passwords": []
             }
             
-            # Kullanıcı istatistikleri
-            self.conn.search(
-                self.base_dn,
-                "(&(objectClass=user)(objectCategory=person))",
-                attributes=['sAMAccountName', 'displayName', 'department', 'userAccountControl', 'pwdLastSet', 'lastLogon']
-            )
+            # Kullanıcı, bilgisayar ve grup aramaları ayrı bağlantılarda aynı anda yapılır
+            results = self._search_concurrently({
+                "users": ("(&(objectClass=user)(objectCategory=person))", {
+                    "attributes": ['sAMAccountName', 'displayName', 'department', 'userAccountControl', 'pwdLastSet',
+                                   USER_EXPIRY_ATTRIBUTE, 'lastLogon']
+                }),
+                "computers": ("(objectClass=computer)", {
+                    "attributes": ['sAMAccountName', 'cn', 'operatingSystem', 'userAccountControl', 'lastLogonTimestamp']
+                }),
+                "groups": ("(objectClass=group)", {"attributes": ['cn']}),
+            }, method="get_dashboard_stats")
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
             
-            for entry in self.conn.entries:
+            # Kullanıcı istatistikleri
+            for entry in results["users"]:
                 stats["total_users"] += 1
                 
                 uac = int(str(entry.get('userAccountControl', ['512'])[0]))
@@ -1091,32 +2462,19 @@ class ADConnection:
                 stats["users_by_department"][dept] = stats["users_by_department"].get(dept, 0) + 1
                 
                 # Şifre süresi dolacak kullanıcılar (7 gün içinde)
-                if entry.get('pwdLastSet'):
-                    pwd_ts = int(str(entry.get('pwdLastSet')[0]))
-                    if pwd_ts > 0:
-                        pwd_date = self._convert_ad_timestamp(pwd_ts)
-                        if pwd_date:
-                            try:
-                                pwd_dt = datetime.fromisoformat(pwd_date.replace('Z', '+00:00'))
-                                expires_dt = pwd_dt + timedelta(days=90)
-                                days_left = (expires_dt - datetime.now()).days
-                                if 0 <= days_left <= 7:
-                                    stats["expiring_passwords"].append({
-                                        "sam_account_name": str(entry.get('sAMAccountName', [''])[0]),
-                                        "display_name": str(entry.get('displayName', [''])[0]),
-                                        "days_left": days_left
-                                    })
-                            except:
-                                pass
+                expires_dt = self._password_expiry(entry)
+                if expires_dt:
+                    days_left = (expires_dt - now).days
+                    if 0 <= days_left <= 7:
+                        sam = str(entry.get('sAMAccountName', [''])[0]) if entry.get('sAMAccountName') else ''
+                        stats["expiring_passwords"].append({
+                            "sam_account_name": sam,
+                            "display_name": str(entry.get('displayName')[0]) if entry.get('displayName') else sam,
+                            "days_left": days_left
+                        })
             
             # Bilgisayar istatistikleri
-            self.conn.search(
-                self.base_dn,
-                "(objectClass=computer)",
-                attributes=['sAMAccountName', 'cn', 'operatingSystem', 'userAccountControl', 'lastLogonTimestamp']
-            )
-            
-            for entry in self.conn.entries:
+            for entry in results["computers"]:
                 stats["total_computers"] += 1
                 
                 uac = int(str(entry.get('userAccountControl', ['4096'])[0]))
@@ -1130,12 +2488,7 @@ class ADConnection:
                 stats["computers_by_os"][os_name] = stats["computers_by_os"].get(os_name, 0) + 1
             
             # Grup sayısı
-            self.conn.search(
-                self.base_dn,
-                "(objectClass=group)",
-                attributes=['cn']
-            )
-            stats["total_groups"] = len(self.conn.entries)
+            stats["total_groups"] = len(results["groups"])
             
             # Şifre süresi dolacakları sırala
             stats["expiring_passwords"].sort(key=lambda x: x.get('days_left', 99))
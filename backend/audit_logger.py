@@ -7,11 +7,17 @@ Audit Logger Module
 
 import json
 import os
+import logging
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 from pydantic import BaseModel
 from enum import Enum
 
+from metrics import AUDIT_WRITE_DURATION
+
+logger = logging.getLogger(__name__)
+
 # Audit log dosyası yolu
 AUDIT_LOG_FILE = os.path.join(os.path.dirname(__file__), "audit_logs.json")
 
@@ -34,6 +40,7 @@ class AuditActionType(str, Enum):
     # Grup işlemleri
     MEMBER_ADD = "member_add"
     MEMBER_REMOVE = "member_remove"
+    MEMBER_SYNC = "member_sync"
     GROUP_CREATE = "group_create"
     GROUP_DELETE = "group_delete"
     
@@ -69,8 +76,18 @@ class AuditLogger:
     
     def __init__(self, log_file: str = AUDIT_LOG_FILE):
         self.log_file = log_file
+        self._listeners: List[Callable[["AuditLogEntry"], None]] = []
+        # Hedef objeye göre kayıtlar (küçük harf hedef -> eskiden yeniye kayıtlar); dosyanın
+        # (mtime, boyut) bilgisi değişmediği sürece yeniden okunmaz
+        self._target_index: Optional[Dict[str, List[Dict]]] = None
+        self._index_stat: Optional[tuple] = None
+        self._index_lock = threading.Lock()
         self._ensure_log_file()
     
+    def add_listener(self, listener: Callable[["AuditLogEntry"], None]):
+        """Her yeni kayıt yazıldıktan sonra çağrılacak fonksiyonu ekle"""
+        self._listeners.append(listener)
+    
     def _ensure_log_file(self):
         """Log dosyasının varlığını kontrol et, yoksa oluştur"""
         if not os.path.exists(self.log_file):
@@ -90,12 +107,36 @@ class AuditLogger:
         with open(self.log_file, 'w', encoding='utf-8') as f:
             json.dump(logs, f, ensure_ascii=False, indent=2)
     
+    def _file_stat(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.log_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    @staticmethod
+    def _index_entries(index: Dict[str, List[Dict]], logs: List[Dict]):
+        for log in logs:
+            index.setdefault(log.get('target_object', '').lower(), []).append(log)
+    
+    def _targets(self) -> Dict[str, List[Dict]]:
+        """Hedef indeksi; dosya dışarıdan değiştiyse yeniden oluşturulur"""
+        with self._index_lock:
+            stat = self._file_stat()
+            if self._target_index is None or stat != self._index_stat:
+                index: Dict[str, List[Dict]] = {}
+                self._index_entries(index, self._read_logs())
+                self._target_index = index
+                self._index_stat = stat
+            return self._target_index
+    
     def _generate_id(self) -> str:
         """Unique ID oluştur"""
         return datetime.now().strftime("%Y%m%d%H%M%S%f")
     
-    def log(
+    def _build_entry(
         self,
+        entry_id: str,
         action_type: AuditActionType,
         performed_by: str,
         target_object: str,
@@ -105,10 +146,8 @@ class AuditLogger:
         error_message: str = None,
         source: AuditSource = AuditSource.WEB_APP
     ) -> AuditLogEntry:
-        """Yeni bir audit log kaydı oluştur"""
-        
-        entry = AuditLogEntry(
-            id=self._generate_id(),
+        return AuditLogEntry(
+            id=entry_id,
             timestamp=datetime.now().isoformat(),
             action_type=action_type,
             source=source,
@@ -119,14 +158,62 @@ class AuditLogger:
             success=success,
             error_message=error_message
         )
+    
+    def _append(self, entries: List[AuditLogEntry]):
+        """Kayıtları tek okuma/yazmada dosyaya ekle, sonra dinleyicileri çağır"""
+        records = [entry.model_dump() for entry in entries]
+        with AUDIT_WRITE_DURATION.time():
+            with self._index_lock:
+                logs = self._read_logs()
+                logs.extend(records)
+                self._write_logs(logs)
+                # İndeks güncelse yeni kayıtlar eklenir; değilse bir sonraki okumada yeniden oluşur
+                if self._target_index is not None:
+                    self._index_entries(self._target_index, records)
+                    self._index_stat = self._file_stat()
         
-        # Mevcut logları oku ve yeni kaydı ekle
-        logs = self._read_logs()
-        logs.append(entry.model_dump())
-        self._write_logs(logs)
-        
+        for entry in entries:
+            for listener in self._listeners:
+                try:
+                    listener(entry)
+                except Exception as e:
+                    logger.error(f"Audit dinleyici hatası: {str(e)}")
+    
+    def log(
+        self,
+        action_type: AuditActionType,
+        performed_by: str,
+        target_object: str,
+        target_type: str,
+        details: Dict[str, Any] = None,
+        success: bool = True,
+        error_message: str = None,
+        source: AuditSource = AuditSource.WEB_APP
+    ) -> AuditLogEntry:
+        """Yeni bir audit log kaydı oluştur"""
+        entry = self._build_entry(
+            self._generate_id(), action_type, performed_by, target_object, target_type,
+            details, success, error_message, source
+        )
+        self._append([entry])
         return entry
     
+    def log_many(self, records: List[Dict[str, Any]]) -> List[AuditLogEntry]:
+        """
+        Birden fazla kaydı tek dosya yazımıyla oluştur (toplu işlemler için).
+        records: log() parametreleriyle aynı anahtarlara sahip sözlükler.
+        """
+        if not records:
+            return []
+        # Aynı mikrosaniyede oluşan kayıtların ID'leri sıra numarasıyla ayrılır
+        base_id = self._generate_id()
+        entries = [
+            self._build_entry(f"{base_id}-{index}", **record)
+            for index, record in enumerate(records)
+        ]
+        self._append(entries)
+        return entries
+    
     def get_logs(
         self,
         limit: int = 100,
@@ -198,6 +285,19 @@ class AuditLogger:
             "offset": offset
         }
     
+    def get_target_history(
+        self,
+        target_object: str,
+        target_type: Optional[str] = None,
+        limit: int = 20
+    ) -> List[Dict]:
+        """Bir objenin (tam ad eşleşmesi) en yeniden en eskiye son kayıtları"""
+        entries = self._targets().get(target_object.lower(), [])
+        if target_type:
+            entries = [e for e in entries if e.get('target_type') == target_type]
+        entries = sorted(entries, key=lambda x: x.get('timestamp', ''), reverse=True)
+        return [dict(e) for e in entries[:limit]]
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Audit log istatistiklerini getir"""
         logs = self._read_logs()
@@ -345,3 +445,50 @@ def log_computer_move(performed_by: str, computer_name: str, target_ou: str, suc
         success=success,
         error_message=error
     )
+
+
+def log_group_membership_sync(performed_by: str, group_name: str, result: Dict[str, Any] = None,
+                              success: bool = True, error: str = None):
+    """Grup üyeliği eşitlemeyi tek kayıtla logla (eklenen/çıkarılan üyelerin özeti)"""
+    result = result or {}
+    added = result.get("added", [])
+    removed = result.get("removed", [])
+    return audit_logger.log(
+        action_type=AuditActionType.MEMBER_SYNC,
+        performed_by=performed_by,
+        target_object=group_name,
+        target_type="group",
+        details={
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "unchanged_count": result.get("unchanged", 0),
+            "preserved_count": result.get("preserved", 0),
+            "added": added,
+            "removed": removed,
+            "not_found": result.get("not_found", []),
+            "operations": result.get("operations", 0),
+            "action": f"Grup üyeliği eşitlendi (+{len(added)} / -{len(removed)})"
+        },
+        success=success,
+        error_message=error
+    )
+
+
+def log_computer_moves(performed_by: str, results: List[Dict[str, Any]], target_ou: str):
+    """Toplu bilgisayar taşıma sonuçlarını tek seferde logla (zaten hedefte olanlar atlanır)"""
+    return audit_logger.log_many([
+        {
+            "action_type": AuditActionType.COMPUTER_MOVE,
+            "performed_by": performed_by,
+            "target_object": result["sam_account_name"],
+            "target_type": "computer",
+            "details": {
+                "target_ou": target_ou,
+                "bulk": True,
+                "action": f"Bilgisayar {target_ou} OU'suna taşındı"
+            },
+            "success": result["success"],
+            "error_message": result.get("error")
+        }
+        for result in results if not result.get("skipped")
+    ])
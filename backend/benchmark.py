@@ -0,0 +1,428 @@
+"""
+AD Pulse Benchmark
+ldap3 MOCK_SYNC sunucusuna yüklenen sentetik bir dizin üzerinde tüm ADConnection
+metodlarını ve FastAPI endpoint'lerini çalıştırır; her çağrı için gecikme,
+LDAP işlem sayısı ve tepe bellek kullanımını ölçer. Sonuçlar JSON olarak yazılır.
+
+Kullanım:
+    python benchmark.py --users 2000 --computers 500 --groups 100
+    python benchmark.py --baseline eski_sonuclar.json   # regresyonları göster
+
+Not: MOCK_SYNC filtreleri Python'da lineer olarak değerlendirir. Mutlak süreler
+gerçek bir DC'yi temsil etmez; karşılaştırma için LDAP işlem sayıları ve
+aynı boyuttaki önceki çalıştırmalar esas alınmalıdır. Mock sunucu büyük çok değerli
+attribute'ları AD gibi parça parça (member;range=) döndürür; küçük dizinlerde de parçalı
+okuma yolu ölçülsün diye parça boyutu (--max-val-range) varsayılan olarak düşüktür.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import ldap3
+
+# main.py import edilmeden önce mock mode kapatılmalı (endpoint'ler gerçek kod yolunu kullanmalı)
+os.environ["MOCK_MODE"] = "false"
+# MOCK_SYNC genişletilmiş eşleşme filtresini (DC bayrağı) desteklemez; mock sunucu tek DC'dir
+os.environ.setdefault("LASTLOGON_DISCOVER_DCS", "false")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_directory import generate_directory, create_mock_server, MockSyncADConnection  # noqa: E402
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+
+class CountingADConnection(MockSyncADConnection):
+    """
+    Açtığı tüm bağlantılar (ana, eşzamanlı aramalardaki ek ve DC başına lastLogon bağlantıları)
+    üzerinden gönderilen LDAP mesajlarını türlerine göre sayar
+    """
+
+    def __init__(self, mock_server, counter: Counter, base_dn: str, max_val_range: int):
+        super().__init__(mock_server, base_dn=base_dn, max_val_range=max_val_range)
+        self.counter = counter
+
+    def _open_connection(self, server_setting: str, **connection_options):
+        conn = super()._open_connection(server_setting, **connection_options)
+        send = conn.send
+        counter = self.counter
+
+        def counting_send(message_type, request, controls=None):
+            counter[message_type] += 1
+            return send(message_type, request, controls)
+
+        conn.send = counting_send
+        counter["bindRequest"] += 1  # bind, sayaç bağlanmadan önce gönderildi
+        return conn
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(name: str, kind: str, func: Callable[[int], object], counter: Counter, repeat: int) -> Dict:
+    """Bir çağrıyı repeat kez çalıştır, ardından tracemalloc ile bir kez daha tepe belleği ölç"""
+    latencies = []
+    ops_per_call = []
+    error = None
+    status_code = None
+    for i in range(repeat):
+        counter.clear()
+        start = time.perf_counter()
+        try:
+            result = func(i)
+            if kind == "endpoint":
+                status_code = result
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        latencies.append((time.perf_counter() - start) * 1000)
+        ops_per_call.append(dict(counter))
+
+    counter.clear()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        func(repeat)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    last_ops = ops_per_call[-1] if ops_per_call else {}
+    return {
+        "kind": kind,
+        "name": name,
+        "runs": repeat,
+        "latency_ms": {
+            "min": round(min(latencies), 3),
+            "median": round(statistics.median(latencies), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "max": round(max(latencies), 3),
+        },
+        "ldap_ops": last_ops,
+        "ldap_ops_total": sum(last_ops.values()),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "status_code": status_code,
+        "error": error,
+    }
+
+
+def pick_targets(entries: List[Tuple[str, Dict]]) -> Dict[str, Any]:
+    """Çağrılarda kullanılacak örnek kullanıcı, grup, bilgisayar ve OU'ları seç"""
+    users = [a for _, a in entries if a.get("objectCategory") == "person"]
+    computers = [a for _, a in entries if a.get("objectCategory") == "computer"]
+    groups = [a for _, a in entries if a.get("objectCategory") == "group" and a.get("member")]
+    ous = [dn for dn, a in entries if "organizationalUnit" in a.get("objectClass", [])]
+    user_groups = [g for g in groups if any(",OU=Staff," in m for m in g["member"])]
+    # Orta büyüklükte bir grup: listeleme maliyeti gerçekçi, ama tüm dizin değil
+    user_groups.sort(key=lambda g: len(g["member"]))
+    medium_group = user_groups[len(user_groups) // 2] if user_groups else groups[0]
+    server_ou = next((dn for dn in ous if dn.startswith("OU=Servers,")), ous[0])
+    other_ou = next((dn for dn in ous if dn.startswith("OU=Laptops,")), ous[-1])
+    sam_by_dn = {dn.lower(): a["sAMAccountName"] for dn, a in entries if a.get("sAMAccountName")}
+    return {
+        "user": users[len(users) // 2]["sAMAccountName"],
+        "user_search": users[0]["sn"][:4],
+        "group": medium_group["cn"],
+        "group_members": [sam_by_dn[m.lower()] for m in medium_group["member"] if m.lower() in sam_by_dn],
+        "computer": computers[len(computers) // 2]["sAMAccountName"] if computers else "",
+        # Toplu taşımada ayrı bir bilgisayar kümesi (tekli taşıma testini etkilemez)
+        "bulk_computers": [c["sAMAccountName"].rstrip("$") for c in computers[:10]],
+        "computer_ou_a": server_ou,
+        "computer_ou_b": other_ou,
+        "ou_filter": "Servers",
+    }
+
+
+def next_computer_ou(t: Dict[str, Any], key: str = "computer_ou_current") -> str:
+    """Taşıma testinde bilgisayarı iki OU arasında gidip getir (aynı OU'ya taşıma hatalıdır)"""
+    t[key] = t["computer_ou_b"] if t.get(key) == t["computer_ou_a"] else t["computer_ou_a"]
+    return t[key]
+
+
+def method_cases(ad, t: Dict[str, Any]) -> List[Tuple[str, Callable[[int], object]]]:
+    """ADConnection metodları; yazma işlemleri her turda durumu geri alacak şekilde çiftlenir"""
+    computer = t["computer"].rstrip("$")
+    members = t["group_members"]
+
+    def move_computer(i):
+        ad.move_computer_to_ou(computer, next_computer_ou(t))
+
+    def create_and_delete_group(i):
+        name = f"BENCH-Group-{i:04d}"
+        ad.create_group(name, description="benchmark")
+        ad.delete_group(name)
+
+    def toggle_account(i):
+        ad.set_account_status(t["user"], enabled=(i % 2 == 1))
+
+    def add_and_remove_member(i):
+        ad.add_user_to_group(t["user"], "BENCH-Membership")
+        ad.remove_user_from_group(t["user"], "BENCH-Membership")
+
+    def sync_members(i):
+        # Son üye çıkarılıp geri eklenir; her iki eşitleme de tüm üye listesini parça parça okur
+        ad.set_group_members(t["group"], members[:-1])
+        ad.set_group_members(t["group"], members)
+
+    def move_computers(i):
+        ad.move_computers_to_ou(t["bulk_computers"], next_computer_ou(t, "bulk_ou_current"))
+
+    return [
+        ("get_users", lambda i: ad.get_users()),
+        ("get_users[search]", lambda i: ad.get_users(search_filter=t["user_search"])),
+        ("get_users[group]", lambda i: ad.get_users(group_filter=t["group"])),
+        ("get_user", lambda i: ad.get_user(t["user"])),
+        ("get_users_paginated", lambda i: ad.get_users_paginated(page=2, page_size=50)),
+        ("get_groups", lambda i: ad.get_groups()),
+        ("get_group", lambda i: ad.get_group(t["group"])),
+        ("get_group_members", lambda i: ad.get_group_members(t["group"])),
+        ("get_computers", lambda i: ad.get_computers()),
+        ("get_computers[ou]", lambda i: ad.get_computers(ou_filter=t["ou_filter"])),
+        ("get_computers_paginated", lambda i: ad.get_computers_paginated(page=2, page_size=50)),
+        ("get_computer", lambda i: ad.get_computer(t["computer"])),
+        ("get_inactive_computers", lambda i: ad.get_inactive_computers(90)),
+        ("get_organizational_units", lambda i: ad.get_organizational_units()),
+        ("build_ou_tree", lambda i: ad.build_ou_tree()),
+        ("build_lookup_index", lambda i: ad.build_lookup_index()),
+        ("build_password_expiry_index", lambda i: ad.build_password_expiry_index()),
+        ("build_last_logon_table", lambda i: ad.build_last_logon_table()),
+        ("get_recent_changes", lambda i: ad.get_recent_changes(hours=24 * 7)),
+        ("get_dashboard_stats", lambda i: ad.get_dashboard_stats()),
+        ("reset_password", lambda i: ad.reset_password(t["user"], "Bench-Passw0rd!", must_change=True)),
+        ("set_account_status", toggle_account),
+        ("add_user_to_group+remove_user_from_group", add_and_remove_member),
+        ("create_group+delete_group", create_and_delete_group),
+        ("move_computer_to_ou", move_computer),
+        ("move_computers_to_ou", move_computers),
+        ("set_group_members[dry_run]", lambda i: ad.set_group_members(t["group"], members[:-1], dry_run=True)),
+        ("set_group_members", sync_members),
+    ]
+
+
+def _asgi_request(app, method: str, path: str, body: Optional[Dict] = None) -> int:
+    """HTTP istemcisi olmadan uygulamayı doğrudan ASGI arayüzü üzerinden çağır"""
+    raw_path, _, query = path.partition("?")
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": quote(raw_path).encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"benchmark"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    sent = {"body": False}
+    status = {}
+
+    async def receive():
+        if not sent["body"]:
+            sent["body"] = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    asyncio.run(app(scope, receive, send))
+    return status.get("code", 0)
+
+
+def endpoint_cases(app, t: Dict[str, Any]) -> List[Tuple[str, Callable[[int], object]]]:
+    """FastAPI endpoint'leri (dönüş değeri HTTP durum kodudur)"""
+    from object_cache import user_cache
+
+    user, group, computer, members = t["user"], t["group"], t["computer"], t["group_members"]
+
+    def call(method, path, body=None):
+        return lambda i: _asgi_request(app, method, path, body)
+
+    def create_and_delete_group(i):
+        name = f"BENCH-Api-Group-{i:04d}"
+        _asgi_request(app, "POST", "/api/groups", {"name": name})
+        return _asgi_request(app, "DELETE", f"/api/groups/{name}")
+
+    def move_computer(i):
+        return _asgi_request(app, "POST", f"/api/computers/{computer}/move", {"target_ou_dn": next_computer_ou(t)})
+
+    def bulk_move_computers(i):
+        return _asgi_request(app, "POST", "/api/computers/bulk-move", {
+            "sam_account_names": t["bulk_computers"], "target_ou_dn": next_computer_ou(t, "bulk_ou_current")
+        })
+
+    def sync_members(i):
+        _asgi_request(app, "PUT", f"/api/groups/{group}/members", {"sam_account_names": members[:-1]})
+        return _asgi_request(app, "PUT", f"/api/groups/{group}/members", {"sam_account_names": members})
+
+    def user_overview(i):
+        # Önbellekten değil LDAP'tan okunan yol ölçülür
+        user_cache.clear()
+        return _asgi_request(app, "GET", f"/api/users/{user}/overview")
+
+    return [
+        ("GET /api/status", call("GET", "/api/status")),
+        ("GET /api/users", call("GET", "/api/users")),
+        ("GET /api/users?search", call("GET", f"/api/users?search={t['user_search']}")),
+        ("GET /api/users/paginated", call("GET", "/api/users/paginated?page=2&page_size=50")),
+        ("GET /api/users/{sam}", call("GET", f"/api/users/{user}")),
+        ("GET /api/users/{sam}/overview", user_overview),
+        ("POST /api/users/{sam}/reset-password", call("POST", f"/api/users/{user}/reset-password", {"new_password": "Bench-Passw0rd!"})),
+        ("POST /api/users/{sam}/account-status", call("POST", f"/api/users/{user}/account-status", {"enabled": True})),
+        ("POST /api/users/{sam}/groups/add", call("POST", f"/api/users/{user}/groups/add", {"group_name": "BENCH-Membership"})),
+        ("POST /api/users/{sam}/groups/remove", call("POST", f"/api/users/{user}/groups/remove", {"group_name": "BENCH-Membership"})),
+        ("GET /api/groups", call("GET", "/api/groups")),
+        ("GET /api/groups/{name}", call("GET", f"/api/groups/{group}")),
+        ("GET /api/groups/{name}/members", call("GET", f"/api/groups/{group}/members")),
+        ("POST /api/groups/{name}/members/add", call("POST", "/api/groups/BENCH-Membership/members/add", {"sam_account_name": user})),
+        ("POST /api/groups/{name}/members/remove", call("POST", "/api/groups/BENCH-Membership/members/remove", {"sam_account_name": user})),
+        ("PUT /api/groups/{name}/members[dry_run]", call("PUT", f"/api/groups/{group}/members", {"sam_account_names": members[:-1], "dry_run": True})),
+        ("PUT /api/groups/{name}/members", sync_members),
+        ("POST+DELETE /api/groups", create_and_delete_group),
+        ("GET /api/computers", call("GET", "/api/computers")),
+        ("GET /api/computers/paginated", call("GET", "/api/computers/paginated?page=2&page_size=50")),
+        ("GET /api/computers/{sam}", call("GET", f"/api/computers/{computer}")),
+        ("POST /api/computers/{sam}/account-status", call("POST", f"/api/computers/{computer}/account-status", {"enabled": True})),
+        ("POST /api/computers/{sam}/groups/add", call("POST", f"/api/computers/{computer}/groups/add", {"group_name": "BENCH-Membership"})),
+        ("POST /api/computers/{sam}/groups/remove", call("POST", f"/api/computers/{computer}/groups/remove", {"group_name": "BENCH-Membership"})),
+        ("POST /api/computers/{sam}/move", move_computer),
+        ("POST /api/computers/bulk-move", bulk_move_computers),
+        ("GET /api/ous", call("GET", "/api/ous")),
+        ("GET /api/ous/tree", call("GET", "/api/ous/tree")),
+        ("GET /api/lookup", call("GET", f"/api/lookup?q={t['user_search']}")),
+        ("GET /api/forest/search", call("GET", f"/api/forest/search?q={t['user_search']}")),
+        ("GET /api/dashboard/stats", call("GET", "/api/dashboard/stats")),
+        ("GET /api/audit/logs", call("GET", "/api/audit/logs")),
+        ("GET /api/audit/statistics", call("GET", "/api/audit/statistics")),
+        ("GET /api/changes/recent", call("GET", "/api/changes/recent?hours=168")),
+        ("GET /api/reports/password-expiry", call("GET", "/api/reports/password-expiry?days=14")),
+        ("GET /api/reports/inactive-computers", call("GET", "/api/reports/inactive-computers?days=90")),
+        ("GET /api/reports/computer-inventory", call("GET", "/api/reports/computer-inventory")),
+        ("GET /api/reports/last-logon", call("GET", "/api/reports/last-logon?days=90")),
+    ]
+
+
+def compare_with_baseline(results: List[Dict], baseline_path: str, threshold: float) -> List[str]:
+    """Önceki sonuç dosyasına göre gecikme veya LDAP işlem sayısı artan çağrıları listele"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["kind"], r["name"]): r for r in json.load(f).get("results", [])}
+    regressions = []
+    for r in results:
+        old = baseline.get((r["kind"], r["name"]))
+        if not old:
+            continue
+        old_ms, new_ms = old["latency_ms"]["median"], r["latency_ms"]["median"]
+        if old_ms > 0 and new_ms > old_ms * (1 + threshold):
+            regressions.append(f"{r['kind']} {r['name']}: median {old_ms:.1f}ms -> {new_ms:.1f}ms")
+        if r["ldap_ops_total"] > old["ldap_ops_total"]:
+            regressions.append(f"{r['kind']} {r['name']}: LDAP işlem {old['ldap_ops_total']} -> {r['ldap_ops_total']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AD Pulse benchmark (ldap3 MOCK_SYNC)")
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--computers", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-val-range", type=int, default=100,
+                        help="Mock sunucunun tek yanıttaki en fazla attribute değeri (AD varsayılanı 1500)")
+    parser.add_argument("--repeat", type=int, default=3, help="Her çağrının ölçülen tekrar sayısı")
+    parser.add_argument("--only", choices=["methods", "endpoints"], help="Yalnızca bir grubu çalıştır")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON sonuç dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regresyon eşiği (0.2 = %%20)")
+    args = parser.parse_args()
+
+    base_dn = "DC=example,DC=com"
+    print(f"Dizin üretiliyor: {args.users} kullanıcı, {args.computers} bilgisayar, {args.groups} grup")
+    load_start = time.perf_counter()
+    entries = generate_directory(args.users, args.computers, args.groups, seed=args.seed, base_dn=base_dn)
+    entries.append((f"CN=BENCH-Membership,OU=Groups,{base_dn}", {
+        "objectClass": ["top", "group"], "objectCategory": "group", "cn": "BENCH-Membership",
+        "sAMAccountName": "BENCH-Membership", "distinguishedName": f"CN=BENCH-Membership,OU=Groups,{base_dn}",
+    }))
+    mock_server = create_mock_server(entries, base_dn=base_dn)
+    load_seconds = time.perf_counter() - load_start
+    targets = pick_targets(entries)
+
+    counter = Counter()
+    results = []
+
+    if args.only in (None, "methods"):
+        ad = CountingADConnection(mock_server, counter, base_dn, args.max_val_range)
+        ad.connect()
+        for name, func in method_cases(ad, targets):
+            result = measure(name, "method", func, counter, args.repeat)
+            results.append(result)
+            print(f"  method   {name:45s} {result['latency_ms']['median']:10.1f} ms  {result['ldap_ops_total']:6d} op"
+                  + (f"  HATA: {result['error']}" if result["error"] else ""))
+
+    if args.only in (None, "endpoints"):
+        import main as app_module
+        from audit_logger import audit_logger
+
+        # Audit kayıtları depodaki dosyayı kirletmesin
+        audit_logger.log_file = os.path.join(tempfile.mkdtemp(prefix="adpulse-bench-"), "audit_logs.json")
+        audit_logger._ensure_log_file()
+        # Uygulamadaki gibi her istek yeni bir bağlantı (ve bind) açar; istek dışı okumalar
+        # (ör. kullanıcı özetindeki grup listesi) da aynı sayaçlı bağlantıyı kullanır
+        app_module.create_ad_connection = lambda: CountingADConnection(mock_server, counter, base_dn, args.max_val_range)
+        app_module.app.dependency_overrides[app_module.get_ad_connection] = app_module.create_ad_connection
+        for name, func in endpoint_cases(app_module.app, targets):
+            result = measure(name, "endpoint", func, counter, args.repeat)
+            results.append(result)
+            print(f"  endpoint {name:45s} {result['latency_ms']['median']:10.1f} ms  {result['ldap_ops_total']:6d} op"
+                  f"  HTTP {result['status_code']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "users": args.users,
+            "computers": args.computers,
+            "groups": args.groups,
+            "seed": args.seed,
+            "max_val_range": args.max_val_range,
+            "repeat": args.repeat,
+            "directory_entries": len(entries),
+            "load_seconds": round(load_seconds, 3),
+            "python": platform.python_version(),
+            "ldap3": ldap3.__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print("Regresyonlar:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Regresyon yok.")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,11 @@ for folder in ["build", "dist"]:
         except Exception as e:
             print(f"Uyarı: {folder} silinemedi, dosya kilitli olabilir: {e}")
 
+# Frontend dosyalarının .gz (brotli kuruluysa .br) sürümlerini üret; exe bunları Accept-Encoding'e göre sunar
+from static_files import precompress
+if os.path.exists("../frontend/dist"):
+    print(f"Sıkıştırılmış frontend dosyası: {precompress('../frontend/dist')}")
+
 # PyInstaller komutu
 # Note: Windows'ta ";" seperatörü kullanılır (UNIX'te ":")
 cmd = [
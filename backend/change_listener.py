@@ -0,0 +1,301 @@
+"""
+AD Değişiklik Bildirimi Dinleyicisi
+Ayrı ve uzun ömürlü bir bağlantı üzerinde AD change notification kontrolü
+(LDAP_SERVER_NOTIFICATION_OID, 1.2.840.113556.1.4.528) ile domain altındaki tüm
+değişiklikleri dinler ve her değişen objeyi olay yoluna (event_bus) yayınlar.
+
+- Bağlantı koparsa artan bekleme süresiyle yeniden bağlanılır.
+- Yeniden bağlanınca kopukluk sırasında kaçan değişiklikler son görülen uSNChanged
+  değerinden itibaren okunur (backfill). USN değerleri DC'ye özeldir; farklı bir DC'ye
+  bağlanıldıysa whenChanged kullanılır.
+- Bağlantı belirli aralıklarla RootDSE sorgusuyla yoklanır; yanıt gelmezse yenilenir.
+"""
+
+import os
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ldap3 import ASYNC_STREAM, BASE, SUBTREE, DEREF_NEVER
+from ldap3.extend.standard.PersistentSearch import PersistentSearch
+
+from ad_connection import ADConnection
+from event_bus import event_bus, EventBus, DIRECTORY_CHANGE
+from metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+LDAP_SERVER_NOTIFICATION_OID = "1.2.840.113556.1.4.528"
+
+CHANGE_NOTIFY_ENABLED = os.getenv("LDAP_CHANGE_NOTIFY", "false").lower() == "true"
+# Bağlantı yoklama aralığı ve yanıt bekleme süresi (saniye)
+KEEPALIVE_INTERVAL = float(os.getenv("LDAP_CHANGE_NOTIFY_KEEPALIVE", 60))
+KEEPALIVE_TIMEOUT = 10
+# Yeniden bağlanma beklemesi: 1, 2, 4 ... en fazla bu kadar saniye
+MAX_BACKOFF = 60
+
+NOTIFICATION_ATTRIBUTES = [
+    'objectClass', 'sAMAccountName', 'cn', 'uSNChanged', 'whenChanged', 'isDeleted',
+    # Şifre bitiş indeksinin artımlı güncellenmesi için
+    'pwdLastSet', 'userAccountControl'
+]
+
+CHANGE_EVENTS = Counter(
+    "adpulse_ldap_change_events_total", "AD'den alınan değişiklik olayları", ("source",)
+)
+LISTENER_CONNECTED = Gauge(
+    "adpulse_ldap_change_listener_connected", "Değişiklik bildirimi bağlantısı açık (1) / kapalı (0)"
+)
+LISTENER_RECONNECTS = Counter(
+    "adpulse_ldap_change_listener_reconnects_total", "Değişiklik bildirimi bağlantısının yeniden kurulması"
+)
+
+
+def _raw_values(entry: Dict, name: str) -> List[str]:
+    """Ham attribute değerlerini str olarak döndür (büyük/küçük harf duyarsız)"""
+    for key, values in entry.get("raw_attributes", {}).items():
+        if key.lower() == name.lower():
+            return [v.decode("utf-8", "replace") if isinstance(v, bytes) else str(v) for v in values]
+    return []
+
+
+def _object_type(classes: List[str]) -> str:
+    classes = [c.lower() for c in classes]
+    if "computer" in classes:
+        return "computer"
+    if "user" in classes:
+        return "user"
+    if "group" in classes:
+        return "group"
+    if "organizationalunit" in classes:
+        return "ou"
+    return "other"
+
+
+def entry_to_event(entry: Dict, source: str, server: Optional[str] = None) -> Dict:
+    """LDAP yanıt kaydını dizin değişikliği olayına çevir"""
+    usn = _raw_values(entry, "uSNChanged")
+    sam = _raw_values(entry, "sAMAccountName")
+    cn = _raw_values(entry, "cn")
+    when_changed = _raw_values(entry, "whenChanged")
+    pwd_last_set = _raw_values(entry, "pwdLastSet")
+    uac = _raw_values(entry, "userAccountControl")
+    return {
+        "type": DIRECTORY_CHANGE,
+        "dn": entry.get("dn", ""),
+        "object_type": _object_type(_raw_values(entry, "objectClass")),
+        "sam_account_name": sam[0] if sam else None,
+        "name": cn[0] if cn else None,
+        "usn": int(usn[0]) if usn else None,
+        "when_changed": when_changed[0] if when_changed else None,
+        "pwd_last_set": pwd_last_set[0] if pwd_last_set else None,
+        "user_account_control": uac[0] if uac else None,
+        "deleted": bool(_raw_values(entry, "isDeleted")) and _raw_values(entry, "isDeleted")[0].upper() == "TRUE",
+        "source": source,
+        "server": server,
+    }
+
+
+class ChangeNotificationListener:
+    """Tek bir arka plan thread'inde değişiklik bildirimlerini dinler"""
+
+    def __init__(self, ad_conn: ADConnection, bus: EventBus = event_bus):
+        self.ad_conn = ad_conn
+        self.bus = bus
+        self.conn = None
+        self.server_address: Optional[str] = None
+        self.connected = False
+        self.last_usn: Optional[int] = None
+        self.last_usn_server: Optional[str] = None
+        self.last_event_at: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.events_received = 0
+        # Bağlantının en son canlı olduğu bilinen zaman (farklı DC'de backfill için)
+        self._last_alive: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- Yaşam döngüsü ----
+
+    def start(self):
+        """Dinleyici thread'ini başlat"""
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ldap-change-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Dinleyiciyi durdur ve bağlantıyı kapat"""
+        self._stop.set()
+        self._close()
+        self._thread = None
+
+    def _close(self):
+        conn, self.conn = self.conn, None
+        self.connected = False
+        LISTENER_CONNECTED.set(0)
+        if conn is not None:
+            try:
+                conn.unbind()
+            except Exception:
+                pass
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            was_connected = False
+            try:
+                # İlk bağlantıda kaçan değişiklik yoktur; sonrakilerde son USN'den okunur
+                self._session(backfill=self.last_usn is not None)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Değişiklik bildirimi bağlantı hatası: {str(e)}")
+            finally:
+                was_connected = self.connected
+                self._close()
+            if was_connected:
+                backoff = 1
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, MAX_BACKOFF)
+            LISTENER_RECONNECTS.inc()
+
+    # ---- Oturum ----
+
+    def _session(self, backfill: bool):
+        """Bağlan, bildirim aramasını başlat, kaçanları oku ve bağlantı kopana kadar bekle"""
+        # Bildirimler arasında uzun sessizlik olabileceğinden soket zaman aşımı kapatılır
+        self.conn = self.ad_conn._open_connection(
+            self.ad_conn.server, client_strategy=ASYNC_STREAM, receive_timeout=None
+        )
+        self.server_address = f"{self.conn.server.host}:{self.conn.server.port}"
+
+        # Önce bildirim başlatılır ki backfill sırasında olan değişiklikler de kaçmasın
+        PersistentSearch(
+            self.conn,
+            search_base=self.ad_conn.base_dn,
+            search_filter="(objectClass=*)",
+            search_scope=SUBTREE,
+            dereference_aliases=DEREF_NEVER,
+            attributes=NOTIFICATION_ATTRIBUTES,
+            size_limit=0,
+            time_limit=0,
+            controls=[(LDAP_SERVER_NOTIFICATION_OID, True, None)],
+            # Netscape persistent search kontrolü eklenmez; AD kendi bildirim kontrolünü kullanır
+            changes_only=None,
+            events_type=None,
+            notifications=None,
+            streaming=False,
+            callback=self._on_notification
+        )
+        self.connected = True
+        self.last_error = None
+        LISTENER_CONNECTED.set(1)
+        logger.info(f"AD değişiklik bildirimleri dinleniyor: {self.ad_conn.base_dn} @ {self.server_address}")
+
+        if backfill:
+            self._backfill()
+        elif self.last_usn is None:
+            self._record_usn(self._highest_committed_usn(), self.server_address)
+        self._last_alive = datetime.now(timezone.utc)
+
+        while not self._stop.wait(KEEPALIVE_INTERVAL):
+            if self.conn is None or self.conn.closed or not self.conn.listening:
+                raise Exception("Bildirim bağlantısı kapandı")
+            if not self._keepalive():
+                raise Exception("Bildirim bağlantısı yanıt vermiyor")
+
+    def _request(self, search_base: str, search_filter: str, scope, attributes, timeout: float = KEEPALIVE_TIMEOUT):
+        """Asenkron bağlantıda normal bir arama yapıp yanıtı bekle"""
+        message_id = self.conn.search(search_base, search_filter, scope, attributes=attributes)
+        response, result = self.conn.get_response(message_id, timeout=timeout)
+        return response, result
+
+    def _keepalive(self) -> bool:
+        try:
+            self._request("", "(objectClass=*)", BASE, ["currentTime"])
+            self._last_alive = datetime.now(timezone.utc)
+            return True
+        except Exception as e:
+            logger.warning(f"Bildirim bağlantısı yoklaması başarısız: {str(e)}")
+            return False
+
+    def _highest_committed_usn(self) -> Optional[int]:
+        response, _ = self._request("", "(objectClass=*)", BASE, ["highestCommittedUSN"])
+        values = _raw_values(response[0], "highestCommittedUSN") if response else []
+        return int(values[0]) if values else None
+
+    def _backfill(self):
+        """Bağlantı kopukken değişen objeleri oku ve yayınla"""
+        if self.last_usn is not None and self.last_usn_server == self.server_address:
+            search_filter = f"(uSNChanged>={self.last_usn + 1})"
+        elif self._last_alive is not None:
+            # Farklı DC: USN karşılaştırılamaz, replikasyon gecikmesi için pay bırakılır
+            since = self._last_alive - timedelta(minutes=5)
+            search_filter = f"(whenChanged>={since.strftime('%Y%m%d%H%M%S.0Z')})"
+        else:
+            self._record_usn(self._highest_committed_usn(), self.server_address)
+            self._publish_resync()
+            return
+        # Yeni DC'nin USN'i, backfill sonrası gelecek bildirimlerin karşılaştırma noktası
+        highest = self._highest_committed_usn()
+        response, result = self._request(self.ad_conn.base_dn, search_filter, SUBTREE, NOTIFICATION_ATTRIBUTES, timeout=120)
+        count = 0
+        for entry in response or []:
+            if entry.get("type") == "searchResEntry":
+                self._publish(entry_to_event(entry, "backfill", self.server_address))
+                count += 1
+        CHANGE_EVENTS.inc(count, source="backfill")
+        if result and result.get("description") == "sizeLimitExceeded":
+            # Kaçan değişikliklerin hepsi okunamadı: abonelerin tüm veriyi yenilemesi gerekir
+            self._publish_resync()
+        self._record_usn(highest, self.server_address)
+        logger.info(f"Bildirim bağlantısı yeniden kuruldu, {count} değişiklik yakalandı ({search_filter})")
+
+    # ---- Olaylar ----
+
+    def _on_notification(self, change: Dict):
+        # ldap3 alıcı thread'inden çağrılır
+        if change.get("type") != "searchResEntry":
+            # searchResDone: sunucu bildirimi sonlandırdı (yetki, limit vb.)
+            self.last_error = change.get("description") or "Bildirim araması sonlandı"
+            logger.warning(f"AD değişiklik bildirimi sonlandı: {self.last_error}")
+            if self.conn is not None:
+                try:
+                    self.conn.unbind()
+                except Exception:
+                    pass
+            return
+        CHANGE_EVENTS.inc(source="notification")
+        self._publish(entry_to_event(change, "notification", self.server_address))
+
+    def _publish(self, event: Dict):
+        with self._lock:
+            self.events_received += 1
+            self.last_event_at = datetime.now().isoformat()
+            if event["usn"] is not None and event["server"] == self.last_usn_server:
+                self.last_usn = max(self.last_usn or 0, event["usn"])
+        self.bus.publish(event)
+
+    def _publish_resync(self):
+        self.bus.publish({"type": DIRECTORY_CHANGE, "resync": True, "source": "backfill", "server": self.server_address})
+
+    def _record_usn(self, usn: Optional[int], server: Optional[str]):
+        with self._lock:
+            if usn is not None:
+                self.last_usn = usn
+                self.last_usn_server = server
+
+    def status(self) -> dict:
+        return {
+            "connected": self.connected,
+            "server": self.server_address,
+            "base_dn": self.ad_conn.base_dn,
+            "last_usn": self.last_usn,
+            "events_received": self.events_received,
+            "last_event_at": self.last_event_at,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,54 @@
+"""
+Olay Yolu (Event Bus)
+Uygulama içi yayınla/abone ol kanalı. Dizin değişiklikleri (AD değişiklik bildirimleri,
+mock dizin yazmaları) buraya yayınlanır; önbellekler ve indeksler abone olarak kendini
+geçersiz kılar. Abone fonksiyonları yayınlayan thread'de, sırayla çağrılır ve kısa sürmelidir.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List
+
+from metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+BUS_EVENTS = Counter(
+    "adpulse_event_bus_events_total", "Olay yoluna yayınlanan olaylar", ("type",)
+)
+
+# Olay türleri
+DIRECTORY_CHANGE = "directory_change"
+
+
+class EventBus:
+    """Thread-safe, senkron yayınla/abone ol"""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Tüm olaylar için abone ol"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        """Aboneliği kaldır"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: Dict):
+        """Olayı tüm abonelere ilet (bir abonenin hatası diğerlerini etkilemez)"""
+        BUS_EVENTS.inc(type=event.get("type", ""))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Olay abonesi hatası: {str(e)}")
+
+
+event_bus = EventBus()
@@ -0,0 +1,146 @@
+"""
+Server-Sent Events Akışı
+Yeni audit kayıtlarını ve dizin değişikliklerini /api/events üzerinden istemcilere iletir.
+
+- Son SSE_BUFFER_SIZE olay numaralı bir halka tamponda tutulur; yeniden bağlanan istemci
+  Last-Event-ID ile kaldığı yerden devam eder. İstenen olay tampondan düşmüşse (veya süreç
+  yeniden başlamışsa) istemciye "resync" gönderilir, istemci listeyi baştan yükler.
+- Her istemcinin kuyruğu sınırlıdır; yetişemeyen istemcinin kuyruğu boşaltılıp "resync"
+  gönderilir, böylece yavaş bir istemci belleği ve diğer istemcileri etkilemez.
+"""
+
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+SSE_BUFFER_SIZE = int(os.getenv("SSE_BUFFER_SIZE", 1000))
+SSE_CLIENT_QUEUE_SIZE = int(os.getenv("SSE_CLIENT_QUEUE_SIZE", 256))
+# Bağlantıyı proxy'lerde açık tutmak ve kopan istemciyi fark etmek için (saniye)
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", 15))
+
+SSE_CLIENTS = Gauge("adpulse_sse_clients", "Bağlı SSE istemcileri")
+SSE_EVENTS = Counter("adpulse_sse_events_total", "SSE akışına eklenen olaylar", ("event",))
+SSE_OVERFLOWS = Counter("adpulse_sse_overflows_total", "Kuyruğu dolduğu için resync gönderilen istemciler")
+
+RESYNC_EVENT = "resync"
+
+# (id, olay adı, JSON veri)
+StreamItem = Tuple[int, str, str]
+
+
+def format_sse(item: StreamItem) -> str:
+    """Olayı text/event-stream biçimine çevir"""
+    event_id, event, data = item
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
+class _Client:
+    def __init__(self, loop: asyncio.AbstractEventLoop, events: Optional[Set[str]]):
+        self.loop = loop
+        self.events = events
+        self.queue: "asyncio.Queue[StreamItem]" = asyncio.Queue(maxsize=SSE_CLIENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, item: StreamItem):
+        # Döngü thread'inde çalışır
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            SSE_OVERFLOWS.inc()
+
+
+class EventStream:
+    """Numaralı halka tampon ve bağlı istemcilerin kuyrukları"""
+
+    def __init__(self, buffer_size: int = SSE_BUFFER_SIZE):
+        self._buffer: Deque[StreamItem] = deque(maxlen=buffer_size)
+        self._clients: List[_Client] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def publish(self, event: str, data: Dict):
+        """Olayı tampona ekle ve bağlı istemcilere ilet (herhangi bir thread'den çağrılabilir)"""
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        with self._lock:
+            item = (self._next_id, event, payload)
+            self._next_id += 1
+            self._buffer.append(item)
+            clients = list(self._clients)
+        SSE_EVENTS.inc(event=event)
+        for client in clients:
+            if client.events is None or event in client.events:
+                try:
+                    client.loop.call_soon_threadsafe(client.offer, item)
+                except RuntimeError:
+                    # Döngü kapanmış (sunucu duruyor)
+                    pass
+
+    def _replay(self, last_event_id: int, events: Optional[Set[str]]) -> Optional[List[StreamItem]]:
+        """last_event_id'den sonraki olaylar; tampon yetmiyorsa None"""
+        if last_event_id > self.last_id:
+            # Süreç yeniden başlamış, numaralar sıfırlanmış
+            return None
+        if last_event_id < self.last_id and (not self._buffer or self._buffer[0][0] > last_event_id + 1):
+            return None
+        return [item for item in self._buffer if item[0] > last_event_id and (events is None or item[1] in events)]
+
+    async def subscribe(self, last_event_id: Optional[int] = None, events: Optional[Iterable[str]] = None):
+        """
+        İstemci için olay akışı (async generator, SSE metni üretir).
+        İlk mesaj tekrar bağlanma süresini bildirir; ardından kaçan olaylar ve canlı olaylar gelir.
+        """
+        event_filter = set(events) if events else None
+        client = _Client(asyncio.get_running_loop(), event_filter)
+        with self._lock:
+            # Tampon okuması ve kayıt aynı kilitte: arada yayınlanan olay kaçmaz veya iki kez gelmez
+            replay = self._replay(last_event_id, event_filter) if last_event_id is not None else []
+            resume_id = self.last_id
+            self._clients.append(client)
+        SSE_CLIENTS.inc()
+        try:
+            yield "retry: 3000\n\n"
+            if replay is None:
+                yield format_sse((resume_id, RESYNC_EVENT, json.dumps({"reason": "buffer"})))
+            else:
+                for item in replay:
+                    yield format_sse(item)
+            while True:
+                if client.overflowed:
+                    # Kuyruktakiler atlanır; istemci listeyi baştan yükler
+                    while not client.queue.empty():
+                        client.queue.get_nowait()
+                    client.overflowed = False
+                    yield format_sse((self.last_id, RESYNC_EVENT, json.dumps({"reason": "overflow"})))
+                    continue
+                try:
+                    item = await asyncio.wait_for(client.queue.get(), SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(item)
+        finally:
+            with self._lock:
+                self._clients.remove(client)
+            SSE_CLIENTS.dec()
+
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+event_stream = EventStream()
@@ -0,0 +1,174 @@
+"""
+Çoklu DC lastLogon Toplama
+lastLogon DC'ler arasında çoğaltılmaz; her DC yalnızca kendisine yapılan oturum açmaları bilir.
+lastLogonTimestamp ise 14 güne kadar geride kalabilir. Bu modül domain'deki tüm DC'lerde
+lastLogon değerini paralel (thread havuzu) okur, obje başına en büyüğünü alır ve sonucu
+sAMAccountName'e göre sıralı, dizi tabanlı kompakt bir tabloda tutar.
+"""
+
+import os
+import time
+import logging
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Aynı anda sorgulanan en fazla DC sayısı
+LASTLOGON_MAX_WORKERS = int(os.getenv("LASTLOGON_MAX_WORKERS", 8))
+# true: DC listesi "Domain Controllers" OU'sundan bulunur; false: yalnızca LDAP_SERVER'daki DC'ler
+LASTLOGON_DISCOVER_DCS = os.getenv("LASTLOGON_DISCOVER_DCS", "true").lower() == "true"
+
+LASTLOGON_DC_SWEEPS = Counter(
+    "adpulse_lastlogon_dc_sweeps_total", "lastLogon taramasında sorgulanan DC'ler", ("result",)
+)
+LASTLOGON_DC_DURATION = Histogram(
+    "adpulse_lastlogon_dc_duration_seconds", "Tek DC'nin lastLogon tarama süresi", ("server",)
+)
+
+FILETIME_EPOCH = datetime(1601, 1, 1)
+# Tüm hesaplar (kullanıcı + bilgisayar); yalnızca bu DC'de oturum açmış olanlar
+LASTLOGON_FILTER = "(&(objectClass=user)(lastLogon>=1))"
+
+OBJECT_USER = 0
+OBJECT_COMPUTER = 1
+
+
+def to_filetime(value) -> int:
+    """lastLogon değerini (ham int/str ya da şemalı datetime) FILETIME int'e çevir"""
+    if value is None or value == "":
+        return 0
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if value.year <= 1601:
+            return 0
+        return int((value - FILETIME_EPOCH).total_seconds() * 10_000_000)
+    return int(str(value))
+
+
+def filetime_to_iso(value: int) -> Optional[str]:
+    if value <= 0:
+        return None
+    return (FILETIME_EPOCH + timedelta(microseconds=value // 10)).isoformat()
+
+
+class LastLogonTable:
+    """
+    Obje başına en güncel lastLogon.
+    sAMAccountName'ler (büyük/küçük harf duyarsız) sıralı bir listede, değerler paralel dizilerde tutulur:
+    FILETIME (int64), obje türü (0 kullanıcı / 1 bilgisayar) ve değerin geldiği DC'nin sırası.
+    """
+
+    def __init__(self, keys: List[str], values: array, kinds: array, sources: array,
+                 servers: List[str], dc_status: List[Dict]):
+        self.keys = keys
+        self.values = values
+        self.kinds = kinds
+        self.sources = sources
+        self.servers = servers
+        self.dc_status = dc_status
+        self.built_at = datetime.now().isoformat()
+
+    @classmethod
+    def build(cls, results: List[Tuple[str, Dict[str, int]]], dc_status: List[Dict]) -> "LastLogonTable":
+        """results: (DC adresi, {sAMAccountName: FILETIME}) listesi"""
+        # küçük harf ad -> (FILETIME, DC sırası, ad)
+        merged: Dict[str, Tuple[int, int, str]] = {}
+        servers = []
+        for server_index, (server, values) in enumerate(results):
+            servers.append(server)
+            for sam, filetime in values.items():
+                key = sam.lower()
+                current = merged.get(key)
+                if current is None or filetime > current[0]:
+                    merged[key] = (filetime, server_index, sam)
+        order = sorted(merged)
+        return cls(
+            [merged[k][2] for k in order],
+            array('q', (merged[k][0] for k in order)),
+            array('b', (OBJECT_COMPUTER if k.endswith('$') else OBJECT_USER for k in order)),
+            array('H', (merged[k][1] for k in order)),
+            servers,
+            dc_status
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _position(self, sam_account_name: str) -> Optional[int]:
+        key = sam_account_name.lower()
+        index = bisect_left(self.keys, key, key=str.lower)
+        if index < len(self.keys) and self.keys[index].lower() == key:
+            return index
+        return None
+
+    def get(self, sam_account_name: str) -> Optional[str]:
+        """Objenin tüm DC'lerdeki en güncel lastLogon'u (ISO, naive UTC)"""
+        index = self._position(sam_account_name)
+        if index is None:
+            # Bilgisayarlar "$" olmadan da aranabilir
+            index = self._position(sam_account_name + '$')
+        return filetime_to_iso(self.values[index]) if index is not None else None
+
+    def older_than(self, days: int, object_type: str = "computer") -> List[Dict]:
+        """lastLogon'u N günden eski objeler (hiç oturum açmamış olanlar tabloda yoktur)"""
+        kind = OBJECT_COMPUTER if object_type == "computer" else OBJECT_USER
+        cutoff = to_filetime(datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days))
+        result = []
+        for index, value in enumerate(self.values):
+            if value <= cutoff and self.kinds[index] == kind:
+                result.append({
+                    "sam_account_name": self.keys[index],
+                    "last_logon": filetime_to_iso(value),
+                    "server": self.servers[self.sources[index]],
+                })
+        result.sort(key=lambda x: x["last_logon"])
+        return result
+
+    def summary(self) -> Dict:
+        return {
+            "objects": len(self.keys),
+            "computers": self.kinds.count(OBJECT_COMPUTER),
+            "users": self.kinds.count(OBJECT_USER),
+            "built_at": self.built_at,
+            "domain_controllers": self.dc_status,
+        }
+
+
+def sweep(servers: List[str], read_dc, max_workers: int = LASTLOGON_MAX_WORKERS) -> LastLogonTable:
+    """
+    Her DC'de read_dc(server) -> {sAMAccountName: FILETIME} çağrısını paralel çalıştır
+    ve sonuçları tek tabloda birleştir. Ulaşılamayan DC'ler atlanır (durumda hata olarak
+    görünür); hiçbir DC okunamazsa hata fırlatılır.
+    """
+    def run(server: str):
+        start = time.perf_counter()
+        try:
+            values = read_dc(server)
+        except Exception as e:
+            LASTLOGON_DC_SWEEPS.inc(result="failure")
+            logger.warning(f"lastLogon okunamadı ({server}): {str(e)}")
+            return server, None, {"server": server, "error": str(e),
+                                  "duration_ms": round((time.perf_counter() - start) * 1000, 1)}
+        duration = time.perf_counter() - start
+        LASTLOGON_DC_DURATION.observe(duration, server=server)
+        LASTLOGON_DC_SWEEPS.inc(result="success")
+        return server, values, {"server": server, "objects": len(values),
+                                "duration_ms": round(duration * 1000, 1)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(servers))),
+                            thread_name_prefix="lastlogon") as executor:
+        outcomes = list(executor.map(run, servers))
+
+    results = [(server, values) for server, values, _ in outcomes if values is not None]
+    if not results:
+        raise Exception("Hiçbir DC'den lastLogon okunamadı: " + "; ".join(
+            f"{status['server']}: {status['error']}" for _, _, status in outcomes
+        ))
+    return LastLogonTable.build(results, [status for _, _, status in outcomes])
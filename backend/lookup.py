@@ -0,0 +1,172 @@
+"""
+Hızlı Arama (Typeahead)
+Kullanıcı, grup ve bilgisayarların adları ve sAMAccountName'leri üzerinde bellekte önek indeksi.
+Her obje için sAMAccountName, görünen ad ve görünen adın sonraki kelimeleri ("smith" -> "John
+Smith") anahtar olarak tutulur; sorgu sıralı anahtar listesinde aralık aramasıdır. İndeks tek
+taramada oluşturulur, dizin değişiklikleri artımlı uygulanır.
+"""
+
+import os
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+OBJECT_TYPES = ("user", "group", "computer")
+# Tek sorguda incelenen en fazla anahtar (tek harflik sorgular tüm indeksi dolaşmasın)
+LOOKUP_SCAN_LIMIT = int(os.getenv("LOOKUP_SCAN_LIMIT", 2000))
+
+# Anahtar türü: 0 sAMAccountName veya görünen adın tamamı, 1 görünen addaki sonraki kelime
+_PRIMARY = 0
+_WORD = 1
+
+
+def _keys(name: str, sam_account_name: str) -> List[Tuple[str, int]]:
+    keys = {(sam_account_name.rstrip('$').casefold(), _PRIMARY), (name.casefold(), _PRIMARY)}
+    for word in name.casefold().split()[1:]:
+        keys.add((word, _WORD))
+    return [k for k in keys if k[0]]
+
+
+def rank(results: List[Dict], query: str) -> List[Dict]:
+    """Tam eşleşme, sonra önek eşleşmesi, sonra ada göre sırala (ANR sonuçları için)"""
+    query = query.casefold()
+
+    def score(item: Dict):
+        names = (item["sam_account_name"].rstrip('$').casefold(), item["name"].casefold())
+        if query in names:
+            return 0, item["name"].casefold()
+        if any(n.startswith(query) for n in names):
+            return 1, item["name"].casefold()
+        return 2, item["name"].casefold()
+    return sorted(results, key=score)
+
+
+class LookupIndex:
+    """Önek indeksi (thread-safe)"""
+
+    def __init__(self):
+        self.built_at = datetime.now().isoformat()
+        # (obje türü, küçük harf sAMAccountName) -> sonuç kaydı
+        self._objects: Dict[Tuple[str, str], Dict] = {}
+        # (anahtar, anahtar türü, obje kimliği) sıralı listesi
+        self._keys: List[Tuple[str, int, Tuple[str, str]]] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, objects: Iterable[Tuple[str, str, str]]) -> "LookupIndex":
+        """objects: (obje türü, görünen ad, sAMAccountName)"""
+        index = cls()
+        keys = []
+        for object_type, name, sam in objects:
+            object_id = (object_type, sam.lower())
+            index._objects[object_id] = {"type": object_type, "name": name or sam, "sam_account_name": sam}
+            keys.extend((key, kind, object_id) for key, kind in _keys(name or sam, sam))
+        keys.sort()
+        index._keys = keys
+        return index
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def _add(self, object_type: str, name: str, sam: str):
+        object_id = (object_type, sam.lower())
+        self._objects[object_id] = {"type": object_type, "name": name, "sam_account_name": sam}
+        for key, kind in _keys(name, sam):
+            insort(self._keys, (key, kind, object_id))
+
+    def _remove(self, object_id: Tuple[str, str]):
+        current = self._objects.pop(object_id, None)
+        if current is None:
+            return
+        for key, kind in _keys(current["name"], current["sam_account_name"]):
+            position = bisect_left(self._keys, (key, kind, object_id))
+            if position < len(self._keys) and self._keys[position] == (key, kind, object_id):
+                del self._keys[position]
+
+    def apply_change(self, event: Dict) -> bool:
+        """
+        Dizin değişikliği olayını uygula. Olaylar cn taşır; kullanıcının indeksteki görünen adı
+        korunur (bir sonraki tam taramada tazelenir).
+        """
+        object_type = event.get("object_type")
+        sam = event.get("sam_account_name")
+        if object_type not in OBJECT_TYPES or not sam:
+            return False
+        object_id = (object_type, sam.lower())
+        with self._lock:
+            current = self._objects.get(object_id)
+            self._remove(object_id)
+            if event.get("deleted"):
+                return current is not None
+            if object_type == "user" and current is not None:
+                name = current["name"]
+            else:
+                name = event.get("name") or sam.rstrip('$')
+            self._add(object_type, name, sam)
+            return True
+
+    def search(self, query: str, types: Iterable[str] = OBJECT_TYPES, limit: int = 10) -> List[Dict]:
+        """query ile başlayan ilk limit obje: tam eşleşme, ad/sAMAccountName öneki, kelime öneki sırasıyla"""
+        query = query.strip().casefold()
+        if not query:
+            return []
+        types = set(types)
+        # obje kimliği -> (puan, ad)
+        candidates: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        with self._lock:
+            position = bisect_left(self._keys, (query,))
+            end = min(len(self._keys), position + LOOKUP_SCAN_LIMIT)
+            while position < end:
+                key, kind, object_id = self._keys[position]
+                if not key.startswith(query):
+                    break
+                position += 1
+                if object_id[0] not in types:
+                    continue
+                score = 0 if key == query else 1 + kind
+                current = candidates.get(object_id)
+                if current is None or score < current[0]:
+                    candidates[object_id] = (score, self._objects[object_id]["name"].casefold())
+            best = sorted(candidates, key=candidates.get)[:limit]
+            return [dict(self._objects[object_id]) for object_id in best]
+
+    def summary(self) -> Dict:
+        with self._lock:
+            counts = {object_type: 0 for object_type in OBJECT_TYPES}
+            for object_type, _ in self._objects:
+                counts[object_type] += 1
+            return {"objects": len(self._objects), "keys": len(self._keys), "built_at": self.built_at, **counts}
+
+
+class QueryTracker:
+    """
+    Aynı arama kutusundan (oturum) gelen sorguların sırası. Yeni sorgu gelince aynı oturumun
+    bekleyen eski sorgusu geçersiz olur; LDAP'a gitmeden veya sonucu döndürmeden bırakılır.
+    """
+
+    def __init__(self, max_sessions: int = 1024):
+        self.max_sessions = max_sessions
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def begin(self, session: Optional[str]) -> int:
+        with self._lock:
+            self._sequence += 1
+            if session:
+                self._latest[session] = self._sequence
+                self._latest.move_to_end(session)
+                while len(self._latest) > self.max_sessions:
+                    self._latest.popitem(last=False)
+            return self._sequence
+
+    def is_current(self, session: Optional[str], token: int) -> bool:
+        if not session:
+            return True
+        with self._lock:
+            return self._latest.get(session, token) == token
+
+
+query_tracker = QueryTracker()
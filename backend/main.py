@@ -1,34 +1,73 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional
 import os
+import asyncio
+import threading
+import uuid
 from dotenv import load_dotenv
-from ad_connection import ADConnection, UserInfo, GroupInfo, GroupMemberInfo, ComputerInfo, UserAttribute
+
+# Öncelikli olarak config.env dosyasını yükle, yoksa .env dosyasını dene
+# (modüller ayarlarını import sırasında okuduğundan diğer importlardan önce)
+if os.path.exists("config.env"):
+    load_dotenv("config.env")
+else:
+    load_dotenv()
+
+from ad_connection import ADConnection, UserInfo, GroupInfo, GroupMemberInfo, ComputerInfo, UserAttribute, sid_resolver
+from mock_directory import MockADConnection
+from metrics import MetricsMiddleware, render_metrics, CONTENT_TYPE_LATEST
+from tracing import LDAPTraceMiddleware, trace_store
+from server_pool import get_dc_pool, derive_gc_setting
+from scheduler import PrecomputeScheduler, PRECOMPUTE_ENABLED
+from event_bus import event_bus, DIRECTORY_CHANGE
+from change_listener import ChangeNotificationListener, CHANGE_NOTIFY_ENABLED
+from event_stream import event_stream
+from static_files import FrontendFiles
+from paging import snapshot_cache
+from lookup import query_tracker
+from object_cache import user_cache
 from audit_logger import (
     audit_logger, 
     log_password_reset, 
     log_account_status_change, 
     log_group_membership_change,
     log_group_management,
+    log_group_membership_sync,
     log_computer_move,
+    log_computer_moves,
     AuditActionType,
     AuditSource
 )
 from datetime import datetime
-
-# Öncelikli olarak config.env dosyasını yükle, yoksa .env dosyasını dene
-if os.path.exists("config.env"):
-    load_dotenv("config.env")
-else:
-    load_dotenv()
+from contextlib import asynccontextmanager
 
 # Mock mode kontrolü
 MOCK_MODE = os.getenv("MOCK_MODE", "false").lower() == "true"
 
-app = FastAPI(title="AD Pulse API", version="1.0.0")
+# Dashboard ve raporların arka planda hesaplanan verileri
+scheduler = PrecomputeScheduler()
+
+# AD değişiklik bildirimleri (RSAT/PowerShell değişiklikleri saniyeler içinde olay yoluna düşer)
+change_listener = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global change_listener
+    await scheduler.start()
+    if CHANGE_NOTIFY_ENABLED and not MOCK_MODE and os.getenv("LDAP_SERVER"):
+        change_listener = ChangeNotificationListener(create_ad_connection())
+        change_listener.start()
+    yield
+    if change_listener:
+        change_listener.stop()
+    await scheduler.stop()
+    # Henüz dosyaya yazılmamış SID çözümlemeleri
+    sid_resolver.flush()
+
+app = FastAPI(title="AD Pulse API", version="1.0.0", lifespan=lifespan)
 
 # CORS ayarları
 app.add_middleware(
@@ -37,20 +76,187 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-LDAP-Trace-Id", "X-LDAP-Trace-Summary"],
 )
 
-# AD bağlantısı bağımlılığı
-def get_ad_connection():
-    if MOCK_MODE:
+# İstek başına LDAP izleme (LDAP_TRACE=true veya "X-LDAP-Trace: 1" başlığı ile)
+app.add_middleware(LDAPTraceMiddleware)
+
+# İstek süresi / sayısı metrikleri (route şablonuna göre)
+app.add_middleware(MetricsMiddleware)
+
+# Mock modda tüm istekler aynı sentetik dizinden (bellekte) servis edilir
+mock_ad_connection = MockADConnection.from_env() if MOCK_MODE else None
+
+# Global Catalog okuma yolu (orman genelinde arama ve DN çözümleme)
+USE_GC = os.getenv("LDAP_USE_GC", "false").lower() == "true"
+_gc_server_setting = None
+
+def get_gc_server_setting() -> Optional[str]:
+    """LDAP_GC_SERVER verilmemişse GC adreslerini LDAP_SERVER'dan türet (bir kez)"""
+    global _gc_server_setting
+    if not USE_GC or MOCK_MODE:
         return None
+    if _gc_server_setting is None:
+        _gc_server_setting = os.getenv("LDAP_GC_SERVER") or derive_gc_setting(os.getenv("LDAP_SERVER"))
+    return _gc_server_setting
+
+def create_ad_connection():
+    """Yapılandırmadaki DC'ye yeni ADConnection (mock modda paylaşılan sentetik dizin)"""
+    if MOCK_MODE:
+        return mock_ad_connection
     return ADConnection(
         server=os.getenv("LDAP_SERVER"),
         domain=os.getenv("LDAP_DOMAIN"),
         username=os.getenv("LDAP_USERNAME"),
         password=os.getenv("LDAP_PASSWORD"),
-        base_dn=os.getenv("LDAP_BASE_DN")
+        base_dn=os.getenv("LDAP_BASE_DN"),
+        gc_server=get_gc_server_setting()
     )
 
+# AD bağlantısı bağımlılığı: istek bitince bağlantı kapatılır
+def get_ad_connection():
+    ad_conn = create_ad_connection()
+    try:
+        yield ad_conn
+    finally:
+        ad_conn.disconnect()
+
+# ==================== ÖN HESAPLAMA ====================
+
+def _run_with_connection(method_name: str):
+    """Zamanlayıcı işi: kendi bağlantısıyla ADConnection metodunu çalıştır"""
+    def job():
+        ad_conn = create_ad_connection()
+        try:
+            return getattr(ad_conn, method_name)()
+        finally:
+            ad_conn.disconnect()
+    return job
+
+if PRECOMPUTE_ENABLED and (MOCK_MODE or os.getenv("LDAP_SERVER")):
+    scheduler.add_job("dashboard_stats", _run_with_connection("get_dashboard_stats"),
+                      float(os.getenv("PRECOMPUTE_DASHBOARD_INTERVAL", 300)))
+    scheduler.add_job("computers", _run_with_connection("get_computers"),
+                      float(os.getenv("PRECOMPUTE_COMPUTERS_INTERVAL", 600)))
+    scheduler.add_job("groups", _run_with_connection("get_groups"),
+                      float(os.getenv("PRECOMPUTE_GROUPS_INTERVAL", 600)))
+    scheduler.add_job("password_expiry", _run_with_connection("build_password_expiry_index"),
+                      float(os.getenv("PRECOMPUTE_PASSWORD_EXPIRY_INTERVAL", 900)))
+    # Değişiklik olayları geliyorsa OU ağacı artımlı güncellenir, yazmalar tam taramayı tetiklemez
+    scheduler.add_job("ou_tree", _run_with_connection("build_ou_tree"),
+                      float(os.getenv("PRECOMPUTE_OU_TREE_INTERVAL", 900)),
+                      refresh_on_change=not (MOCK_MODE or CHANGE_NOTIFY_ENABLED))
+    # Tüm DC'lerde lastLogon taraması; dizin yazmaları lastLogon'u değiştirmediği için tetiklenmez
+    scheduler.add_job("last_logon", _run_with_connection("build_last_logon_table"),
+                      float(os.getenv("LASTLOGON_SWEEP_INTERVAL", 3600)), refresh_on_change=False)
+    # Hızlı arama indeksi; değişiklik olayları geliyorsa artımlı güncellenir
+    scheduler.add_job("lookup_index", _run_with_connection("build_lookup_index"),
+                      float(os.getenv("PRECOMPUTE_LOOKUP_INTERVAL", 900)),
+                      refresh_on_change=not (MOCK_MODE or CHANGE_NOTIFY_ENABLED))
+
+def _refresh_after_write(entry):
+    # Uygulamadan yapılan başarılı değişiklikler hazır verileri hemen yeniler
+    if entry.success and entry.source == AuditSource.WEB_APP:
+        snapshot_cache.clear()
+        user_cache.clear()
+        scheduler.trigger()
+
+audit_logger.add_listener(_refresh_after_write)
+
+def _refresh_after_change(event):
+    # Dizindeki değişiklikler (bildirim/backfill) yalnızca etkilenen hazır verileri yeniler
+    if event.get("type") != DIRECTORY_CHANGE:
+        return
+    # Sayfalama anlık görüntüleri her değişiklikte düşer (bir sonraki sayfa isteği yeniden okur)
+    snapshot_cache.clear()
+    if event.get("resync"):
+        scheduler.trigger()
+        return
+    object_type = event.get("object_type")
+    if object_type in ("user", "computer", "group"):
+        scheduler.trigger("dashboard_stats")
+    if object_type in ("computer", "group"):
+        scheduler.trigger("computers")
+    if object_type == "group":
+        scheduler.trigger("groups")
+
+event_bus.subscribe(_refresh_after_change)
+
+def _invalidate_user_cache(event):
+    # Kullanıcı değişikliği yalnızca o kaydı, grup değişikliği (üyelikler) tüm kayıtları düşürür
+    if event.get("type") != DIRECTORY_CHANGE:
+        return
+    object_type = event.get("object_type")
+    if event.get("resync") or object_type == "group":
+        user_cache.clear()
+    elif object_type == "user" and event.get("sam_account_name"):
+        user_cache.invalidate(event["sam_account_name"].lower())
+
+event_bus.subscribe(_invalidate_user_cache)
+
+def _update_password_expiry(event):
+    # Şifre bitiş indeksi tam tarama yerine değişen kullanıcı üzerinden güncellenir
+    if event.get("type") != DIRECTORY_CHANGE or event.get("object_type") != "user":
+        return
+    job = scheduler.jobs.get("password_expiry")
+    if job is None or job.value is None or not event.get("sam_account_name"):
+        return
+    job.value.apply_change(
+        event["sam_account_name"],
+        event.get("name"),
+        event.get("pwd_last_set"),
+        event.get("user_account_control"),
+        deleted=bool(event.get("deleted"))
+    )
+
+event_bus.subscribe(_update_password_expiry)
+
+def _update_ou_tree(event):
+    # Kullanıcı/bilgisayar taşıma, oluşturma ve silmeleri OU sayılarına uygulanır
+    if event.get("type") != DIRECTORY_CHANGE:
+        return
+    job = scheduler.jobs.get("ou_tree")
+    if job is None or job.value is None:
+        return
+    if event.get("resync") or not job.value.apply_change(event):
+        scheduler.trigger("ou_tree")
+
+event_bus.subscribe(_update_ou_tree)
+
+def _update_lookup_index(event):
+    # Oluşturulan, yeniden adlandırılan ve silinen objeler hızlı arama indeksine uygulanır
+    if event.get("type") != DIRECTORY_CHANGE:
+        return
+    job = scheduler.jobs.get("lookup_index")
+    if job is None or job.value is None:
+        return
+    if event.get("resync"):
+        scheduler.trigger("lookup_index")
+        return
+    job.value.apply_change(event)
+
+event_bus.subscribe(_update_lookup_index)
+
+def _precise_last_logon(sam_account_name: str, single_dc_value: Optional[str]) -> Optional[str]:
+    # Tüm DC'lerden toplanan değer; tablo yoksa veya tek DC'deki değer daha yeniyse o kullanılır
+    job = scheduler.jobs.get("last_logon")
+    if job is None or job.value is None:
+        return single_dc_value
+    aggregated = job.value.get(sam_account_name)
+    return max(filter(None, (aggregated, single_dc_value)), default=None)
+
+# Canlı olay akışı (/api/events): yeni audit kayıtları ve dizin değişiklikleri
+def _stream_audit_entry(entry):
+    event_stream.publish("audit", entry.model_dump(mode="json"))
+
+def _stream_directory_change(event):
+    if event.get("type") == DIRECTORY_CHANGE:
+        event_stream.publish(DIRECTORY_CHANGE, event)
+
+audit_logger.add_listener(_stream_audit_entry)
+event_bus.subscribe(_stream_directory_change)
+
 # Modeller ad_connection.py'den import ediliyor
 
 # Request modelleri
@@ -67,6 +273,12 @@ class GroupMembershipRequest(BaseModel):
 class GroupMemberRequest(BaseModel):
     sam_account_name: str
 
+class GroupMembersSetRequest(BaseModel):
+    # Grubun olması istenen üyeleri (kullanıcı/bilgisayar sAMAccountName); boş liste grubu boşaltır
+    sam_account_names: List[str] = Field(..., max_length=100000)
+    # True: yalnızca farkı hesapla, değişiklik yapma
+    dry_run: bool = False
+
 class ComputerStatusRequest(BaseModel):
     enabled: bool
 
@@ -78,133 +290,30 @@ class GroupCreateRequest(BaseModel):
 class ComputerMoveRequest(BaseModel):
     target_ou_dn: str
 
-# Mock veriler
-MOCK_USERS = [
-    UserInfo(
-        sam_account_name="john.doe",
-        display_name="John Doe",
-        email="john.doe@example.com",
-        groups=["Domain Users", "IT Department"],
-        password_last_set="2024-01-15T10:30:00",
-        password_expires="2024-04-15T10:30:00",
-        account_enabled=True,
-        account_disabled=False,
-        attributes=[]
-    ),
-    UserInfo(
-        sam_account_name="jane.smith",
-        display_name="Jane Smith",
-        email="jane.smith@example.com",
-        groups=["Domain Users", "HR Department"],
-        password_last_set="2024-02-20T14:20:00",
-        password_expires="2024-05-20T14:20:00",
-        account_enabled=True,
-        account_disabled=False,
-        attributes=[]
-    ),
-    UserInfo(
-        sam_account_name="admin.user",
-        display_name="Admin User",
-        email="admin@example.com",
-        groups=["Domain Admins", "IT Department"],
-        password_last_set="2024-03-01T08:00:00",
-        password_expires="2024-06-01T08:00:00",
-        account_enabled=True,
-        account_disabled=False,
-        attributes=[]
-    ),
-]
-
-MOCK_COMPUTERS = [
-    ComputerInfo(
-        sam_account_name="PC-001$",
-        name="PC-001",
-        dns_host_name="pc-001.example.com",
-        operating_system="Windows 11 Enterprise",
-        operating_system_version="10.0 (22621)",
-        operating_system_service_pack=None,
-        last_logon="2024-12-20T09:15:00",
-        last_logon_timestamp="2024-12-20T09:15:00",
-        distinguished_name="CN=PC-001,OU=Computers,DC=example,DC=com",
-        organizational_unit="Computers",
-        groups=["Domain Computers"],
-        account_enabled=True,
-        account_disabled=False,
-        description="IT Department Computer",
-        managed_by=None,
-        attributes=[]
-    ),
-    ComputerInfo(
-        sam_account_name="LAPTOP-002$",
-        name="LAPTOP-002",
-        dns_host_name="laptop-002.example.com",
-        operating_system="Windows 10 Pro",
-        operating_system_version="10.0 (19045)",
-        operating_system_service_pack=None,
-        last_logon="2024-12-19T16:30:00",
-        last_logon_timestamp="2024-12-19T16:30:00",
-        distinguished_name="CN=LAPTOP-002,OU=Laptops,DC=example,DC=com",
-        organizational_unit="Laptops",
-        groups=["Domain Computers"],
-        account_enabled=True,
-        account_disabled=False,
-        description="HR Department Laptop",
-        managed_by=None,
-        attributes=[]
-    ),
-]
-
-MOCK_GROUPS = [
-    GroupInfo(name="Domain Users", distinguished_name="CN=Domain Users,DC=example,DC=com", member_count=150),
-    GroupInfo(name="Domain Admins", distinguished_name="CN=Domain Admins,DC=example,DC=com", member_count=5),
-    GroupInfo(name="IT Department", distinguished_name="CN=IT Department,DC=example,DC=com", member_count=25),
-    GroupInfo(name="HR Department", distinguished_name="CN=HR Department,DC=example,DC=com", member_count=15),
-    GroupInfo(name="Domain Computers", distinguished_name="CN=Domain Computers,DC=example,DC=com", member_count=200),
-]
-
-# Mock mode için fonksiyonlar
-async def get_users_mock(group: Optional[str] = None, search: Optional[str] = None):
-    """Mock: Tüm kullanıcıları listele"""
-    users = MOCK_USERS.copy()
-    if search:
-        search_lower = search.lower()
-        users = [u for u in users if search_lower in u.display_name.lower() or search_lower in u.sam_account_name.lower() or (u.email and search_lower in u.email.lower())]
-    if group:
-        users = [u for u in users if group in u.groups]
-    return users
-
-async def get_user_mock(sam_account_name: str):
-    """Mock: Belirli bir kullanıcıyı getir"""
-    for user in MOCK_USERS:
-        if user.sam_account_name == sam_account_name:
-            return user
-    raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
-
-async def get_computers_mock(search: Optional[str] = None, ou: Optional[str] = None):
-    """Mock: Tüm computer'ları listele"""
-    computers = MOCK_COMPUTERS.copy()
-    if ou:
-        # Mock OU filtreleme: distinguishedName içinde OU kısmına bak (basit bir yaklaşım)
-        computers = [c for c in computers if ou in (c.distinguished_name or '')]
-    if search:
-        search_lower = search.lower()
-        computers = [c for c in computers if search_lower in c.name.lower() or search_lower in c.sam_account_name.lower() or (c.dns_host_name and search_lower in c.dns_host_name.lower())]
-    return computers
-
-async def get_computer_mock(sam_account_name: str):
-    """Mock: Belirli bir computer'ı getir"""
-    for computer in MOCK_COMPUTERS:
-        if computer.sam_account_name == sam_account_name:
-            return computer
-    raise HTTPException(status_code=404, detail="Computer bulunamadı")
-
-async def get_groups_mock():
-    """Mock: Tüm grupları listele"""
-    return MOCK_GROUPS
+class BulkComputerMoveRequest(BaseModel):
+    sam_account_names: List[str] = Field(..., min_length=1, max_length=5000)
+    target_ou_dn: str
+    # Aynı anda çalışan taşıma sayısı (varsayılan BULK_MOVE_MAX_WORKERS)
+    max_workers: Optional[int] = Field(default=None, ge=1, le=32)
+    # İlerleme olaylarını eşleştirmek için istemcinin verdiği kimlik (verilmezse üretilir)
+    operation_id: Optional[str] = Field(default=None, max_length=64)
 
 @app.get("/api/status")
 async def status():
-    return {"message": "AD User Management API", "version": "1.0.0", "mock_mode": MOCK_MODE}
+    result = {"message": "AD User Management API", "version": "1.0.0", "mock_mode": MOCK_MODE}
+    if not MOCK_MODE and os.getenv("LDAP_SERVER"):
+        # DC havuzunun son sağlık kontrolü sonuçları (bağlantı açmaz)
+        result["domain_controllers"] = get_dc_pool(os.getenv("LDAP_SERVER")).status()
+        if change_listener:
+            result["change_notifications"] = change_listener.status()
+        if get_gc_server_setting():
+            result["global_catalogs"] = get_dc_pool(get_gc_server_setting()).status()
+    return result
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus formatında uygulama metrikleri"""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/api/users", response_model=List[UserInfo])
 async def get_users(
@@ -213,8 +322,6 @@ async def get_users(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Tüm kullanıcıları listele veya grup/filtreye göre filtrele"""
-    if MOCK_MODE:
-        return await get_users_mock(group=group, search=search)
     try:
         users = ad_conn.get_users(group_filter=group, search_filter=search)
         return users
@@ -227,25 +334,53 @@ async def get_users_paginated(
     page_size: int = Query(50, ge=1, le=100),
     group: Optional[str] = None,
     search: Optional[str] = None,
+    sort_by: str = Query("sam_account_name", pattern="^(sam_account_name|display_name)$"),
+    start_with: Optional[str] = Query(None, min_length=1, max_length=64),
     ad_conn: ADConnection = Depends(get_ad_connection)
 ):
-    """Sayfalanmış kullanıcı listesi"""
-    if MOCK_MODE:
-        users = await get_users_mock(group, search)
-        total_count = len(users)
-        total_pages = (total_count + page_size - 1) // page_size
-        start_idx = (page - 1) * page_size
-        return {
-            "users": users[start_idx:start_idx + page_size],
-            "page": page,
-            "page_size": page_size,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+    """Sıralı, sayfalanmış kullanıcı listesi (start_with: o önekle başlayan ilk kaydın sayfası)"""
+    try:
+        return ad_conn.get_users_paginated(page, page_size, group, search, sort_by, start_with)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _overview_user(sam_account_name: str, ad_conn: ADConnection) -> Optional[UserInfo]:
+    user = user_cache.get(sam_account_name.lower())
+    if user is None:
+        user = await asyncio.to_thread(ad_conn.get_user, sam_account_name)
+        if user is not None:
+            user_cache.put(sam_account_name.lower(), user)
+    return user
+
+async def _overview_groups() -> List[GroupInfo]:
+    # İstek bağlantısı kullanıcı okumasıyla meşgul; grup listesi kendi bağlantısıyla okunur
+    if "groups" in scheduler.jobs:
+        return await scheduler.get("groups", _run_with_connection("get_groups"))
+    return await asyncio.to_thread(_run_with_connection("get_groups"))
+
+@app.get("/api/users/{sam_account_name}/overview")
+async def get_user_overview(
+    sam_account_name: str,
+    history_limit: int = Query(20, ge=1, le=100),
+    ad_conn: ADConnection = Depends(get_ad_connection)
+):
+    """
+    Kullanıcı detay sayfası için tek istek: kullanıcı kaydı (grupları dahil), eklenebilecek
+    gruplar listesi ve kullanıcının son audit kayıtları eşzamanlı okunur.
+    """
     try:
-        return ad_conn.get_users_paginated(page, page_size, group, search)
+        user, groups, history = await asyncio.gather(
+            _overview_user(sam_account_name, ad_conn),
+            _overview_groups(),
+            asyncio.to_thread(audit_logger.get_target_history, sam_account_name, "user", history_limit)
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
+        # Önbellekteki kayıt değiştirilmez
+        user = user.model_copy(update={"last_logon": _precise_last_logon(user.sam_account_name, user.last_logon)})
+        return {"user": user, "groups": groups, "recent_activity": history}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -255,12 +390,11 @@ async def get_user(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Belirli bir kullanıcının detaylarını getir"""
-    if MOCK_MODE:
-        return await get_user_mock(sam_account_name)
     try:
         user = ad_conn.get_user(sam_account_name)
         if not user:
             raise HTTPException(status_code=404, detail="Kullanıcı bulunamadı")
+        user.last_logon = _precise_last_logon(user.sam_account_name, user.last_logon)
         return user
     except HTTPException:
         raise
@@ -270,11 +404,8 @@ async def get_user(
 @app.get("/api/groups", response_model=List[GroupInfo])
 async def get_groups(ad_conn: Optional[ADConnection] = Depends(get_ad_connection)):
     """Tüm grupları listele"""
-    if MOCK_MODE:
-        return await get_groups_mock()
     try:
-        groups = ad_conn.get_groups()
-        return groups
+        return await scheduler.get("groups", ad_conn.get_groups)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -284,11 +415,6 @@ async def get_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Belirli bir grubun detaylarını getir"""
-    if MOCK_MODE:
-        for group in MOCK_GROUPS:
-            if group.name == group_name:
-                return group
-        raise HTTPException(status_code=404, detail="Grup bulunamadı")
     try:
         group = ad_conn.get_group(group_name)
         if not group:
@@ -305,18 +431,6 @@ async def get_group_members(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Grup üyelerini listele"""
-    if MOCK_MODE:
-        # Mock mode'da grup üyelerini döndür
-        members = []
-        for user in MOCK_USERS:
-            if group_name in user.groups:
-                members.append(GroupMemberInfo(
-                    sam_account_name=user.sam_account_name,
-                    display_name=user.display_name,
-                    email=user.email,
-                    distinguished_name=f"CN={user.sam_account_name},DC=example,DC=com"
-                ))
-        return members
     try:
         members = ad_conn.get_group_members(group_name)
         return members
@@ -333,9 +447,6 @@ async def reset_password(
 ):
     """Kullanıcı şifresini sıfırla"""
     performed_by = "web_app_user"  # TODO: JWT'den alınacak
-    if MOCK_MODE:
-        log_password_reset(performed_by, sam_account_name, success=True)
-        return {"message": f"Mock: {sam_account_name} kullanıcısının şifresi sıfırlandı", "success": True}
     try:
         success = ad_conn.reset_password(
             sam_account_name=sam_account_name,
@@ -363,10 +474,6 @@ async def set_account_status(
 ):
     """Hesap durumunu aktif/pasif yap"""
     performed_by = "web_app_user"  # TODO: JWT'den alınacak
-    if MOCK_MODE:
-        status = "aktif" if request.enabled else "pasif"
-        log_account_status_change(performed_by, sam_account_name, "user", request.enabled, success=True)
-        return {"message": f"Mock: Hesap {status} yapıldı", "success": True, "enabled": request.enabled}
     try:
         success = ad_conn.set_account_status(
             sam_account_name=sam_account_name,
@@ -393,11 +500,6 @@ async def add_user_to_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Kullanıcıyı gruba ekle"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Kullanıcı '{request.group_name}' grubuna eklendi",
-            "success": True
-        }
     try:
         success = ad_conn.add_user_to_group(
             sam_account_name=sam_account_name,
@@ -422,11 +524,6 @@ async def remove_user_from_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Kullanıcıyı gruptan çıkar"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Kullanıcı '{request.group_name}' grubundan çıkarıldı",
-            "success": True
-        }
     try:
         success = ad_conn.remove_user_from_group(
             sam_account_name=sam_account_name,
@@ -451,11 +548,6 @@ async def add_member_to_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Gruba kullanıcı ekle"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Kullanıcı '{request.sam_account_name}' gruba eklendi",
-            "success": True
-        }
     try:
         success = ad_conn.add_user_to_group(
             sam_account_name=request.sam_account_name,
@@ -480,11 +572,6 @@ async def remove_member_from_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Gruptan kullanıcı çıkar"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Kullanıcı '{request.sam_account_name}' gruptan çıkarıldı",
-            "success": True
-        }
     try:
         success = ad_conn.remove_user_from_group(
             sam_account_name=request.sam_account_name,
@@ -502,17 +589,43 @@ async def remove_member_from_group(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.put("/api/groups/{group_name}/members")
+async def set_group_members(
+    group_name: str,
+    request: GroupMembersSetRequest,
+    ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
+):
+    """
+    Grubun üyelerini verilen listeyle eşitle. Fark mevcut üyelere göre hesaplanır ve toplu
+    modify işlemleriyle uygulanır; değişiklik tek audit kaydıyla özetlenir.
+    """
+    username = "admin" # TODO: Auth
+    try:
+        result = await asyncio.to_thread(
+            ad_conn.set_group_members, group_name, request.sam_account_names, request.dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        if not request.dry_run:
+            log_group_membership_sync(username, group_name, success=False, error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+    if not request.dry_run and (result["added"] or result["removed"]):
+        log_group_membership_sync(username, group_name, result)
+    return result
+
 @app.get("/api/computers", response_model=List[ComputerInfo])
 async def get_computers(
     search: Optional[str] = None,
     ou: Optional[str] = None,
+    ou_scope: str = Query("subtree", pattern="^(subtree|one)$"),
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
-    """Tüm computer'ları listele veya filtreye göre filtrele"""
-    if MOCK_MODE:
-        return await get_computers_mock(search=search)
+    """Tüm computer'ları listele veya filtreye göre filtrele (ou: OU DN'i veya yolu)"""
     try:
-        computers = ad_conn.get_computers(search_filter=search, ou_filter=ou)
+        if not search and not ou:
+            return await scheduler.get("computers", ad_conn.get_computers)
+        computers = ad_conn.get_computers(search_filter=search, ou_filter=ou, ou_scope=ou_scope)
         return computers
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -523,25 +636,13 @@ async def get_computers_paginated(
     page_size: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
     ou: Optional[str] = None,
+    ou_scope: str = Query("subtree", pattern="^(subtree|one)$"),
+    start_with: Optional[str] = Query(None, min_length=1, max_length=64),
     ad_conn: ADConnection = Depends(get_ad_connection)
 ):
-    """Sayfalanmış bilgisayar listesi"""
-    if MOCK_MODE:
-        computers = await get_computers_mock(search, ou)
-        total_count = len(computers)
-        total_pages = (total_count + page_size - 1) // page_size
-        start_idx = (page - 1) * page_size
-        return {
-            "computers": computers[start_idx:start_idx + page_size],
-            "page": page,
-            "page_size": page_size,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+    """Ada göre sıralı, sayfalanmış bilgisayar listesi"""
     try:
-        return ad_conn.get_computers_paginated(page, page_size, search, ou)
+        return ad_conn.get_computers_paginated(page, page_size, search, ou, ou_scope, start_with)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -551,12 +652,11 @@ async def get_computer(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Belirli bir computer'ın detaylarını getir"""
-    if MOCK_MODE:
-        return await get_computer_mock(sam_account_name)
     try:
         computer = ad_conn.get_computer(sam_account_name)
         if not computer:
             raise HTTPException(status_code=404, detail="Computer bulunamadı")
+        computer.last_logon = _precise_last_logon(computer.sam_account_name, computer.last_logon)
         return computer
     except HTTPException:
         raise
@@ -570,9 +670,6 @@ async def set_computer_status(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Computer hesap durumunu aktif/pasif yap"""
-    if MOCK_MODE:
-        status = "aktif" if request.enabled else "pasif"
-        return {"message": f"Mock: Computer {status} yapıldı", "success": True, "enabled": request.enabled}
     try:
         success = ad_conn.set_computer_status(
             sam_account_name=sam_account_name,
@@ -595,11 +692,6 @@ async def add_computer_to_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Computer'ı gruba ekle"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Computer '{request.group_name}' grubuna eklendi",
-            "success": True
-        }
     try:
         success = ad_conn.add_computer_to_group(
             sam_account_name=sam_account_name,
@@ -624,11 +716,6 @@ async def remove_computer_from_group(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Computer'ı gruptan çıkar"""
-    if MOCK_MODE:
-        return {
-            "message": f"Mock: Computer '{request.group_name}' grubundan çıkarıldı",
-            "success": True
-        }
     try:
         success = ad_conn.remove_computer_from_group(
             sam_account_name=sam_account_name,
@@ -647,18 +734,67 @@ async def remove_computer_from_group(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/forest/search")
+async def search_forest(
+    q: str = Query(..., min_length=1),
+    type: str = Query("all", pattern="^(all|user|group|computer)$"),
+    limit: int = Query(50, ge=1, le=500),
+    ad_conn: ADConnection = Depends(get_ad_connection)
+):
+    """Orman genelinde kullanıcı/grup/bilgisayar ara (Global Catalog)"""
+    try:
+        return ad_conn.search_forest(q, type, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/lookup")
+async def lookup(
+    q: str = Query(..., min_length=1, max_length=64),
+    types: str = Query("user,group,computer", pattern="^(user|group|computer)(,(user|group|computer))*$"),
+    limit: int = Query(10, ge=1, le=50),
+    session: Optional[str] = Query(None, max_length=64),
+    ad_conn: ADConnection = Depends(get_ad_connection)
+):
+    """
+    Otomatik tamamlama: ada/sAMAccountName'e göre ilk eşleşmeler (yalnızca tür, ad, sAMAccountName).
+    Bellekteki önek indeksinden yanıtlanır; indeks hazır değilse AD ANR araması yapılır.
+    session verilirse aynı oturumdan daha yeni bir sorgu geldiğinde eski sorgu sonuçsuz döner.
+    """
+    type_list = list(dict.fromkeys(types.split(",")))
+    token = query_tracker.begin(session)
+    job = scheduler.jobs.get("lookup_index")
+    if job is not None and job.value is not None:
+        return {"query": q, "results": job.value.search(q, type_list, limit), "source": "index"}
+
+    def run_anr():
+        # Thread havuzunda sırası gelene kadar yeni sorgu geldiyse LDAP'a hiç gidilmez
+        if not query_tracker.is_current(session, token):
+            return None
+        return ad_conn.lookup(q, type_list, limit)
+    
+    try:
+        results = await asyncio.to_thread(run_anr)
+        if results is None or not query_tracker.is_current(session, token):
+            return {"query": q, "results": [], "source": "anr", "superseded": True}
+        return {"query": q, "results": results, "source": "anr"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/ous")
 async def get_ous(ad_conn: ADConnection = Depends(get_ad_connection)):
     """Organizational Unit'leri listele"""
-    if MOCK_MODE:
-        return [
-            {"name": "Computers", "distinguished_name": "CN=Computers,DC=example,DC=com", "path": "CN=Computers,DC=example,DC=com"},
-            {"name": "Laptops", "distinguished_name": "OU=Laptops,DC=example,DC=com", "path": "OU=Laptops,DC=example,DC=com"},
-            {"name": "Servers", "distinguished_name": "OU=Servers,DC=example,DC=com", "path": "OU=Servers,DC=example,DC=com"},
-            {"name": "Users", "distinguished_name": "CN=Users,DC=example,DC=com", "path": "CN=Users,DC=example,DC=com"},
-        ]
     try:
-        return ad_conn.get_organizational_units()
+        tree = await scheduler.get("ou_tree", ad_conn.build_ou_tree)
+        return tree.to_list()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/ous/tree")
+async def get_ou_tree(ad_conn: ADConnection = Depends(get_ad_connection)):
+    """OU hiyerarşisi; her OU için doğrudan ve alt ağaç toplamı kullanıcı/bilgisayar sayıları"""
+    try:
+        tree = await scheduler.get("ou_tree", ad_conn.build_ou_tree)
+        return tree.to_dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -669,9 +805,6 @@ async def create_group(
 ):
     """Yeni grup oluştur"""
     username = "admin" # TODO: Auth
-    if MOCK_MODE:
-        log_group_management(username, request.name, True)
-        return {"message": f"Mock: '{request.name}' grubu oluşturuldu", "success": True}
     try:
         success = ad_conn.create_group(request.name, request.description, request.ou_path)
         if success:
@@ -691,9 +824,6 @@ async def delete_group(
 ):
     """Grubu sil"""
     username = "admin" # TODO: Auth
-    if MOCK_MODE:
-        log_group_management(username, group_name, False)
-        return {"message": f"Mock: '{group_name}' grubu silindi", "success": True}
     try:
         success = ad_conn.delete_group(group_name)
         if success:
@@ -706,6 +836,55 @@ async def delete_group(
         log_group_management(username, group_name, False, success=False, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/computers/bulk-move")
+async def bulk_move_computers(
+    request: BulkComputerMoveRequest,
+    ad_conn: ADConnection = Depends(get_ad_connection)
+):
+    """
+    Birden fazla bilgisayarı aynı OU'ya taşı.
+    Her bilgisayar için sonuç döner; ilerleme /api/events üzerinden "bulk_move" olaylarıyla
+    (operation_id, done, total, item) yayınlanır. Audit kayıtları tek seferde yazılır.
+    """
+    username = "admin" # TODO: Auth
+    operation_id = request.operation_id or uuid.uuid4().hex
+    total = len({name.strip() for name in request.sam_account_names if name.strip()})
+    done = 0
+    done_lock = threading.Lock()
+    
+    def progress(item: dict):
+        nonlocal done
+        with done_lock:
+            done += 1
+            current = done
+        event_stream.publish("bulk_move", {
+            "operation_id": operation_id, "done": current, "total": total, "item": item
+        })
+    
+    options = {"progress": progress}
+    if request.max_workers:
+        options["max_workers"] = request.max_workers
+    try:
+        results = await asyncio.to_thread(
+            ad_conn.move_computers_to_ou, request.sam_account_names, request.target_ou_dn, **options
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    log_computer_moves(username, results, request.target_ou_dn)
+    moved = sum(1 for r in results if r["success"] and not r["skipped"])
+    skipped = sum(1 for r in results if r["skipped"])
+    return {
+        "operation_id": operation_id,
+        "target_ou_dn": request.target_ou_dn,
+        "total": len(results),
+        "moved": moved,
+        "skipped": skipped,
+        "failed": len(results) - moved - skipped,
+        "results": results
+    }
+
 @app.post("/api/computers/{sam_account_name}/move")
 async def move_computer(
     sam_account_name: str,
@@ -714,9 +893,6 @@ async def move_computer(
 ):
     """Bilgisayarı farklı OU'ya taşı"""
     username = "admin" # TODO: Auth
-    if MOCK_MODE:
-        log_computer_move(username, sam_account_name, request.target_ou_dn)
-        return {"message": f"Mock: '{sam_account_name}' bilgisayarı taşındı", "success": True}
     try:
         success = ad_conn.move_computer_to_ou(sam_account_name, request.target_ou_dn)
         if success:
@@ -748,7 +924,8 @@ async def test_connection(request: ConnectionTestRequest):
             domain=request.domain,
             username=request.username,
             password=request.password,
-            base_dn=request.base_dn
+            base_dn=request.base_dn,
+            transient=True
         )
         test_conn.connect()
         # Bağlantı başarılı, bir test sorgusu yapalım
@@ -779,22 +956,8 @@ async def test_connection(request: ConnectionTestRequest):
 @app.get("/api/dashboard/stats")
 async def get_dashboard_stats(ad_conn: Optional[ADConnection] = Depends(get_ad_connection)):
     """Dashboard için istatistikler"""
-    if MOCK_MODE:
-        return {
-            "total_users": 3,
-            "active_users": 3,
-            "disabled_users": 0,
-            "total_computers": 2,
-            "active_computers": 2,
-            "disabled_computers": 0,
-            "total_groups": 5,
-            "users_by_department": {"IT": 2, "HR": 1},
-            "computers_by_os": {"Windows 11 Enterprise": 1, "Windows 10 Pro": 1},
-            "recent_logins": [],
-            "expiring_passwords": []
-        }
     try:
-        stats = ad_conn.get_dashboard_stats()
+        stats = await scheduler.get("dashboard_stats", ad_conn.get_dashboard_stats)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -862,21 +1025,6 @@ async def get_recent_ad_changes(
     RSAT, PowerShell veya diğer araçlardan yapılan değişiklikler dahil.
     whenChanged attribute'unu kullanır.
     """
-    if MOCK_MODE:
-        return {
-            "changes": [
-                {
-                    "object_type": "user",
-                    "sam_account_name": "john.doe",
-                    "display_name": "John Doe",
-                    "when_changed": datetime.now().isoformat(),
-                    "when_created": "2024-01-01T10:00:00",
-                    "change_type": "modified"
-                }
-            ],
-            "total_count": 1,
-            "hours": hours
-        }
     try:
         changes = ad_conn.get_recent_changes(hours=hours, object_type=object_type)
         return {
@@ -887,27 +1035,45 @@ async def get_recent_ad_changes(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/events")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = Query(default=None, description="Virgülle ayrılmış olay türleri (audit, directory_change, bulk_move)"),
+    last_event_id: Optional[int] = Query(default=None, ge=0)
+):
+    """
+    Server-Sent Events: yeni audit kayıtları, dizin değişiklikleri ve toplu işlem ilerlemesi.
+    Yeniden bağlanırken tarayıcının gönderdiği Last-Event-ID ile kaçan olaylar da iletilir.
+    """
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    events = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    return StreamingResponse(
+        event_stream.subscribe(last_event_id, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ==================== REPORTING ====================
 
 @app.get("/api/reports/password-expiry")
 async def get_password_expiry_report(
-    days: int = Query(default=7, ge=1, le=90),
+    days: int = Query(default=7, ge=1, le=365),
+    include_expired: bool = Query(default=False),
+    include_disabled: bool = Query(default=False),
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
-    """Şifre süresi dolacak kullanıcıların raporu"""
-    if MOCK_MODE:
-        return {
-            "users": [],
-            "total_count": 0,
-            "days_threshold": days
-        }
+    """Şifre süresi dolacak kullanıcıların raporu (tüm kullanıcılar, bitiş zamanına göre sıralı)"""
     try:
-        stats = ad_conn.get_dashboard_stats()
-        expiring = [u for u in stats.get("expiring_passwords", []) if u.get("days_left", 99) <= days]
+        index = await scheduler.get("password_expiry", ad_conn.build_password_expiry_index)
+        expiring = index.expiring_within(days, include_expired=include_expired,
+                                         include_disabled=include_disabled)
         return {
             "users": expiring,
             "total_count": len(expiring),
-            "days_threshold": days
+            "days_threshold": days,
+            "summary": index.summary()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -918,34 +1084,9 @@ async def get_inactive_computers_report(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Belirli bir süredir aktif olmayan bilgisayarların raporu"""
-    if MOCK_MODE:
-        return {
-            "computers": [],
-            "total_count": 0,
-            "days_threshold": days
-        }
     try:
-        from datetime import timedelta
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        computers = ad_conn.get_computers()
-        inactive = []
-        
-        for comp in computers:
-            if comp.last_logon_timestamp:
-                try:
-                    last_logon = datetime.fromisoformat(comp.last_logon_timestamp.replace('Z', '+00:00'))
-                    if last_logon < cutoff_date:
-                        inactive.append({
-                            "name": comp.name,
-                            "sam_account_name": comp.sam_account_name,
-                            "last_logon": comp.last_logon_timestamp,
-                            "operating_system": comp.operating_system,
-                            "organizational_unit": comp.organizational_unit
-                        })
-                except:
-                    pass
-        
+        # Eşik LDAP filtresinde uygulanır; yalnızca pasif bilgisayarlar okunur
+        inactive = ad_conn.get_inactive_computers(days)
         return {
             "computers": inactive,
             "total_count": len(inactive),
@@ -954,21 +1095,33 @@ async def get_inactive_computers_report(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/reports/last-logon")
+async def get_last_logon_report(
+    days: int = Query(default=90, ge=1, le=3650),
+    object_type: str = Query(default="computer", pattern="^(user|computer)$"),
+    ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
+):
+    """Tüm DC'lerdeki en güncel lastLogon'u N günden eski kullanıcı/bilgisayarlar"""
+    try:
+        table = await scheduler.get("last_logon", ad_conn.build_last_logon_table)
+        objects = table.older_than(days, object_type)
+        return {
+            "objects": objects,
+            "total_count": len(objects),
+            "days_threshold": days,
+            "object_type": object_type,
+            "summary": table.summary()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/reports/computer-inventory")
 async def get_computer_inventory(
     ad_conn: Optional[ADConnection] = Depends(get_ad_connection)
 ):
     """Bilgisayar envanteri raporu - İşletim sistemine göre gruplandırılmış"""
-    if MOCK_MODE:
-        return {
-            "inventory": {
-                "Windows 11 Enterprise": {"count": 1, "computers": ["PC-001"]},
-                "Windows 10 Pro": {"count": 1, "computers": ["LAPTOP-002"]}
-            },
-            "total_count": 2
-        }
     try:
-        computers = ad_conn.get_computers()
+        computers = await scheduler.get("computers", ad_conn.get_computers)
         inventory = {}
         
         for comp in computers:
@@ -985,6 +1138,37 @@ async def get_computer_inventory(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== DEBUG ====================
+
+@app.get("/api/debug/traces")
+async def get_ldap_traces(limit: int = Query(default=50, ge=1, le=200)):
+    """Son LDAP izlemelerinin özetleri"""
+    return [
+        {
+            "trace_id": trace.trace_id,
+            "method": trace.method,
+            "path": trace.path,
+            "started_at": trace.started_at,
+            "status_code": trace.status_code,
+            "duration_ms": trace.duration_ms,
+            "summary": trace.summary()
+        }
+        for trace in trace_store.recent(limit)
+    ]
+
+@app.get("/api/debug/scheduler")
+async def get_scheduler_status():
+    """Ön hesaplama işlerinin durumu"""
+    return {"enabled": bool(scheduler.jobs), "jobs": scheduler.status()}
+
+@app.get("/api/debug/trace/{trace_id}")
+async def get_ldap_trace(trace_id: str):
+    """Bir isteğin LDAP işlemleri ve tekrarlanan sorgular"""
+    trace = trace_store.get(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="İzleme bulunamadı")
+    return trace.to_dict()
+
 # Statik dosyaların yolu (PyInstaller desteği ile)
 import sys
 
@@ -1001,20 +1185,17 @@ def get_frontend_dir():
 FRONTEND_DIR = get_frontend_dir()
 
 if os.path.exists(FRONTEND_DIR):
-    app.mount("/assets", StaticFiles(directory=os.path.join(FRONTEND_DIR, "assets")), name="assets")
+    # Dosya tablosu bir kez oluşturulur (önbellek başlıkları, .br/.gz sürümleri)
+    frontend_files = FrontendFiles(FRONTEND_DIR)
     
     @app.get("/{full_path:path}")
-    async def serve_frontend(full_path: str):
+    async def serve_frontend(full_path: str, request: Request):
         # API ve Swagger/Redoc rotalarını atla
         if full_path.startswith("api/") or full_path in ["docs", "redoc", "openapi.json"]:
             return None # FastAPI'nin kendi rotasına düşmesine izin ver
         
-        file_path = os.path.join(FRONTEND_DIR, full_path)
-        if os.path.isfile(file_path):
-            return FileResponse(file_path)
-        
-        # SPA için index.html döndür
-        return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+        # Bilinmeyen yollar için (SPA) index.html döner
+        return frontend_files.response(full_path, request)
 else:
     print(f"Uyarı: Frontend klasörü bulunamadı: {FRONTEND_DIR}")
 
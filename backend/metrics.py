@@ -0,0 +1,271 @@
+"""
+Metrik Modülü
+Prometheus text formatında (0.0.4) dışa aktarılan, süreç içi ve düşük maliyetli sayaçlar.
+Harici bağımlılık yoktur; her metrik kendi kilidiyle korunur.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Saniye cinsinden varsayılan histogram sınırları (Prometheus istemcileriyle aynı)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Starlette text/* yanıtlara "; charset=utf-8" ekler
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4"
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    """Label değerini exposition formatına uygun hale getir"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Ortak metrik tabanı"""
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Anlık değer"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Sabit sınırlı histogram (kova sayıları gözlemde kümülatif değil, çıktıda toplanır)"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [kova sayıları..., +Inf], toplam, adet
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """with bloğunun süresini gözlemle"""
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+def render_metrics() -> str:
+    """Kayıtlı tüm metrikleri Prometheus text formatında döndür"""
+    _update_cache_ratios()
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# ==================== METRİKLER ====================
+
+HTTP_REQUESTS = Counter(
+    "adpulse_http_requests_total", "Tamamlanan HTTP istekleri", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "adpulse_http_request_duration_seconds", "HTTP istek süresi (route şablonuna göre)", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "adpulse_http_requests_in_progress", "İşlenmekte olan HTTP istekleri"
+)
+
+LDAP_SEARCH_DURATION = Histogram(
+    "adpulse_ldap_search_duration_seconds", "LDAP arama süresi (ADConnection metoduna göre)", ("method",)
+)
+LDAP_SEARCH_ENTRIES = Counter(
+    "adpulse_ldap_search_entries_total", "LDAP aramalarının döndürdüğü kayıt sayısı", ("method",)
+)
+LDAP_SEARCH_ERRORS = Counter(
+    "adpulse_ldap_search_errors_total", "Hata ile sonuçlanan LDAP aramaları", ("method",)
+)
+LDAP_BINDS = Counter(
+    "adpulse_ldap_binds_total", "LDAP bind denemeleri", ("result",)
+)
+
+AUDIT_WRITE_DURATION = Histogram(
+    "adpulse_audit_write_duration_seconds", "Audit log kaydının dosyaya yazılma süresi"
+)
+
+CACHE_REQUESTS = Counter(
+    "adpulse_cache_requests_total", "Önbellek erişimleri", ("cache", "result")
+)
+CACHE_HIT_RATIO = Gauge(
+    "adpulse_cache_hit_ratio", "Önbellek isabet oranı (süreç başından beri)", ("cache",)
+)
+
+
+def record_cache_access(cache: str, hit: bool):
+    """Önbellek isabet/ıska sayacını artır"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _update_cache_ratios():
+    with CACHE_REQUESTS._lock:
+        totals: Dict[str, List[float]] = {}
+        for (cache, result), value in CACHE_REQUESTS._values.items():
+            hits_misses = totals.setdefault(cache, [0, 0])
+            hits_misses[0 if result == "hit" else 1] += value
+    for cache, (hits, misses) in totals.items():
+        CACHE_HIT_RATIO.set(hits / (hits + misses) if hits + misses else 0.0, cache=cache)
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware: istek süresini route şablonuna göre ölçer.
+    Router eşleşen endpoint'i scope'a yazdığından şablon istek sonunda çözülür;
+    eşleşmeyen istekler tek bir "unmatched" etiketinde toplanır (kardinalite sınırı).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[object, str] = {}
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            router = getattr(scope.get("app"), "router", None)
+            for route in getattr(router, "routes", []):
+                if getattr(route, "endpoint", None) is endpoint or getattr(route, "app", None) is endpoint:
+                    path = route.path
+                    break
+            path = path or "unmatched"
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = self._route_label(scope)
+            method = scope.get("method", "")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status["code"]))
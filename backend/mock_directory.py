@@ -0,0 +1,1366 @@
+"""
+Sentetik Active Directory Modülü
+Seed ile belirlenen (deterministik) ve istenen boyutta gerçekçi bir dizin üretir:
+- OU ağacı (departmanlar, lokasyonlar, cihaz tipleri)
+- Kullanıcılar, bilgisayarlar ve gruplar (Zipf dağılımlı, çarpık grup üyelikleri)
+- Zaman damgaları (FILETIME / generalized time) ve userAccountControl bayrakları
+
+Üretilen kayıtlar ldap3 MOCK_SYNC sunucusuna yüklenerek gerçek ADConnection
+kodu DC olmadan çalıştırılabilir (bkz. benchmark.py) ya da MockADConnection ile
+bellekte tutularak MOCK_MODE'daki tüm endpoint'lere servis edilir.
+"""
+
+import os
+import random
+import re
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ldap3 import Server, Connection, MOCK_SYNC, OFFLINE_AD_2012_R2
+
+from ad_connection import (
+    ADConnection, UserInfo, GroupInfo, GroupMemberInfo, ComputerInfo, UserAttribute, _dn_to_domain, groups_from_member_of
+)
+
+from metrics import LDAP_BINDS
+from event_bus import event_bus, DIRECTORY_CHANGE
+from password_expiry import PasswordExpiryIndex, compute_expiry, parse_max_pwd_age
+from last_logon import LastLogonTable, sweep
+from ou_tree import OUTree, OBJECT_COMPUTER, OBJECT_USER, parent_dn
+from lookup import LookupIndex
+
+logger = logging.getLogger(__name__)
+
+# Mock sunucuda bind için kullanılan servis hesabı
+MOCK_BIND_USER = "svc-adpulse"
+MOCK_BIND_PASSWORD = "MockPassword123!"
+
+# Mock sunucunun tek yanıtta döndürdüğü en fazla değer sayısı (AD MaxValRange, varsayılan 1500)
+MOCK_MAX_VAL_RANGE = int(os.getenv("MOCK_MAX_VAL_RANGE", 1500))
+# İstenen attribute'taki range seçeneği: "member;range=1500-*"
+_RANGE_OPTION = re.compile(r'^(.+);range=(\d+)-(\d+|\*)$', re.IGNORECASE)
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Mustafa", "Ali", "Huseyin", "Hasan", "Ibrahim", "Emre", "Can", "Burak",
+    "Murat", "Kemal", "Serkan", "Onur", "Deniz", "Ayse", "Fatma", "Zeynep", "Elif", "Emine",
+    "Merve", "Esra", "Ozlem", "Seda", "Derya", "Gizem", "Ebru", "Pinar", "Selin", "Ceren",
+    "John", "Jane", "Michael", "Sarah", "David", "Laura", "Peter", "Anna", "Thomas", "Maria",
+]
+
+LAST_NAMES = [
+    "Yilmaz", "Kaya", "Demir", "Sahin", "Celik", "Yildiz", "Yildirim", "Ozturk", "Aydin", "Ozdemir",
+    "Arslan", "Dogan", "Kilic", "Aslan", "Cetin", "Kara", "Koc", "Kurt", "Ozkan", "Simsek",
+    "Polat", "Erdogan", "Gunes", "Aksoy", "Korkmaz", "Tekin", "Bulut", "Keskin", "Unal", "Turan",
+    "Smith", "Johnson", "Brown", "Miller", "Wilson", "Moore", "Taylor", "Clark", "Lewis", "Walker",
+]
+
+DEPARTMENTS = ["IT", "HR", "Finance", "Sales", "Marketing", "Operations", "Legal", "RnD"]
+
+TITLES = ["Uzman", "Kıdemli Uzman", "Mühendis", "Analist", "Yönetici", "Müdür", "Asistan", "Stajyer"]
+
+SITES = ["Istanbul", "Ankara", "Izmir"]
+
+# (işletim sistemi, sürüm, ağırlık, cihaz tipi)
+OPERATING_SYSTEMS = [
+    ("Windows 11 Enterprise", "10.0 (22631)", 40, "Workstations"),
+    ("Windows 11 Pro", "10.0 (22621)", 10, "Laptops"),
+    ("Windows 10 Enterprise", "10.0 (19045)", 25, "Workstations"),
+    ("Windows 10 Pro", "10.0 (19045)", 10, "Laptops"),
+    ("Windows Server 2022 Standard", "10.0 (20348)", 8, "Servers"),
+    ("Windows Server 2019 Standard", "10.0 (17763)", 5, "Servers"),
+    ("Windows Server 2016 Standard", "10.0 (14393)", 2, "Servers"),
+]
+
+# İlk sıradaki gruplar en kalabalık olanlar (Zipf sıralaması)
+WELL_KNOWN_USER_GROUPS = [
+    "All Staff", "VPN Users", "Office365 Users", "Printer Users", "Remote Desktop Users",
+    "Wifi Corporate", "File Share Users", "Domain Admins",
+]
+WELL_KNOWN_COMPUTER_GROUPS = ["All Workstations", "WSUS Pilot", "BitLocker Enabled", "Server Operators Hosts"]
+
+UAC_NORMAL_ACCOUNT = 0x0200
+UAC_ACCOUNTDISABLE = 0x0002
+UAC_DONT_EXPIRE_PASSWD = 0x10000
+UAC_WORKSTATION_TRUST_ACCOUNT = 0x1000
+UAC_SERVER_TRUST_ACCOUNT = 0x2000
+
+GLOBAL_SECURITY_GROUP = -2147483646
+
+
+def datetime_to_filetime(dt: datetime) -> int:
+    """datetime'ı AD FILETIME değerine (1601'den itibaren 100ns) çevir"""
+    return int((dt - datetime(1601, 1, 1)).total_seconds() * 10_000_000)
+
+
+def datetime_to_generalized(dt: datetime) -> str:
+    """datetime'ı AD generalized time formatına çevir"""
+    return dt.strftime("%Y%m%d%H%M%S.0Z")
+
+
+def _zipf_sizes(count: int, total: int, population: int, exponent: float = 1.1) -> List[int]:
+    """Toplam üyelik sayısını Zipf dağılımına göre gruplara paylaştır"""
+    weights = [1.0 / ((i + 1) ** exponent) for i in range(count)]
+    weight_sum = sum(weights)
+    return [max(1, min(population, int(round(total * w / weight_sum)))) for w in weights]
+
+
+def generate_directory(
+    users: int = 500,
+    computers: int = 200,
+    groups: int = 50,
+    seed: int = 42,
+    base_dn: str = "DC=example,DC=com",
+    reference_time: Optional[datetime] = None,
+    avg_groups_per_user: int = 6
+) -> List[Tuple[str, Dict]]:
+    """
+    Sentetik dizin üret.
+    (dn, attributes) listesi döndürür; değerler ldap3 MOCK_SYNC DIT'ine doğrudan yüklenebilir.
+    Aynı seed ve parametreler her zaman aynı yapıyı üretir; zaman damgaları reference_time'a göredir.
+    """
+    rng = random.Random(seed)
+    now = reference_time or datetime.now().replace(microsecond=0)
+    domain = ".".join(p.split("=", 1)[1] for p in base_dn.split(",")).lower()
+    domain_sid = f"S-1-5-21-{rng.randint(10**8, 10**9)}-{rng.randint(10**8, 10**9)}-{rng.randint(10**8, 10**9)}"
+    next_rid = [1100]
+    next_usn = [5000]
+
+    def new_sid() -> str:
+        next_rid[0] += 1
+        return f"{domain_sid}-{next_rid[0]}"
+
+    def stamps(created: datetime, changed: datetime) -> Dict:
+        next_usn[0] += 1
+        return {
+            "whenCreated": datetime_to_generalized(created),
+            "whenChanged": datetime_to_generalized(changed),
+            "uSNCreated": str(next_usn[0]),
+            "uSNChanged": str(next_usn[0]),
+        }
+
+    def random_past(max_days: int, min_days: int = 0) -> datetime:
+        return now - timedelta(seconds=rng.randint(min_days * 86400, max_days * 86400))
+
+    entries: List[Tuple[str, Dict]] = []
+    domain_created = now - timedelta(days=3650)
+
+    # Domain kökü (maxPwdAge: -90 gün, 100ns cinsinden negatif aralık)
+    entries.append((base_dn, {
+        "objectClass": ["top", "domain", "domainDNS"],
+        "distinguishedName": base_dn,
+        "maxPwdAge": -90 * 24 * 3600 * 10_000_000,
+        "objectSid": domain_sid,
+        **stamps(domain_created, domain_created),
+    }))
+
+    def add_container(dn: str, object_class: str, description: Optional[str] = None):
+        attrs = {
+            "objectClass": ["top", object_class],
+            "distinguishedName": dn,
+            **stamps(domain_created, domain_created),
+        }
+        if object_class == "organizationalUnit":
+            attrs["ou"] = dn.split(",", 1)[0].split("=", 1)[1]
+        if description:
+            attrs["description"] = description
+        entries.append((dn, attrs))
+
+    # OU ağacı
+    add_container(f"CN=Users,{base_dn}", "container", "Varsayılan kullanıcı konteyneri")
+    staff_ou = f"OU=Staff,{base_dn}"
+    add_container(staff_ou, "organizationalUnit", "Personel")
+    dept_ous = {}
+    for dept in DEPARTMENTS:
+        dept_ous[dept] = f"OU={dept},{staff_ou}"
+        add_container(dept_ous[dept], "organizationalUnit", f"{dept} departmanı")
+    devices_ou = f"OU=Devices,{base_dn}"
+    add_container(devices_ou, "organizationalUnit", "Cihazlar")
+    device_ous = {}
+    for site in SITES:
+        site_ou = f"OU={site},{devices_ou}"
+        add_container(site_ou, "organizationalUnit", f"{site} lokasyonu")
+        for device_type in ("Workstations", "Laptops", "Servers"):
+            device_ous[(site, device_type)] = f"OU={device_type},{site_ou}"
+            add_container(device_ous[(site, device_type)], "organizationalUnit")
+    groups_ou = f"OU=Groups,{base_dn}"
+    add_container(groups_ou, "organizationalUnit", "Güvenlik grupları")
+
+    # Kullanıcılar
+    user_records = []
+    used_sams = set()
+    used_cns = set()
+    for i in range(users):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        sam = f"{first}.{last}".lower()
+        n = 1
+        while sam in used_sams:
+            n += 1
+            sam = f"{first}.{last}{n}".lower()
+        used_sams.add(sam)
+        display = f"{first} {last}"
+        cn = display
+        n = 1
+        while cn in used_cns:
+            n += 1
+            cn = f"{display} {n}"
+        used_cns.add(cn)
+
+        dept = DEPARTMENTS[min(int(rng.paretovariate(1.5)) - 1, len(DEPARTMENTS) - 1)]
+        dn = f"CN={cn},{dept_ous[dept]}"
+        created = random_past(3000, 30)
+        changed = random_past(min(3000, (now - created).days), 0)
+
+        uac = UAC_NORMAL_ACCOUNT
+        if rng.random() < 0.08:
+            uac |= UAC_ACCOUNTDISABLE
+        if rng.random() < 0.03:
+            uac |= UAC_DONT_EXPIRE_PASSWD
+        # Şifre yaşı: çoğunluk 0-100 gün, bir kısmı "ilk girişte değiştir" (0)
+        pwd_last_set = "0" if rng.random() < 0.02 else str(datetime_to_filetime(random_past(100)))
+        last_logon_dt = random_past(400 if uac & UAC_ACCOUNTDISABLE else 20)
+
+        attrs = {
+            "objectClass": ["top", "person", "organizationalPerson", "user"],
+            # MOCK_SYNC objectCategory kısaltmasını çözmediği için kısa ad saklanır
+            "objectCategory": "person",
+            "distinguishedName": dn,
+            "cn": cn,
+            "sAMAccountName": sam,
+            "userPrincipalName": f"{sam}@{domain}",
+            "displayName": display,
+            "givenName": first,
+            "sn": last,
+            "mail": f"{sam}@{domain}",
+            "department": dept,
+            "title": rng.choice(TITLES),
+            "userAccountControl": str(uac),
+            "pwdLastSet": pwd_last_set,
+            "lastLogon": str(datetime_to_filetime(last_logon_dt)),
+            "lastLogonTimestamp": str(datetime_to_filetime(last_logon_dt - timedelta(days=rng.randint(0, 14)))),
+            "objectSid": new_sid(),
+            "memberOf": [],
+            **stamps(created, changed),
+        }
+        entries.append((dn, attrs))
+        user_records.append(attrs)
+
+    # Bilgisayarlar
+    computer_records = []
+    os_weights = [o[2] for o in OPERATING_SYSTEMS]
+    for i in range(computers):
+        os_name, os_version, _, device_type = rng.choices(OPERATING_SYSTEMS, weights=os_weights)[0]
+        site = rng.choice(SITES)
+        prefix = {"Workstations": "PC", "Laptops": "LAPTOP", "Servers": "SRV"}[device_type]
+        name = f"{site[:3].upper()}-{prefix}-{i + 1:05d}"
+        dn = f"CN={name},{device_ous[(site, device_type)]}"
+        created = random_past(2500, 10)
+        changed = random_past(min(2500, (now - created).days), 0)
+
+        uac = UAC_SERVER_TRUST_ACCOUNT if device_type == "Servers" and rng.random() < 0.05 else UAC_WORKSTATION_TRUST_ACCOUNT
+        if rng.random() < 0.05:
+            uac |= UAC_ACCOUNTDISABLE
+
+        attrs = {
+            "objectClass": ["top", "person", "organizationalPerson", "user", "computer"],
+            "objectCategory": "computer",
+            "distinguishedName": dn,
+            "cn": name,
+            "sAMAccountName": f"{name}$",
+            "dNSHostName": f"{name.lower()}.{domain}",
+            "operatingSystem": os_name,
+            "operatingSystemVersion": os_version,
+            "userAccountControl": str(uac),
+            "description": f"{site} {device_type[:-1]}",
+            "location": site,
+            "objectSid": new_sid(),
+            "memberOf": [],
+            **stamps(created, changed),
+        }
+        # ~%7 hiç bağlanmamış veya 90 günden uzun süredir pasif
+        roll = rng.random()
+        if roll < 0.01:
+            pass  # hiç oturum açmamış
+        else:
+            last_logon_dt = random_past(400, 91) if roll < 0.07 else random_past(14)
+            attrs["lastLogon"] = str(datetime_to_filetime(last_logon_dt))
+            attrs["lastLogonTimestamp"] = str(datetime_to_filetime(last_logon_dt - timedelta(days=rng.randint(0, 14))))
+        entries.append((dn, attrs))
+        computer_records.append(attrs)
+
+    # Gruplar
+    group_names = []
+    for name in WELL_KNOWN_USER_GROUPS + [f"{d} Department" for d in DEPARTMENTS]:
+        if len(group_names) < groups:
+            group_names.append(name)
+    computer_group_names = [n for n in WELL_KNOWN_COMPUTER_GROUPS][:max(0, groups - len(group_names))]
+    group_names.extend(computer_group_names)
+    i = 0
+    while len(group_names) < groups:
+        i += 1
+        group_names.append(f"SG-Project-{i:04d}")
+
+    user_group_names = [n for n in group_names if n not in computer_group_names]
+    user_sizes = _zipf_sizes(len(user_group_names), users * avg_groups_per_user, users) if users else []
+    computer_sizes = _zipf_sizes(len(computer_group_names), computers * 2, computers) if computers else []
+
+    group_records = {}
+    for name in group_names:
+        dn = f"CN={name},{groups_ou}"
+        created = random_past(3000, 30)
+        attrs = {
+            "objectClass": ["top", "group"],
+            "objectCategory": "group",
+            "distinguishedName": dn,
+            "cn": name,
+            "sAMAccountName": name,
+            "groupType": str(GLOBAL_SECURITY_GROUP),
+            "description": f"{name} grubu",
+            "member": [],
+            "memberOf": [],
+            "objectSid": new_sid(),
+            **stamps(created, random_past(min(3000, (now - created).days), 0)),
+        }
+        group_records[name] = attrs
+        entries.append((dn, attrs))
+
+    def add_member(group: Dict, member: Dict):
+        group["member"].append(member["distinguishedName"])
+        member["memberOf"].append(group["distinguishedName"])
+
+    for name, size in zip(user_group_names, user_sizes):
+        for idx in rng.sample(range(users), size):
+            add_member(group_records[name], user_records[idx])
+    for name, size in zip(computer_group_names, computer_sizes):
+        for idx in rng.sample(range(computers), size):
+            add_member(group_records[name], computer_records[idx])
+
+    # İç içe gruplar: departman grupları "All Staff" altında, projelerin bir kısmı departmanlarda
+    if "All Staff" in group_records:
+        for dept in DEPARTMENTS:
+            dept_group = group_records.get(f"{dept} Department")
+            if dept_group:
+                add_member(group_records["All Staff"], dept_group)
+    project_groups = [n for n in group_names if n.startswith("SG-Project-")]
+    dept_groups = [group_records[f"{d} Department"] for d in DEPARTMENTS if f"{d} Department" in group_records]
+    for name in project_groups:
+        if dept_groups and rng.random() < 0.05:
+            add_member(rng.choice(dept_groups), group_records[name])
+
+    return entries
+
+
+def mock_bind_dn(base_dn: str) -> str:
+    """Mock sunucudaki servis hesabının DN'i"""
+    return f"CN={MOCK_BIND_USER},CN=Users,{base_dn}"
+
+
+def create_mock_server(entries: List[Tuple[str, Dict]], base_dn: str = "DC=example,DC=com") -> Server:
+    """Üretilen kayıtları ldap3 MOCK_SYNC sunucusunun DIT'ine yükle"""
+    server = Server("mock-dc", get_info=OFFLINE_AD_2012_R2)
+    loader = Connection(server, client_strategy=MOCK_SYNC)
+    bind_dn = mock_bind_dn(base_dn)
+    loader.strategy.add_entry(bind_dn, {
+        "objectClass": ["top", "person", "organizationalPerson", "user"],
+        "objectCategory": "person",
+        "distinguishedName": bind_dn,
+        "sAMAccountName": MOCK_BIND_USER,
+        "userPassword": MOCK_BIND_PASSWORD,
+        "userAccountControl": str(UAC_NORMAL_ACCOUNT | UAC_DONT_EXPIRE_PASSWD),
+    })
+    for dn, attrs in entries:
+        attrs = {k: v for k, v in attrs.items() if v != []}
+        loader.strategy.add_entry(dn, attrs)
+    return server
+
+
+class MockSyncADConnection(ADConnection):
+    """Gerçek ADConnection kodunu ldap3 MOCK_SYNC sunucusu üzerinde çalıştırır"""
+
+    def __init__(self, mock_server: Server, base_dn: str = "DC=example,DC=com",
+                 max_val_range: int = MOCK_MAX_VAL_RANGE):
+        super().__init__(
+            server=mock_server.host,
+            domain=".".join(p.split("=", 1)[1] for p in base_dn.split(",")).lower(),
+            username=mock_bind_dn(base_dn),
+            password=MOCK_BIND_PASSWORD,
+            base_dn=base_dn
+        )
+        self.mock_server = mock_server
+        self.max_val_range = max_val_range
+
+    def _open_connection(self, server_setting: str, **connection_options) -> Connection:
+        """Mock sunucuya yeni bağlantı (adres yok sayılır, DIT paylaşılır)"""
+        conn = Connection(
+            self.mock_server,
+            user=self.username,
+            password=self.password,
+            client_strategy=MOCK_SYNC
+        )
+        # MOCK_SYNC auto_bind parametresini dikkate almaz
+        if not conn.bind():
+            raise Exception(f"Mock bind başarısız: {conn.result.get('description')}")
+        _emulate_value_ranges(conn, self.max_val_range)
+        return conn
+
+    def _worker_key(self, conn: Connection):
+        """Ayrı mock sunucular aynı adı taşır; havuz sunucu nesnesine göre ayrılır"""
+        return super()._worker_key(conn) + (id(self.mock_server),)
+
+    def connect(self):
+        """Mock sunucuya bağlan"""
+        try:
+            self.conn = self._open_connection(self.server)
+        except Exception:
+            LDAP_BINDS.inc(result="failure")
+            raise
+        LDAP_BINDS.inc(result="success")
+        return True
+
+
+def _emulate_value_ranges(conn: Connection, max_values: int):
+    """
+    MOCK_SYNC range seçeneğini (member;range=N-*) desteklemez; AD gibi davranması için aramalar sarılır.
+    auto_range kapalıyken max_values'tan fazla değerli attribute'lar "attr;range=0-(max-1)" olarak
+    parça parça döner, "attr;range=N-*" istekleri N'den başlayan parçayı döndürür. auto_range açıkken
+    ldap3'ün parçaları birleştirdiği gibi tüm değerler tek seferde döner.
+    """
+    search = conn.search
+
+    def ranged_search(*args, attributes=None, **kwargs):
+        if isinstance(attributes, str):
+            attributes = [attributes]
+        requested: Dict[str, int] = {}
+        plain = []
+        for attribute in attributes or []:
+            match = _RANGE_OPTION.match(attribute)
+            if match:
+                requested[match.group(1).lower()] = int(match.group(2))
+                attribute = match.group(1)
+            plain.append(attribute)
+        result = search(*args, attributes=plain if attributes is not None else None, **kwargs)
+        if conn.auto_range and not requested:
+            return result
+        for response in conn.response or []:
+            if response.get('type') != 'searchResEntry':
+                continue
+            for key in list(response['attributes']):
+                values = response['attributes'][key]
+                if not isinstance(values, list):
+                    continue
+                start = requested.get(key.lower())
+                if start is None:
+                    if conn.auto_range or len(values) <= max_values:
+                        continue
+                    start = 0
+                end = start + max_values - 1
+                ranged_key = f"{key};range={start}-{'*' if end >= len(values) - 1 else end}"
+                for section in ('attributes', 'raw_attributes'):
+                    if key in response.get(section, {}):
+                        response[section][ranged_key] = response[section].pop(key)[start:end + 1]
+        # Kayıtlar yanıttan yeniden oluşturulsun
+        conn._entries = []
+        return result
+
+    conn.search = ranged_search
+
+
+def _utc_now() -> datetime:
+    """Sentetik dizinin zaman tabanı (naive UTC, saniye hassasiyetinde)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _format_generalized(value: Optional[str]) -> Optional[str]:
+    """Generalized time değerini ldap3'ün şemalı çıktısıyla aynı biçimde döndür"""
+    if not value:
+        return None
+    # YYYYMMDDHHmmss.0Z -> "YYYY-MM-DD HH:mm:ss+00:00" (strptime binlerce kayıtta yavaş kalıyor)
+    if len(value) < 14 or not value[:14].isdigit():
+        return value
+    return f"{value[0:4]}-{value[4:6]}-{value[6:8]} {value[8:10]}:{value[10:12]}:{value[12:14]}+00:00"
+
+
+def _first(record: Dict, attr: str, default=None):
+    """Kayıttaki attribute'un ilk değerini döndür"""
+    value = record.get(attr)
+    if isinstance(value, list):
+        return value[0] if value else default
+    return value if value not in (None, "") else default
+
+
+class MockADConnection(ADConnection):
+    """
+    Sentetik dizini bellekte tutan ADConnection.
+    Okumalar indekslerden, yazmalar (şifre, hesap durumu, üyelik, grup, taşıma)
+    kayıtların kendisini değiştirerek yapılır; whenChanged/uSNChanged güncellendiği
+    için dashboard, raporlar ve son değişiklikler yazmaları hemen yansıtır.
+    Tek bir örnek tüm istekler arasında paylaşılır, erişim kilitle korunur.
+    """
+
+    def __init__(self, entries: List[Tuple[str, Dict]], base_dn: str = "DC=example,DC=com"):
+        super().__init__(
+            server="mock",
+            domain=".".join(p.split("=", 1)[1] for p in base_dn.split(",")).lower(),
+            username=MOCK_BIND_USER,
+            password=MOCK_BIND_PASSWORD,
+            base_dn=base_dn
+        )
+        self._lock = threading.RLock()
+        self._by_dn: Dict[str, Dict] = {}
+        self._users: Dict[str, Dict] = {}
+        self._computers: Dict[str, Dict] = {}
+        self._groups: Dict[str, Dict] = {}
+        self._usn = 0
+        for dn, attrs in entries:
+            self._index(attrs)
+            self._usn = max(self._usn, int(attrs.get("uSNChanged", 0)))
+
+    def _vlv_window(self, *args, **kwargs):
+        """Bellekteki dizinde VLV yok; sayfalı listeler sıralı anlık görüntüden verilir"""
+        return None
+
+    @classmethod
+    def from_env(cls) -> "MockADConnection":
+        """MOCK_* ortam değişkenlerine göre sentetik dizin üret"""
+        base_dn = os.getenv("MOCK_BASE_DN", "DC=example,DC=com")
+        users = int(os.getenv("MOCK_USER_COUNT", 500))
+        computers = int(os.getenv("MOCK_COMPUTER_COUNT", 200))
+        groups = int(os.getenv("MOCK_GROUP_COUNT", 50))
+        seed = int(os.getenv("MOCK_SEED", 42))
+        entries = generate_directory(
+            users=users,
+            computers=computers,
+            groups=groups,
+            seed=seed,
+            base_dn=base_dn,
+            reference_time=_utc_now()
+        )
+        logger.info(f"Sentetik dizin oluşturuldu: {users} kullanıcı, {computers} bilgisayar, {groups} grup (seed={seed})")
+        return cls(entries, base_dn=base_dn)
+
+    # ---- Bağlantı (bellekte olduğu için no-op) ----
+
+    def connect(self):
+        """Sentetik dizine bağlan"""
+        return True
+
+    def disconnect(self):
+        """Sentetik dizinde kapatılacak bağlantı yok"""
+        pass
+
+    def _ensure_connection(self):
+        """Sentetik dizin her zaman erişilebilir"""
+        pass
+
+    # ---- İndeksler ----
+
+    def _index(self, record: Dict):
+        """Kaydı DN ve tür indekslerine ekle"""
+        self._by_dn[record["distinguishedName"].lower()] = record
+        classes = record.get("objectClass", [])
+        if "computer" in classes:
+            self._computers[record["sAMAccountName"].lower()] = record
+        elif "user" in classes:
+            self._users[record["sAMAccountName"].lower()] = record
+        elif "group" in classes:
+            self._groups[record["cn"].lower()] = record
+
+    def _unindex(self, record: Dict):
+        """Kaydı tüm indekslerden çıkar"""
+        self._by_dn.pop(record["distinguishedName"].lower(), None)
+        classes = record.get("objectClass", [])
+        if "computer" in classes:
+            self._computers.pop(record["sAMAccountName"].lower(), None)
+        elif "user" in classes:
+            self._users.pop(record["sAMAccountName"].lower(), None)
+        elif "group" in classes:
+            self._groups.pop(record["cn"].lower(), None)
+
+    def _touch(self, record: Dict):
+        """Değişen kaydın whenChanged ve uSNChanged değerlerini güncelle"""
+        self._usn += 1
+        record["whenChanged"] = datetime_to_generalized(_utc_now())
+        record["uSNChanged"] = str(self._usn)
+        self._notify(record)
+
+    def _notify(self, record: Dict, deleted: bool = False):
+        """AD değişiklik bildirimi karşılığı: değişen objeyi olay yoluna yayınla"""
+        classes = record.get("objectClass", [])
+        if "computer" in classes:
+            object_type = "computer"
+        elif "user" in classes:
+            object_type = "user"
+        elif "group" in classes:
+            object_type = "group"
+        elif "organizationalUnit" in classes:
+            object_type = "ou"
+        else:
+            object_type = "other"
+        event_bus.publish({
+            "type": DIRECTORY_CHANGE,
+            "dn": record["distinguishedName"],
+            "object_type": object_type,
+            "sam_account_name": record.get("sAMAccountName"),
+            "name": record.get("cn"),
+            "usn": int(record.get("uSNChanged", 0)),
+            "when_changed": record.get("whenChanged"),
+            "pwd_last_set": record.get("pwdLastSet"),
+            "user_account_control": record.get("userAccountControl"),
+            "deleted": deleted,
+            "source": "mock",
+            "server": "mock"
+        })
+
+    def _find_account(self, sam_account_name: str) -> Optional[Dict]:
+        """(objectClass=user)(sAMAccountName=...) karşılığı: kullanıcı veya bilgisayar"""
+        key = sam_account_name.lower()
+        if "@" in key:
+            # UPN ile çözümleme (sentetik dizinde UPN = sam@domain)
+            sam, _, domain = key.partition("@")
+            return self._users.get(sam) if domain == self.domain else None
+        return self._users.get(key) or self._computers.get(key)
+
+    def _find_computer(self, sam_account_name: str) -> Optional[Dict]:
+        """Bilgisayarı $ ekli veya eksiz adıyla bul"""
+        key = sam_account_name.lower()
+        return self._computers.get(key if key.endswith("$") else key + "$") or self._computers.get(key)
+
+    def _find_group(self, group_name: str) -> Optional[Dict]:
+        """Grubu cn ile bul"""
+        return self._groups.get(group_name.lower())
+
+    def _get_group_dn(self, group_name: str) -> Optional[str]:
+        """Grup adından DN'yi getir"""
+        with self._lock:
+            group = self._find_group(group_name)
+            return group["distinguishedName"] if group else None
+
+    def _get_user_dn(self, sam_account_name: str) -> Optional[str]:
+        """Kullanıcı adından DN'yi getir"""
+        with self._lock:
+            record = self._find_account(sam_account_name)
+            return record["distinguishedName"] if record else None
+
+    def _get_computer_dn(self, sam_account_name: str) -> Optional[str]:
+        """Bilgisayar adından DN'yi getir"""
+        with self._lock:
+            record = self._find_computer(sam_account_name)
+            return record["distinguishedName"] if record else None
+
+    def _get_user_groups(self, user_dn: str, member_of: Optional[List] = None) -> List[str]:
+        """Kullanıcının etkin grupları (tokenGroups gibi iç içe üyelikler dahil)"""
+        with self._lock:
+            record = self._by_dn.get(user_dn.lower())
+            if not record:
+                return []
+            seen = set()
+            pending = list(record.get("memberOf", []))
+            while pending:
+                dn = pending.pop().lower()
+                group = self._by_dn.get(dn)
+                if dn in seen or group is None:
+                    continue
+                seen.add(dn)
+                pending.extend(group.get("memberOf", []))
+            return sorted((self._by_dn[dn]["cn"] for dn in seen), key=str.lower)
+
+    # ---- Şifre bitişi ----
+
+    def _get_max_pwd_age(self, refresh: bool = False) -> Optional[timedelta]:
+        """Domain kökündeki maxPwdAge"""
+        root = self._by_dn.get(self.base_dn.lower())
+        return parse_max_pwd_age(_first(root, "maxPwdAge")) if root else None
+
+    def _password_expiry(self, record: Dict) -> Optional[datetime]:
+        """Kaydın şifre bitiş zamanı (sentetik dizinde fine-grained politika yok)"""
+        expires, _ = compute_expiry(
+            record.get("pwdLastSet"), record.get("userAccountControl"), self._get_max_pwd_age()
+        )
+        return expires
+
+    def build_password_expiry_index(self) -> PasswordExpiryIndex:
+        """Tüm kullanıcılardan şifre bitiş indeksini oluştur"""
+        with self._lock:
+            records = [
+                {
+                    "sam_account_name": record["sAMAccountName"],
+                    "display_name": record.get("displayName"),
+                    "pwd_last_set": record.get("pwdLastSet"),
+                    "user_account_control": record.get("userAccountControl"),
+                }
+                for record in self._users.values()
+            ]
+        return PasswordExpiryIndex.build(records, self._get_max_pwd_age())
+
+    # ---- lastLogon ----
+
+    def _read_last_logon(self, server: str) -> Dict[str, int]:
+        """Sentetik dizin tek bir DC gibi davranır"""
+        with self._lock:
+            return {
+                record["sAMAccountName"]: int(record["lastLogon"])
+                for records in (self._users, self._computers)
+                for record in records.values()
+                if int(record.get("lastLogon") or 0) > 0
+            }
+
+    def build_last_logon_table(self) -> LastLogonTable:
+        """lastLogon tablosunu gerçek bağlantıyla aynı tarama yoluyla oluştur"""
+        return sweep(["mock"], self._read_last_logon)
+
+    # ---- Kayıt -> model dönüşümleri (ADConnection çıktısıyla aynı alanlar) ----
+
+    def _user_info(self, record: Dict, all_attributes: bool = False) -> UserInfo:
+        """Kullanıcı kaydını UserInfo'ya çevir"""
+        sam_account = record.get("sAMAccountName", "")
+        pwd_last_set = self._convert_ad_timestamp(record.get("pwdLastSet"))
+        expires_dt = self._password_expiry(record)
+        password_expires = expires_dt.isoformat() if expires_dt else None
+
+        uac = int(record.get("userAccountControl", UAC_NORMAL_ACCOUNT))
+        if all_attributes:
+            attr_names = [name for name, value in record.items() if value not in (None, "", [])]
+        else:
+            attr_names = ["sAMAccountName", "displayName", "mail", "distinguishedName", "whenCreated", "whenChanged"]
+        attributes = []
+        for attr_name in attr_names:
+            value = _first(record, attr_name)
+            if value is None:
+                continue
+            if attr_name in ("whenCreated", "whenChanged"):
+                value = _format_generalized(value)
+            attributes.append(UserAttribute(name=attr_name, value=str(value)))
+
+        return UserInfo(
+            sam_account_name=sam_account,
+            display_name=record.get("displayName") or sam_account,
+            email=record.get("mail"),
+            # Liste doğrudan üyelikleri (memberOf), detay etkin grupları gösterir
+            groups=(self._get_user_groups(record["distinguishedName"]) if all_attributes
+                    else groups_from_member_of(record.get("memberOf"))),
+            password_last_set=pwd_last_set,
+            password_expires=password_expires,
+            account_enabled=not bool(uac & UAC_ACCOUNTDISABLE),
+            account_disabled=bool(uac & UAC_ACCOUNTDISABLE),
+            attributes=attributes
+        )
+
+    def _computer_info(self, record: Dict) -> ComputerInfo:
+        """Bilgisayar kaydını ComputerInfo'ya çevir"""
+        sam_account = record.get("sAMAccountName", "")
+        dn = record["distinguishedName"]
+        uac = int(record.get("userAccountControl", UAC_WORKSTATION_TRUST_ACCOUNT))
+        return ComputerInfo(
+            sam_account_name=sam_account,
+            name=record.get("cn") or sam_account.rstrip('$'),
+            dns_host_name=record.get("dNSHostName"),
+            operating_system=record.get("operatingSystem"),
+            operating_system_version=record.get("operatingSystemVersion"),
+            operating_system_service_pack=record.get("operatingSystemServicePack"),
+            last_logon=self._convert_ad_timestamp(record.get("lastLogon")),
+            last_logon_timestamp=self._convert_ad_timestamp(record.get("lastLogonTimestamp")),
+            last_logged_on_user=None,
+            distinguished_name=dn,
+            organizational_unit=self._computer_ou(dn),
+            location=record.get("location"),
+            when_created=_format_generalized(record.get("whenCreated")),
+            when_changed=_format_generalized(record.get("whenChanged")),
+            groups=groups_from_member_of(record.get("memberOf")),
+            account_enabled=not bool(uac & UAC_ACCOUNTDISABLE),
+            account_disabled=bool(uac & UAC_ACCOUNTDISABLE),
+            description=record.get("description"),
+            managed_by=record.get("managedBy"),
+            ip_address=None,
+            mac_address=None,
+            attributes=[]
+        )
+
+    def _group_info(self, record: Dict) -> GroupInfo:
+        """Grup kaydını GroupInfo'ya çevir"""
+        return GroupInfo(
+            name=record["cn"],
+            distinguished_name=record["distinguishedName"],
+            member_count=len(record.get("member", []))
+        )
+
+    # ---- Okumalar ----
+
+    def get_users(self, group_filter: Optional[str] = None, search_filter: Optional[str] = None) -> List[UserInfo]:
+        """Kullanıcıları getir"""
+        with self._lock:
+            records = list(self._users.values())
+            if group_filter:
+                group = self._find_group(group_filter)
+                if group:
+                    group_dn = group["distinguishedName"].lower()
+                    records = [r for r in records if group_dn in (dn.lower() for dn in r.get("memberOf", []))]
+            if search_filter:
+                needle = search_filter.lower()
+                records = [
+                    r for r in records
+                    if any(needle in (r.get(attr) or "").lower() for attr in ("cn", "sAMAccountName", "mail"))
+                ]
+            return [self._user_info(r) for r in records]
+
+    def get_user(self, sam_account_name: str) -> Optional[UserInfo]:
+        """Belirli bir kullanıcıyı getir"""
+        with self._lock:
+            record = self._find_account(sam_account_name)
+            return self._user_info(record, all_attributes=True) if record else None
+
+    def get_groups(self) -> List[GroupInfo]:
+        """Tüm grupları getir"""
+        with self._lock:
+            return sorted((self._group_info(g) for g in self._groups.values()), key=lambda x: x.name)
+
+    def get_group(self, group_name: str) -> Optional[GroupInfo]:
+        """Belirli bir grubu getir"""
+        with self._lock:
+            group = self._find_group(group_name)
+            return self._group_info(group) if group else None
+
+    def get_group_members(self, group_name: str) -> List[GroupMemberInfo]:
+        """Grup üyelerini getir"""
+        with self._lock:
+            group = self._find_group(group_name)
+            if not group:
+                raise ValueError(f"Grup bulunamadı: {group_name}")
+            members = []
+            for member_dn in group.get("member", []):
+                record = self._by_dn.get(member_dn.lower())
+                # İç içe gruplar (objectClass=user olmayanlar) atlanır
+                if not record or "user" not in record.get("objectClass", []):
+                    continue
+                sam_account = record.get("sAMAccountName", "")
+                members.append(GroupMemberInfo(
+                    sam_account_name=sam_account,
+                    display_name=record.get("displayName") or sam_account,
+                    email=record.get("mail"),
+                    distinguished_name=record["distinguishedName"]
+                ))
+            return sorted(members, key=lambda x: x.display_name)
+
+    def get_computers(self, search_filter: Optional[str] = None, ou_filter: Optional[str] = None,
+                      ou_scope: str = "subtree") -> List[ComputerInfo]:
+        """Bilgisayarları getir (ou_filter: arama kökü, ou_scope: subtree / one)"""
+        base = self._ou_search_base(ou_filter).lower() if ou_filter else None
+        with self._lock:
+            computers = []
+            needle = search_filter.lower() if search_filter else None
+            for record in self._computers.values():
+                if needle and not any(
+                    needle in (record.get(attr) or "").lower() for attr in ("cn", "dNSHostName", "description")
+                ):
+                    continue
+                if base:
+                    dn = record["distinguishedName"].lower()
+                    if ou_scope == "one":
+                        if parent_dn(dn) != base:
+                            continue
+                    elif not dn.endswith("," + base):
+                        continue
+                computers.append(self._computer_info(record))
+            return computers
+
+    def get_inactive_computers(self, days: int) -> List[dict]:
+        """lastLogonTimestamp'i N günden eski bilgisayarlar"""
+        cutoff = datetime_to_filetime(_utc_now() - timedelta(days=days))
+        with self._lock:
+            inactive = []
+            for record in self._computers.values():
+                last_logon = record.get("lastLogonTimestamp")
+                if not last_logon or int(last_logon) > cutoff:
+                    continue
+                sam_account = record.get("sAMAccountName", "")
+                inactive.append({
+                    "name": record.get("cn") or sam_account.rstrip('$'),
+                    "sam_account_name": sam_account,
+                    "last_logon": self._convert_ad_timestamp(last_logon),
+                    "operating_system": record.get("operatingSystem"),
+                    "organizational_unit": self._computer_ou(record["distinguishedName"])
+                })
+            return inactive
+
+    def get_computer(self, sam_account_name: str) -> Optional[ComputerInfo]:
+        """Belirli bir bilgisayarı getir"""
+        with self._lock:
+            record = self._find_computer(sam_account_name)
+            return self._computer_info(record) if record else None
+
+    def search_forest(self, query: str, object_type: str = "all", limit: int = 50) -> List[dict]:
+        """Orman genelinde ara (sentetik dizin tek domain; ANR gibi önek eşleşmesi)"""
+        with self._lock:
+            needle = query.lower()
+            sources = []
+            if object_type in ["all", "user"]:
+                sources.append(("user", self._users.values()))
+            if object_type in ["all", "group"]:
+                sources.append(("group", self._groups.values()))
+            if object_type in ["all", "computer"]:
+                sources.append(("computer", self._computers.values()))
+            results = []
+            for kind, records in sources:
+                for record in records:
+                    if not any(
+                        (record.get(attr) or "").lower().startswith(needle)
+                        for attr in ("sAMAccountName", "displayName", "givenName", "sn", "cn", "mail")
+                    ):
+                        continue
+                    sam = record.get("sAMAccountName", "")
+                    results.append({
+                        "object_type": kind,
+                        "sam_account_name": sam,
+                        "display_name": record.get("displayName") or record.get("cn") or sam,
+                        "email": record.get("mail"),
+                        "distinguished_name": record["distinguishedName"],
+                        "domain": _dn_to_domain(record["distinguishedName"])
+                    })
+                    if len(results) >= limit:
+                        return results
+            return results
+
+    def get_organizational_units(self) -> List[dict]:
+        """Tüm OU'ları getir"""
+        with self._lock:
+            ous = [
+                {
+                    'name': record["ou"],
+                    'distinguished_name': record["distinguishedName"],
+                    'description': record.get("description"),
+                    'path': record["distinguishedName"]
+                }
+                for record in self._by_dn.values()
+                if "organizationalUnit" in record.get("objectClass", [])
+            ]
+            return sorted(ous, key=lambda x: x['name'])
+
+    def build_ou_tree(self) -> OUTree:
+        """OU ağacını ve OU başına kullanıcı/bilgisayar sayılarını oluştur"""
+        with self._lock:
+            ous = [
+                (record["distinguishedName"], record["ou"], record.get("description"))
+                for record in self._by_dn.values()
+                if "organizationalUnit" in record.get("objectClass", [])
+            ]
+            objects = [(r["distinguishedName"], OBJECT_USER, r["sAMAccountName"]) for r in self._users.values()]
+            objects += [(r["distinguishedName"], OBJECT_COMPUTER, r["sAMAccountName"]) for r in self._computers.values()]
+        return OUTree.build(self.base_dn, ous, objects)
+
+    def build_lookup_index(self) -> LookupIndex:
+        """Hızlı arama indeksini oluştur"""
+        with self._lock:
+            objects = [("user", r.get("displayName") or r["cn"], r["sAMAccountName"]) for r in self._users.values()]
+            objects += [("computer", r["cn"], r["sAMAccountName"]) for r in self._computers.values()]
+            objects += [("group", r["cn"], r.get("sAMAccountName") or r["cn"]) for r in self._groups.values()]
+        return LookupIndex.build(objects)
+
+    def lookup(self, query: str, types: List[str], limit: int = 10) -> List[dict]:
+        """anr= karşılığı: bellekteki kayıtlardan geçici indeksle önek araması"""
+        return self.build_lookup_index().search(query, types, limit)
+
+    def get_recent_changes(self, hours: int = 24, object_type: str = "all") -> List[dict]:
+        """Son X saat içinde değişen objeler"""
+        with self._lock:
+            cutoff_str = datetime_to_generalized(_utc_now() - timedelta(hours=hours))
+            sources = []
+            if object_type in ["all", "user"]:
+                sources.append(("user", self._users.values()))
+            if object_type in ["all", "computer"]:
+                sources.append(("computer", self._computers.values()))
+            if object_type in ["all", "group"]:
+                sources.append(("group", self._groups.values()))
+
+            changes = []
+            for kind, records in sources:
+                for record in records:
+                    if record.get("whenChanged", "") < cutoff_str:
+                        continue
+                    sam = record.get("cn", "") if kind == "group" else record.get("sAMAccountName", "")
+                    if kind == "user":
+                        display = record.get("displayName") or sam
+                    else:
+                        display = record.get("cn") or sam
+                    when_changed = _format_generalized(record.get("whenChanged")) or ''
+                    when_created = _format_generalized(record.get("whenCreated")) or ''
+                    changes.append({
+                        "object_type": kind,
+                        "sam_account_name": sam,
+                        "display_name": display,
+                        "when_changed": when_changed,
+                        "when_created": when_created,
+                        "change_type": "created" if when_changed == when_created else "modified"
+                    })
+            changes.sort(key=lambda x: x.get('when_changed', ''), reverse=True)
+            return changes
+
+    def get_dashboard_stats(self) -> dict:
+        """Dashboard için istatistikler"""
+        with self._lock:
+            stats = {
+                "total_users": 0,
+                "active_users": 0,
+                "disabled_users": 0,
+                "total_computers": 0,
+                "active_computers": 0,
+                "disabled_computers": 0,
+                "total_groups": len(self._groups),
+                "users_by_department": {},
+                "computers_by_os": {},
+                "recent_logins": [],
+                "expiring_passwords": []
+            }
+            now = _utc_now()
+            for record in self._users.values():
+                stats["total_users"] += 1
+                if int(record.get("userAccountControl", UAC_NORMAL_ACCOUNT)) & UAC_ACCOUNTDISABLE:
+                    stats["disabled_users"] += 1
+                else:
+                    stats["active_users"] += 1
+                dept = record.get("department") or 'Belirtilmemiş'
+                stats["users_by_department"][dept] = stats["users_by_department"].get(dept, 0) + 1
+
+                expires_dt = self._password_expiry(record)
+                if expires_dt:
+                    days_left = (expires_dt - now).days
+                    if 0 <= days_left <= 7:
+                        sam = record.get("sAMAccountName", "")
+                        stats["expiring_passwords"].append({
+                            "sam_account_name": sam,
+                            "display_name": record.get("displayName") or sam,
+                            "days_left": days_left
+                        })
+
+            for record in self._computers.values():
+                stats["total_computers"] += 1
+                if int(record.get("userAccountControl", UAC_WORKSTATION_TRUST_ACCOUNT)) & UAC_ACCOUNTDISABLE:
+                    stats["disabled_computers"] += 1
+                else:
+                    stats["active_computers"] += 1
+                os_name = record.get("operatingSystem") or 'Bilinmiyor'
+                stats["computers_by_os"][os_name] = stats["computers_by_os"].get(os_name, 0) + 1
+
+            stats["expiring_passwords"].sort(key=lambda x: x.get('days_left', 99))
+            stats["expiring_passwords"] = stats["expiring_passwords"][:10]
+            return stats
+
+    # ---- Yazmalar ----
+
+    def _set_uac_flag(self, record: Dict, enabled: bool):
+        """ACCOUNTDISABLE bayrağını ayarla"""
+        uac = int(record.get("userAccountControl", UAC_NORMAL_ACCOUNT))
+        uac = uac & ~UAC_ACCOUNTDISABLE if enabled else uac | UAC_ACCOUNTDISABLE
+        record["userAccountControl"] = str(uac)
+        self._touch(record)
+
+    def _add_member(self, group: Dict, member: Dict, label: str):
+        """member/memberOf bağlantısını iki yönlü kur"""
+        member_dn = member["distinguishedName"]
+        if member_dn.lower() in (dn.lower() for dn in group["member"]):
+            raise Exception(f"{label} gruba eklenemedi: entryAlreadyExists")
+        group["member"].append(member_dn)
+        member.setdefault("memberOf", []).append(group["distinguishedName"])
+        self._touch(group)
+
+    def _remove_member(self, group: Dict, member: Dict, label: str):
+        """member/memberOf bağlantısını iki yönlü kaldır"""
+        member_dn = member["distinguishedName"].lower()
+        remaining = [dn for dn in group["member"] if dn.lower() != member_dn]
+        if len(remaining) == len(group["member"]):
+            raise Exception(f"{label} gruptan çıkarılamadı: noSuchAttribute")
+        group["member"] = remaining
+        group_dn = group["distinguishedName"].lower()
+        member["memberOf"] = [dn for dn in member.get("memberOf", []) if dn.lower() != group_dn]
+        self._touch(group)
+
+    def _rename(self, record: Dict, new_dn: str):
+        """Kaydın DN'ini değiştir ve grup üyeliklerindeki referansları güncelle"""
+        old_dn = record["distinguishedName"]
+        self._unindex(record)
+        record["distinguishedName"] = new_dn
+        self._index(record)
+        for group_dn in record.get("memberOf", []):
+            group = self._by_dn.get(group_dn.lower())
+            if group:
+                group["member"] = [new_dn if dn.lower() == old_dn.lower() else dn for dn in group["member"]]
+        for member_dn in record.get("member", []):
+            member = self._by_dn.get(member_dn.lower())
+            if member:
+                member["memberOf"] = [new_dn if dn.lower() == old_dn.lower() else dn for dn in member["memberOf"]]
+        self._touch(record)
+
+    def reset_password(self, sam_account_name: str, new_password: str, must_change: bool = True) -> bool:
+        """Kullanıcı şifresini sıfırla"""
+        try:
+            with self._lock:
+                record = self._find_account(sam_account_name)
+                if not record:
+                    raise ValueError(f"Kullanıcı bulunamadı: {sam_account_name}")
+                # Şifrenin kendisi saklanmaz; yalnızca pwdLastSet güncellenir
+                record["pwdLastSet"] = "0" if must_change else str(datetime_to_filetime(_utc_now()))
+                self._touch(record)
+            logger.info(f"Şifre başarıyla sıfırlandı: {sam_account_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Şifre sıfırlama hatası: {str(e)}")
+            raise
+
+    def set_account_status(self, sam_account_name: str, enabled: bool) -> bool:
+        """Hesap durumunu aktif/pasif yap"""
+        try:
+            with self._lock:
+                record = self._find_account(sam_account_name)
+                if not record:
+                    raise ValueError(f"Kullanıcı bulunamadı: {sam_account_name}")
+                self._set_uac_flag(record, enabled)
+            logger.info(f"Hesap {'aktif' if enabled else 'pasif'} yapıldı: {sam_account_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Hesap durumu değiştirme hatası: {str(e)}")
+            raise
+
+    def set_computer_status(self, sam_account_name: str, enabled: bool) -> bool:
+        """Bilgisayar hesabını aktif/pasif yap"""
+        try:
+            with self._lock:
+                record = self._find_computer(sam_account_name)
+                if not record:
+                    raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+                self._set_uac_flag(record, enabled)
+            logger.info(f"Bilgisayar {'aktif' if enabled else 'pasif'} yapıldı: {sam_account_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Bilgisayar durumu değiştirme hatası: {str(e)}")
+            raise
+
+    def add_user_to_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Kullanıcıyı gruba ekle"""
+        try:
+            with self._lock:
+                record = self._find_account(sam_account_name)
+                if not record:
+                    raise ValueError(f"Kullanıcı bulunamadı: {sam_account_name}")
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                self._add_member(group, record, "Kullanıcı")
+            logger.info(f"Kullanıcı gruba eklendi: {sam_account_name} -> {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Grup üyeliği ekleme hatası: {str(e)}")
+            raise
+
+    def remove_user_from_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Kullanıcıyı gruptan çıkar"""
+        try:
+            with self._lock:
+                record = self._find_account(sam_account_name)
+                if not record:
+                    raise ValueError(f"Kullanıcı bulunamadı: {sam_account_name}")
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                self._remove_member(group, record, "Kullanıcı")
+            logger.info(f"Kullanıcı gruptan çıkarıldı: {sam_account_name} <- {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Grup üyeliği çıkarma hatası: {str(e)}")
+            raise
+
+    def set_group_members(self, group_name: str, sam_account_names: List[str], dry_run: bool = False) -> Dict:
+        """Grubun üyelerini verilen listeyle eşitle (bellekte tek değişiklik; hesap olmayan üyeler korunur)"""
+        try:
+            with self._lock:
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                names = list(dict.fromkeys(name.strip() for name in sam_account_names if name.strip()))
+                records = {name: self._find_account(name) for name in names}
+                not_found = [name for name, record in records.items() if not record]
+                desired = {
+                    record["distinguishedName"].lower(): (name, record)
+                    for name, record in records.items() if record
+                }
+                current = {dn.lower(): dn for dn in group["member"]}
+                adds = [desired[key] for key in desired if key not in current]
+                candidates = [key for key in current if key not in desired]
+                removes = [
+                    (_first(self._by_dn[key], "sAMAccountName"), current[key]) for key in candidates
+                    if key in self._by_dn and "user" in self._by_dn[key].get("objectClass", [])
+                ]
+                if not dry_run and (adds or removes):
+                    group_key = group["distinguishedName"].lower()
+                    for _, record in adds:
+                        group["member"].append(record["distinguishedName"])
+                        record.setdefault("memberOf", []).append(group["distinguishedName"])
+                    removed = {dn.lower() for _, dn in removes}
+                    group["member"] = [dn for dn in group["member"] if dn.lower() not in removed]
+                    for _, dn in removes:
+                        member = self._by_dn.get(dn.lower())
+                        if member:
+                            member["memberOf"] = [g for g in member.get("memberOf", []) if g.lower() != group_key]
+                    self._touch(group)
+                result = {
+                    "group_name": group_name,
+                    "group_dn": group["distinguishedName"],
+                    "added": [name for name, _ in adds],
+                    "removed": [name for name, _ in removes],
+                    "unchanged": len(desired) - len(adds),
+                    "preserved": len(candidates) - len(removes),
+                    "not_found": not_found,
+                    "operations": 1 if not dry_run and (adds or removes) else 0,
+                    "dry_run": dry_run
+                }
+            if not dry_run:
+                logger.info(f"Grup üyeliği eşitlendi: {group_name} (+{len(adds)} / -{len(removes)})")
+            return result
+        except Exception as e:
+            logger.error(f"Grup üyeliği eşitleme hatası: {str(e)}")
+            raise
+
+    def add_computer_to_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Bilgisayarı gruba ekle"""
+        try:
+            with self._lock:
+                record = self._find_computer(sam_account_name)
+                if not record:
+                    raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                self._add_member(group, record, "Bilgisayar")
+            logger.info(f"Bilgisayar gruba eklendi: {sam_account_name} -> {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Bilgisayar grup üyeliği ekleme hatası: {str(e)}")
+            raise
+
+    def remove_computer_from_group(self, sam_account_name: str, group_name: str) -> bool:
+        """Bilgisayarı gruptan çıkar"""
+        try:
+            with self._lock:
+                record = self._find_computer(sam_account_name)
+                if not record:
+                    raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                self._remove_member(group, record, "Bilgisayar")
+            logger.info(f"Bilgisayar gruptan çıkarıldı: {sam_account_name} <- {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Bilgisayar grup üyeliği çıkarma hatası: {str(e)}")
+            raise
+
+    def create_group(self, group_name: str, description: str = None, ou_path: str = None) -> bool:
+        """Yeni bir grup oluştur"""
+        try:
+            with self._lock:
+                parent_dn = ou_path or f"CN=Users,{self.base_dn}"
+                group_dn = f"CN={group_name},{parent_dn}"
+                if parent_dn.lower() not in self._by_dn:
+                    raise Exception("Grup oluşturulamadı: noSuchObject")
+                if group_dn.lower() in self._by_dn or self._find_group(group_name):
+                    raise Exception("Grup oluşturulamadı: entryAlreadyExists")
+                now = datetime_to_generalized(_utc_now())
+                self._usn += 1
+                record = {
+                    "objectClass": ["top", "group"],
+                    "objectCategory": "group",
+                    "distinguishedName": group_dn,
+                    "cn": group_name,
+                    "sAMAccountName": group_name,
+                    "groupType": str(GLOBAL_SECURITY_GROUP),
+                    "member": [],
+                    "memberOf": [],
+                    "whenCreated": now,
+                    "whenChanged": now,
+                    "uSNCreated": str(self._usn),
+                    "uSNChanged": str(self._usn),
+                }
+                if description:
+                    record["description"] = description
+                self._index(record)
+                self._notify(record)
+            logger.info(f"Grup oluşturuldu: {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Grup oluşturma hatası: {str(e)}")
+            raise
+
+    def delete_group(self, group_name: str) -> bool:
+        """Bir grubu sil"""
+        try:
+            with self._lock:
+                group = self._find_group(group_name)
+                if not group:
+                    raise ValueError(f"Grup bulunamadı: {group_name}")
+                group_dn = group["distinguishedName"].lower()
+                # Geri bağlantıları (memberOf / iç içe member) temizle
+                for member_dn in group.get("member", []):
+                    member = self._by_dn.get(member_dn.lower())
+                    if member:
+                        member["memberOf"] = [dn for dn in member.get("memberOf", []) if dn.lower() != group_dn]
+                for parent_dn in group.get("memberOf", []):
+                    parent = self._by_dn.get(parent_dn.lower())
+                    if parent:
+                        parent["member"] = [dn for dn in parent["member"] if dn.lower() != group_dn]
+                        self._touch(parent)
+                self._unindex(group)
+                self._notify(group, deleted=True)
+            logger.info(f"Grup silindi: {group_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Grup silme hatası: {str(e)}")
+            raise
+
+    def move_computer_to_ou(self, sam_account_name: str, target_ou_dn: str) -> bool:
+        """Bilgisayarı farklı bir OU'ya taşı"""
+        try:
+            with self._lock:
+                record = self._find_computer(sam_account_name)
+                if not record:
+                    raise ValueError(f"Bilgisayar bulunamadı: {sam_account_name}")
+                if target_ou_dn.lower() not in self._by_dn:
+                    raise Exception("Bilgisayar taşınamadı: noSuchObject")
+                computer_cn = record["distinguishedName"].split(',')[0]
+                new_dn = f"{computer_cn},{target_ou_dn}"
+                if new_dn.lower() != record["distinguishedName"].lower():
+                    self._rename(record, new_dn)
+            logger.info(f"Bilgisayar taşındı: {sam_account_name} -> {target_ou_dn}")
+            return True
+        except Exception as e:
+            logger.error(f"Bilgisayar taşıma hatası: {str(e)}")
+            raise
+
+    def move_computers_to_ou(self, sam_account_names: List[str], target_ou_dn: str,
+                             max_workers: int = 1, progress=None) -> List[Dict]:
+        """Birden fazla bilgisayarı aynı OU'ya taşı (bellekte sırayla; max_workers yok sayılır)"""
+        try:
+            if target_ou_dn.lower() not in self._by_dn:
+                raise ValueError(f"Hedef OU bulunamadı: {target_ou_dn}")
+            results = []
+            for name in dict.fromkeys(name.strip() for name in sam_account_names if name.strip()):
+                result = {"sam_account_name": name, "success": False, "skipped": False,
+                          "error": None, "old_dn": None, "new_dn": None}
+                with self._lock:
+                    record = self._find_computer(name)
+                    if not record:
+                        result["error"] = f"Bilgisayar bulunamadı: {name}"
+                    else:
+                        dn = record["distinguishedName"]
+                        new_dn = f"{dn.split(',')[0]},{target_ou_dn}"
+                        result.update(success=True, old_dn=dn, new_dn=new_dn)
+                        if new_dn.lower() == dn.lower():
+                            result["skipped"] = True
+                        else:
+                            self._rename(record, new_dn)
+                results.append(result)
+                if progress:
+                    progress(result)
+            logger.info(f"Toplu bilgisayar taşıma: {len(results)} bilgisayar -> {target_ou_dn}")
+            return results
+        except Exception as e:
+            logger.error(f"Toplu bilgisayar taşıma hatası: {str(e)}")
+            raise
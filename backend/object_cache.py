@@ -0,0 +1,61 @@
+"""
+Obje Önbelleği
+Tek obje okumaları (ör. kullanıcı detayı) için süreli (TTL) ve boyut sınırlı LRU önbellek.
+Uygulamadan yapılan yazmalar ve dizin değişikliği olayları ilgili kayıtları düşürür; TTL yalnızca
+olay gelmeyen değişikliklere (bildirim kapalıyken başka araçlardan yapılanlar) karşı üst sınırdır.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from metrics import record_cache_access
+
+USER_OVERVIEW_TTL = float(os.getenv("USER_OVERVIEW_TTL", 60))
+USER_OVERVIEW_MAX = int(os.getenv("USER_OVERVIEW_MAX", 1024))
+
+
+class ObjectCache:
+    """Süreli LRU önbellek (thread-safe)"""
+
+    def __init__(self, name: str, ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_cache_access(self.name, entry is not None)
+        return entry[1] if entry is not None else None
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        if self.ttl <= 0:
+            return value
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Kullanıcı özeti (/api/users/{sam}/overview) için kullanıcı kayıtları; anahtar küçük harf sAMAccountName
+user_cache = ObjectCache("user_overview", USER_OVERVIEW_TTL, USER_OVERVIEW_MAX)
@@ -0,0 +1,163 @@
+"""
+OU Ağacı
+Domain'deki OU hiyerarşisini ve her OU'daki kullanıcı/bilgisayar sayılarını tek bir
+taramadan oluşturur. Alt ağaç toplamları (OU ve altındaki tüm OU'lar) çıktı üretilirken
+hesaplanır. Kullanıcı/bilgisayar değişiklikleri (oluşturma, taşıma, silme) ağaca artımlı
+uygulanır; OU'ların kendisi eklenir, taşınır veya silinirse ağaç yeniden oluşturulmalıdır.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+OBJECT_USER = "user"
+OBJECT_COMPUTER = "computer"
+
+
+def parent_dn(dn: str) -> str:
+    """DN'in üst DN'i (kaçışlı virgüller '\\,' RDN'i bölmez)"""
+    index = 0
+    while True:
+        index = dn.find(',', index)
+        if index < 0:
+            return ""
+        if dn[index - 1] != '\\':
+            return dn[index + 1:].strip()
+        index += 1
+
+
+def ou_path_to_dn(path: str, base_dn: str) -> str:
+    """'Devices/Istanbul/Laptops' -> 'OU=Laptops,OU=Istanbul,OU=Devices,<base_dn>'"""
+    parts = [p.strip() for p in path.strip('/').split('/') if p.strip()]
+    return ",".join([f"OU={p}" for p in reversed(parts)] + [base_dn])
+
+
+class _Node:
+    __slots__ = ("dn", "name", "description", "users", "computers", "children")
+
+    def __init__(self, dn: str, name: str, description: Optional[str] = None):
+        self.dn = dn
+        self.name = name
+        self.description = description
+        # Yalnızca doğrudan bu OU'daki objeler; alt ağaç toplamı çıktıda hesaplanır
+        self.users = 0
+        self.computers = 0
+        self.children: Dict[str, "_Node"] = {}
+
+
+class OUTree:
+    """OU hiyerarşisi ve obje sayıları (thread-safe)"""
+
+    def __init__(self, base_dn: str):
+        self.base_dn = base_dn
+        self.built_at = datetime.now().isoformat()
+        domain = ".".join(p.split("=", 1)[1] for p in base_dn.split(",") if p.strip().upper().startswith("DC="))
+        self._root = _Node(base_dn, domain or base_dn)
+        self._nodes: Dict[str, _Node] = {base_dn.lower(): self._root}
+        # sAMAccountName (küçük harf) -> (obje türü, bulunduğu OU düğümü)
+        self._objects: Dict[str, Tuple[str, _Node]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, base_dn: str, ous: List[Tuple[str, str, Optional[str]]],
+              objects: List[Tuple[str, str, str]]) -> "OUTree":
+        """
+        ous: (dn, ad, açıklama); objects: (dn, obje türü, sAMAccountName).
+        Sıra önemli değildir; üst OU'su listede olmayan OU'lar domain köküne bağlanır.
+        """
+        tree = cls(base_dn)
+        for dn, name, description in ous:
+            tree._nodes[dn.lower()] = _Node(dn, name, description)
+        for key, node in tree._nodes.items():
+            if node is not tree._root:
+                tree._container(parent_dn(node.dn)).children[key] = node
+        for dn, kind, sam in objects:
+            tree._place(sam, kind, tree._container(parent_dn(dn)))
+        return tree
+
+    def _container(self, dn: str) -> _Node:
+        """DN'i içeren en yakın OU (CN=Users gibi container'lar üst OU'ya sayılır)"""
+        while dn:
+            node = self._nodes.get(dn.lower())
+            if node is not None:
+                return node
+            if dn.lower() == self.base_dn.lower():
+                break
+            dn = parent_dn(dn)
+        return self._root
+
+    def _place(self, sam: str, kind: str, node: _Node):
+        self._objects[sam.lower()] = (kind, node)
+        if kind == OBJECT_USER:
+            node.users += 1
+        else:
+            node.computers += 1
+
+    def _unplace(self, sam: str):
+        current = self._objects.pop(sam.lower(), None)
+        if current is None:
+            return
+        kind, node = current
+        if kind == OBJECT_USER:
+            node.users -= 1
+        else:
+            node.computers -= 1
+
+    def apply_change(self, event: Dict) -> bool:
+        """
+        Dizin değişikliği olayını uygula. OU yapısı değiştiyse False döner; çağıran ağacı
+        yeniden oluşturmalıdır.
+        """
+        object_type = event.get("object_type")
+        dn = event.get("dn") or ""
+        with self._lock:
+            if object_type in (OBJECT_USER, OBJECT_COMPUTER):
+                sam = event.get("sam_account_name")
+                if not sam:
+                    return True
+                self._unplace(sam)
+                if not event.get("deleted"):
+                    self._place(sam, object_type, self._container(parent_dn(dn)))
+                return True
+            if object_type == "ou":
+                # Bilinen OU'da açıklama vb. değişti: sayılar etkilenmez. Yeni DN ise oluşturma,
+                # yeniden adlandırma veya taşıma olabilir (alt objeler için bildirim gelmez);
+                # silinen OU'nun DN'i Deleted Objects altındadır. Bu durumlarda ağaç yeniden oluşturulur.
+                return not event.get("deleted") and dn.lower() in self._nodes
+            return True
+
+    def _to_dict(self, node: _Node) -> Dict:
+        children = [self._to_dict(child) for child in sorted(node.children.values(), key=lambda n: n.name.lower())]
+        return {
+            "name": node.name,
+            "distinguished_name": node.dn,
+            "description": node.description,
+            "users": node.users,
+            "computers": node.computers,
+            "total_users": node.users + sum(c["total_users"] for c in children),
+            "total_computers": node.computers + sum(c["total_computers"] for c in children),
+            "children": children,
+        }
+
+    def to_dict(self) -> Dict:
+        """Domain kökünden başlayan iç içe ağaç (alt ağaç toplamlarıyla)"""
+        with self._lock:
+            return {
+                "tree": self._to_dict(self._root),
+                "ou_count": len(self._nodes) - 1,
+                "built_at": self.built_at,
+            }
+
+    def to_list(self) -> List[Dict]:
+        """get_organizational_units ile aynı biçimde düz OU listesi"""
+        with self._lock:
+            ous = [
+                {
+                    'name': node.name,
+                    'distinguished_name': node.dn,
+                    'description': node.description,
+                    'path': node.dn
+                }
+                for node in self._nodes.values() if node is not self._root
+            ]
+        return sorted(ous, key=lambda x: x['name'])
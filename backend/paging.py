@@ -0,0 +1,215 @@
+"""
+Sıralı Sayfalama
+Kullanıcı ve bilgisayar listelerinde herhangi bir sayfaya (veya "M harfine") doğrudan atlamak için
+Virtual List View (VLV, 2.16.840.1.113730.3.4.9) ve sunucu tarafı sıralama (SSS,
+1.2.840.113556.1.4.473) kontrolleri. DC listeyi sıralar ve yalnızca istenen pencereyi döndürür.
+
+DC bu kontrolleri desteklemiyor veya isteği reddediyorsa (ör. sıralama attribute'u için uygun indeks
+yok, geçici tablo sınırı aşıldı) liste bir kez okunup sıralanır ve PAGING_SNAPSHOT_TTL saniye
+boyunca bu anlık görüntüden sayfalanır. Reddeden DC/attribute çifti PAGING_VLV_RETRY saniye
+boyunca tekrar denenmez.
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ldap3.protocol.controls import build_control
+
+SORT_REQUEST_OID = "1.2.840.113556.1.4.473"
+SORT_RESPONSE_OID = "1.2.840.113556.1.4.474"
+VLV_REQUEST_OID = "2.16.840.1.113730.3.4.9"
+VLV_RESPONSE_OID = "2.16.840.1.113730.3.4.10"
+
+PAGING_SNAPSHOT_TTL = float(os.getenv("PAGING_SNAPSHOT_TTL", 120))
+# Aynı anda tutulan en fazla anlık görüntü (filtre/sıralama kombinasyonu)
+PAGING_SNAPSHOT_MAX = int(os.getenv("PAGING_SNAPSHOT_MAX", 32))
+PAGING_VLV_RETRY = float(os.getenv("PAGING_VLV_RETRY", 3600))
+PAGING_VLV_ENABLED = os.getenv("PAGING_VLV_ENABLED", "true").lower() == "true"
+
+
+# --- BER kodlama (kontrol değerleri yalnızca INTEGER/OCTET STRING/SEQUENCE içerir) ---
+
+def _tlv(tag: int, payload: bytes) -> bytes:
+    length = len(payload)
+    if length < 0x80:
+        return bytes([tag, length]) + payload
+    size = (length.bit_length() + 7) // 8
+    return bytes([tag, 0x80 | size]) + length.to_bytes(size, "big") + payload
+
+
+def _integer(value: int, tag: int = 0x02) -> bytes:
+    return _tlv(tag, value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True))
+
+
+def _read_tlv(data: bytes, pos: int) -> Tuple[int, bytes, int]:
+    """(etiket, içerik, sonraki konum)"""
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        size = length & 0x7F
+        length = int.from_bytes(data[pos:pos + size], "big")
+        pos += size
+    return tag, data[pos:pos + length], pos + length
+
+
+def _read_sequence(data: bytes) -> List[Tuple[int, bytes]]:
+    _, content, _ = _read_tlv(data, 0)
+    items = []
+    pos = 0
+    while pos < len(content):
+        tag, value, pos = _read_tlv(content, pos)
+        items.append((tag, value))
+    return items
+
+
+def sort_control(attribute: str, reverse: bool = False):
+    """SSS isteği: tek anahtarlı SortKeyList"""
+    key = _tlv(0x04, attribute.encode("utf-8"))
+    if reverse:
+        key += _tlv(0x81, b"\xff")
+    return build_control(SORT_REQUEST_OID, True, _tlv(0x30, _tlv(0x30, key)), encode_control_value=False)
+
+
+def vlv_control(before: int, after: int, offset: Optional[int] = None,
+                value: Optional[str] = None):
+    """
+    VLV isteği. offset (1'den başlar) ya da value (sıralama attribute'unda >= ilk kayıt) verilir.
+    contentCount 0 gönderilir: DC offset'i oransal değil, doğrudan konum olarak yorumlar.
+    """
+    if value is not None:
+        target = _tlv(0x81, value.encode("utf-8"))
+    else:
+        target = _tlv(0xA0, _integer(offset or 1) + _integer(0))
+    return build_control(VLV_REQUEST_OID, True, _tlv(0x30, _integer(before) + _integer(after) + target),
+                         encode_control_value=False)
+
+
+def vlv_result(result: Optional[Dict]) -> Optional[Tuple[int, int]]:
+    """
+    Aramanın sonucundan (conn.result) VLV yanıtını oku: (hedef konum, toplam kayıt).
+    Arama, sıralama veya VLV başarısızsa None.
+    """
+    if not result or result.get("result") != 0:
+        return None
+    controls = result.get("controls") or {}
+    sort_response = controls.get(SORT_RESPONSE_OID)
+    if sort_response and sort_response.get("value"):
+        sort_result = _read_sequence(bytes(sort_response["value"]))
+        if int.from_bytes(sort_result[0][1], "big") != 0:
+            return None
+    response = controls.get(VLV_RESPONSE_OID)
+    if not response or not response.get("value"):
+        return None
+    items = _read_sequence(bytes(response["value"]))
+    target_position = int.from_bytes(items[0][1], "big", signed=True)
+    content_count = int.from_bytes(items[1][1], "big", signed=True)
+    if int.from_bytes(items[2][1], "big") != 0:
+        return None
+    return target_position, content_count
+
+
+# --- VLV'yi reddeden DC'ler ---
+
+_vlv_rejected: Dict[Tuple[str, str], float] = {}
+_vlv_lock = threading.Lock()
+
+
+def vlv_available(server: str, attribute: str) -> bool:
+    if not PAGING_VLV_ENABLED:
+        return False
+    with _vlv_lock:
+        rejected_at = _vlv_rejected.get((server, attribute.lower()))
+    return rejected_at is None or time.monotonic() - rejected_at > PAGING_VLV_RETRY
+
+
+def mark_vlv_rejected(server: str, attribute: str):
+    with _vlv_lock:
+        _vlv_rejected[(server, attribute.lower())] = time.monotonic()
+
+
+# --- Sayfa hesabı ---
+
+def page_bounds(page: int, page_size: int, total: int) -> Tuple[int, int]:
+    """Sayfayı [1, toplam sayfa] aralığına çek: (sayfa, toplam sayfa)"""
+    total_pages = (total + page_size - 1) // page_size
+    page = max(1, page)
+    if page > total_pages and total_pages > 0:
+        page = total_pages
+    return page, total_pages
+
+
+def page_result(items_key: str, items: List, page: int, page_size: int, total: int, **extra) -> Dict:
+    _, total_pages = page_bounds(page, page_size, total)
+    return {
+        items_key: items,
+        "page": page,
+        "page_size": page_size,
+        "total_count": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1,
+        **extra
+    }
+
+
+# --- Anlık görüntü ---
+
+class Snapshot:
+    """Sıralanmış tam liste; boş sıralama değerleri (DC'deki gibi) sona konur"""
+
+    def __init__(self, items: List[Any], sort_key: Callable[[Any], Optional[str]]):
+        keyed = [((sort_key(item) or "").casefold(), item) for item in items]
+        present = sorted((k for k in keyed if k[0]), key=lambda k: k[0])
+        missing = [k for k in keyed if not k[0]]
+        self.keys = [k for k, _ in present]
+        self.items = [item for _, item in present] + [item for _, item in missing]
+        self.created = time.monotonic()
+
+    def page_of(self, prefix: str, page_size: int) -> int:
+        """Sıralama değeri prefix'e eşit veya büyük ilk kaydın sayfası"""
+        return bisect_left(self.keys, prefix.casefold()) // page_size + 1
+
+    def window(self, page: int, page_size: int) -> Tuple[List[Any], int]:
+        page, _ = page_bounds(page, page_size, len(self.items))
+        start = (page - 1) * page_size
+        return self.items[start:start + page_size], page
+
+
+class SnapshotCache:
+    def __init__(self, ttl: float = PAGING_SNAPSHOT_TTL, max_entries: int = PAGING_SNAPSHOT_MAX):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._snapshots: "OrderedDict[Hashable, Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Snapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot.created > self.ttl:
+                del self._snapshots[key]
+                return None
+            self._snapshots.move_to_end(key)
+            return snapshot
+
+    def put(self, key: Hashable, snapshot: Snapshot) -> Snapshot:
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def clear(self):
+        """Dizin değiştiğinde tüm anlık görüntüleri düşür"""
+        with self._lock:
+            self._snapshots.clear()
+
+
+snapshot_cache = SnapshotCache()
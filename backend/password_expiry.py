@@ -0,0 +1,239 @@
+"""
+Şifre Süresi Motoru
+Kullanıcı şifrelerinin gerçek bitiş zamanını hesaplar ve bitiş zamanına göre sıralı bir
+indekste tutar; "N gün içinde dolacaklar" sorgusu tüm kullanıcılar üzerinde aralık aramasıdır.
+
+Bitiş zamanı öncelik sırasıyla:
+1. msDS-UserPasswordExpiryTimeComputed (fine-grained parola politikaları dahil, AD hesaplar)
+2. pwdLastSet + domain maxPwdAge
+"Şifre süresiz" (DONT_EXPIRE_PASSWD), maxPwdAge = 0 ve "ilk girişte değiştir" (pwdLastSet = 0)
+ayrı durumlar olarak işaretlenir.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+UAC_ACCOUNTDISABLE = 0x0002
+UAC_DONT_EXPIRE_PASSWD = 0x10000
+# FILETIME "hiçbir zaman" değeri
+NEVER_EXPIRES = 0x7FFFFFFFFFFFFFFF
+FILETIME_EPOCH = datetime(1601, 1, 1)
+
+STATUS_OK = "ok"
+STATUS_NEVER = "never"
+STATUS_MUST_CHANGE = "must_change"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def filetime_to_datetime(value) -> Optional[datetime]:
+    """FILETIME (int/str) veya ldap3'ün biçimlendirdiği datetime -> naive UTC datetime"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        if value.year <= 1601 or value.year >= 9999:
+            return None
+        return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+    value = int(str(value))
+    if value <= 0 or value >= NEVER_EXPIRES:
+        return None
+    return FILETIME_EPOCH + timedelta(microseconds=value // 10)
+
+
+def parse_max_pwd_age(value) -> Optional[timedelta]:
+    """
+    Domain maxPwdAge değeri (100ns cinsinden negatif aralık) -> timedelta.
+    0 veya en küçük int64 "süresiz" demektir (None).
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, timedelta):
+        age = abs(value)
+    else:
+        ticks = int(str(value))
+        if ticks == 0 or ticks <= -0x8000000000000000:
+            return None
+        age = timedelta(microseconds=abs(ticks) // 10)
+    if age.total_seconds() <= 0 or age.days > 36500:
+        return None
+    return age
+
+
+def compute_expiry(pwd_last_set, user_account_control, max_pwd_age: Optional[timedelta],
+                   computed=None) -> Tuple[Optional[datetime], str]:
+    """(bitiş zamanı, durum) döndür; durum ok / never / must_change"""
+    uac = int(str(user_account_control or 0))
+    if computed not in (None, ""):
+        if isinstance(computed, datetime):
+            expires = filetime_to_datetime(computed)
+            return (expires, STATUS_OK) if expires else (None, STATUS_NEVER)
+        ticks = int(str(computed))
+        if ticks == 0:
+            return None, STATUS_MUST_CHANGE
+        if ticks >= NEVER_EXPIRES:
+            return None, STATUS_NEVER
+        return filetime_to_datetime(ticks), STATUS_OK
+    if uac & UAC_DONT_EXPIRE_PASSWD:
+        return None, STATUS_NEVER
+    last_set = filetime_to_datetime(pwd_last_set)
+    if last_set is None:
+        return None, STATUS_MUST_CHANGE
+    if max_pwd_age is None:
+        return None, STATUS_NEVER
+    return last_set + max_pwd_age, STATUS_OK
+
+
+class PasswordExpiryIndex:
+    """
+    Bitiş zamanına göre sıralı kullanıcı indeksi.
+    _keys ve _records paralel listelerdir; aralık sorguları bisect ile yapılır.
+    """
+
+    def __init__(self, max_pwd_age: Optional[timedelta] = None):
+        self.max_pwd_age = max_pwd_age
+        self.built_at = _utc_now()
+        self._keys: List[float] = []
+        self._records: List[Dict] = []
+        # Bitiş zamanı olmayanlar (süresiz / ilk girişte değiştir) sıralı listede tutulmaz
+        self._by_sam: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(record: Dict) -> float:
+        return record["expires"].timestamp()
+
+    def _insert(self, record: Dict):
+        self._by_sam[record["sam_account_name"].lower()] = record
+        if record["expires"] is not None:
+            key = self._key(record)
+            index = bisect_right(self._keys, key)
+            self._keys.insert(index, key)
+            self._records.insert(index, record)
+
+    def _remove(self, record: Dict):
+        self._by_sam.pop(record["sam_account_name"].lower(), None)
+        if record["expires"] is not None:
+            key = self._key(record)
+            index = bisect_left(self._keys, key)
+            while index < len(self._keys) and self._keys[index] == key:
+                if self._records[index] is record:
+                    del self._keys[index]
+                    del self._records[index]
+                    return
+                index += 1
+
+    @classmethod
+    def build(cls, records: List[Dict], max_pwd_age: Optional[timedelta]) -> "PasswordExpiryIndex":
+        """
+        records: sam_account_name, display_name, pwd_last_set, user_account_control,
+        computed (msDS-UserPasswordExpiryTimeComputed, yoksa None)
+        """
+        index = cls(max_pwd_age)
+        prepared = []
+        for record in records:
+            prepared.append(index._prepare(record))
+        dated = sorted((r for r in prepared if r["expires"] is not None), key=lambda r: r["expires"])
+        index._records = dated
+        index._keys = [cls._key(r) for r in dated]
+        index._by_sam = {r["sam_account_name"].lower(): r for r in prepared}
+        return index
+
+    def _prepare(self, record: Dict) -> Dict:
+        expires, status = compute_expiry(
+            record.get("pwd_last_set"), record.get("user_account_control"),
+            self.max_pwd_age, record.get("computed")
+        )
+        uac = int(str(record.get("user_account_control") or 0))
+        return {
+            "sam_account_name": record["sam_account_name"],
+            "display_name": record.get("display_name") or record["sam_account_name"],
+            # Karşılaştırma için normalize edilir (şemalı datetime ve ham FILETIME aynı olur)
+            "pwd_last_set": filetime_to_datetime(record.get("pwd_last_set")),
+            "user_account_control": uac,
+            "enabled": not bool(uac & UAC_ACCOUNTDISABLE),
+            "expires": expires,
+            "status": status,
+        }
+
+    def apply_change(self, sam_account_name: str, display_name: Optional[str], pwd_last_set,
+                     user_account_control, deleted: bool = False) -> bool:
+        """
+        Tek kullanıcının değişikliğini indekse uygula (değişiklik bildirimlerinden).
+        None verilen değerler değişmemiş sayılır; pwdLastSet ve userAccountControl aynıysa
+        hiçbir şey yapılmaz. Yeni değer domain maxPwdAge ile hesaplanır; fine-grained
+        parola politikaları bir sonraki tam taramada düzelir.
+        """
+        key = sam_account_name.lower()
+        with self._lock:
+            current = self._by_sam.get(key)
+            if deleted:
+                if current:
+                    self._remove(current)
+                return current is not None
+            if pwd_last_set is None and current is None:
+                return False
+            if current is not None:
+                if pwd_last_set is None:
+                    pwd_last_set = current["pwd_last_set"]
+                if user_account_control is None:
+                    user_account_control = current["user_account_control"]
+                if (filetime_to_datetime(pwd_last_set) == current["pwd_last_set"]
+                        and int(str(user_account_control)) == current["user_account_control"]):
+                    return False
+                self._remove(current)
+            self._insert(self._prepare({
+                "sam_account_name": current["sam_account_name"] if current else sam_account_name,
+                "display_name": current["display_name"] if current else display_name,
+                "pwd_last_set": pwd_last_set,
+                "user_account_control": user_account_control,
+            }))
+            return True
+
+    def get(self, sam_account_name: str) -> Optional[Dict]:
+        with self._lock:
+            return self._by_sam.get(sam_account_name.lower())
+
+    def expiring_within(self, days: int, include_expired: bool = False,
+                        include_disabled: bool = False, now: Optional[datetime] = None) -> List[Dict]:
+        """Şifresi önümüzdeki N gün içinde dolacak kullanıcılar (bitiş zamanına göre sıralı)"""
+        now = now or _utc_now()
+        start = float("-inf") if include_expired else now.timestamp()
+        end = (now + timedelta(days=days)).timestamp()
+        with self._lock:
+            low = 0 if include_expired else bisect_left(self._keys, start)
+            high = bisect_right(self._keys, end)
+            records = self._records[low:high]
+        return [
+            self._to_result(r, now) for r in records
+            if include_disabled or r["enabled"]
+        ]
+
+    @staticmethod
+    def _to_result(record: Dict, now: datetime) -> Dict:
+        return {
+            "sam_account_name": record["sam_account_name"],
+            "display_name": record["display_name"],
+            "password_expires": record["expires"].isoformat(),
+            "days_left": (record["expires"] - now).days,
+            "enabled": record["enabled"],
+        }
+
+    def summary(self, now: Optional[datetime] = None) -> Dict:
+        now = now or _utc_now()
+        with self._lock:
+            expired = bisect_left(self._keys, now.timestamp())
+            statuses: Dict[str, int] = {}
+            for record in self._by_sam.values():
+                statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+            return {
+                "total_users": len(self._by_sam),
+                "expired": expired,
+                "never_expires": statuses.get(STATUS_NEVER, 0),
+                "must_change": statuses.get(STATUS_MUST_CHANGE, 0),
+                "max_password_age_days": self.max_pwd_age.days if self.max_pwd_age else None,
+                "built_at": self.built_at.isoformat(),
+            }
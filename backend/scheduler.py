@@ -0,0 +1,180 @@
+"""
+Arka Plan Ön Hesaplama Zamanlayıcısı
+Dashboard ve rapor verilerini (istatistikler, bilgisayar listesi) uygulama yaşam döngüsü
+içinde belirli aralıklarla hesaplar; etkileşimli istekler hazır veriyi kullanır.
+
+- Her iş başlangıçta hemen çalışır (ısınma), sonra aralık ± jitter ile tekrarlanır.
+- Bir iş aynı anda yalnızca bir kez çalışır; o sırada gelen istekler ve tetiklemeler
+  çalışan hesaplamanın sonucunu bekler (yeni bir LDAP taraması başlatılmaz).
+- Hazır veri 2 aralıktan eskiyse (iş takılmış/başarısız) istek anında yeniden hesaplanır.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import Counter, Gauge, Histogram, record_cache_access
+
+logger = logging.getLogger(__name__)
+
+PRECOMPUTE_ENABLED = os.getenv("PRECOMPUTE_ENABLED", "true").lower() == "true"
+# Aralığın bu oranı kadar rastgele sapma (aynı anda başlayan işler DC'ye yığılmasın)
+PRECOMPUTE_JITTER = float(os.getenv("PRECOMPUTE_JITTER", 0.1))
+# Tetiklemeden sonra beklenen süre (art arda gelen değişiklikler tek yenilemede toplanır)
+TRIGGER_DELAY = float(os.getenv("PRECOMPUTE_TRIGGER_DELAY", 2))
+
+JOB_RUNS = Counter(
+    "adpulse_precompute_runs_total", "Ön hesaplama işi çalıştırmaları", ("job", "result")
+)
+JOB_DURATION = Histogram(
+    "adpulse_precompute_duration_seconds", "Ön hesaplama işi süresi", ("job",)
+)
+JOB_LAST_SUCCESS = Gauge(
+    "adpulse_precompute_last_success_timestamp_seconds", "Son başarılı çalıştırmanın zamanı (unix)", ("job",)
+)
+
+
+class Job:
+    """Belirli aralıklarla çalışan tek bir ön hesaplama işi"""
+
+    def __init__(self, name: str, func: Callable[[], Any], interval: float, jitter: float = PRECOMPUTE_JITTER,
+                 refresh_on_change: bool = True):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        # False: isimsiz trigger() (dizin değişikliği) bu işi yenilemez, yalnızca aralıkla çalışır
+        self.refresh_on_change = refresh_on_change
+        self.value: Any = None
+        self.computed_at: Optional[float] = None
+        self.last_run: Optional[str] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._current: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def is_fresh(self) -> bool:
+        return self.computed_at is not None and time.monotonic() - self.computed_at < self.interval * 2
+
+    def next_delay(self) -> float:
+        return max(1.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "running": self._current is not None and not self._current.done(),
+            "fresh": self.is_fresh(),
+            "age_seconds": round(time.monotonic() - self.computed_at, 1) if self.computed_at else None,
+            "last_run": self.last_run,
+            "last_duration_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+            "last_error": self.last_error
+        }
+
+
+class PrecomputeScheduler:
+    """İşleri asyncio döngüsünde zamanlar, hesaplamayı thread havuzunda yapar"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def add_job(self, name: str, func: Callable[[], Any], interval: float, refresh_on_change: bool = True):
+        """İş ekle (start'tan önce)"""
+        self.jobs[name] = Job(name, func, interval, refresh_on_change=refresh_on_change)
+
+    async def _execute(self, job: Job):
+        start = time.perf_counter()
+        job.last_run = datetime.now().isoformat()
+        try:
+            value = await asyncio.to_thread(job.func)
+        except Exception as e:
+            job.last_error = str(e)
+            JOB_RUNS.inc(job=job.name, result="failure")
+            logger.error(f"Ön hesaplama hatası ({job.name}): {str(e)}")
+            raise
+        finally:
+            job.last_duration = time.perf_counter() - start
+            JOB_DURATION.observe(job.last_duration, job=job.name)
+        job.value = value
+        job.computed_at = time.monotonic()
+        job.last_error = None
+        JOB_RUNS.inc(job=job.name, result="success")
+        JOB_LAST_SUCCESS.set(time.time(), job=job.name)
+        return value
+
+    async def run(self, name: str) -> Any:
+        """İşi çalıştır; zaten çalışıyorsa yeni çalıştırma başlatmadan onun sonucunu bekle"""
+        job = self.jobs[name]
+        if job._current is not None and not job._current.done():
+            JOB_RUNS.inc(job=name, result="coalesced")
+        else:
+            job._current = asyncio.ensure_future(self._execute(job))
+        # shield: bekleyen istek iptal edilse de hesaplama tamamlanıp diğerlerine servis edilir
+        return await asyncio.shield(job._current)
+
+    async def get(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Ön hesaplanmış değeri döndür.
+        İş tanımlı değilse (zamanlayıcı kapalı) compute doğrudan çağrılır.
+        """
+        job = self.jobs.get(name)
+        if job is None:
+            return compute()
+        if job.is_fresh():
+            record_cache_access(f"precompute_{name}", True)
+            return job.value
+        record_cache_access(f"precompute_{name}", False)
+        return await self.run(name)
+
+    async def _job_loop(self, job: Job):
+        while True:
+            try:
+                await self.run(job.name)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Hata _execute içinde kaydedildi; bir sonraki aralıkta tekrar denenir
+                pass
+            try:
+                await asyncio.wait_for(job._wake.wait(), job.next_delay())
+                await asyncio.sleep(TRIGGER_DELAY)
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+
+    def trigger(self, *names: str):
+        """
+        İşleri beklemeden yeniden çalıştır (herhangi bir thread'den çağrılabilir).
+        İsim verilmezse değişiklikle yenilenen (refresh_on_change) tüm işler tetiklenir.
+        """
+        if self._loop is None:
+            return
+        for name in names or [job.name for job in self.jobs.values() if job.refresh_on_change]:
+            job = self.jobs.get(name)
+            if job is not None and job._wake is not None:
+                self._loop.call_soon_threadsafe(job._wake.set)
+
+    async def start(self):
+        """Tüm işleri başlat (ilk çalıştırma hemen yapılır)"""
+        self._loop = asyncio.get_running_loop()
+        for job in self.jobs.values():
+            job._wake = asyncio.Event()
+            self._tasks.append(asyncio.create_task(self._job_loop(job), name=f"precompute-{job.name}"))
+        logger.info(f"Ön hesaplama zamanlayıcısı başladı: {', '.join(self.jobs) or '-'}")
+
+    async def stop(self):
+        """Tüm işleri durdur"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._loop = None
+
+    def status(self) -> List[dict]:
+        return [job.to_dict() for job in self.jobs.values()]
@@ -0,0 +1,369 @@
+"""
+Domain Controller Havuzu
+LDAP_SERVER birden fazla DC içerebilir ("dc1.sirket.local,dc2.sirket.local:389,ldaps://dc3")
+ya da SRV biçiminde verilebilir ("srv:sirket.local" / "_ldap._tcp.dc._msdcs.sirket.local").
+
+- Arka planda TCP sağlık kontrolü yapılır; erişilemeyen DC havuzdan çıkarılır,
+  tekrar yanıt verdiğinde geri alınır.
+- Seçim stratejisi: "latency" (en hızlı sağlıklı DC önce) veya "round_robin".
+- Bağlantı kısa connect_timeout ile denenir, zaman aşımında sıradaki DC'ye geçilir.
+- Şema ve DSE bilgisi DC başına bir kez okunup dosyaya yazılır; sonraki bağlantılar
+  yalnızca bind yapar. Şema sürümü (subschema modifyTimestamp) değişirse yenilenir.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ldap3 import Server, ALL, NONE, BASE
+from ldap3.protocol.rfc4512 import DsaInfo, SchemaInfo
+
+from metrics import Counter, Gauge, record_cache_access
+
+logger = logging.getLogger(__name__)
+
+POOL_STRATEGY = os.getenv("LDAP_POOL_STRATEGY", "latency").lower()
+CONNECT_TIMEOUT = float(os.getenv("LDAP_CONNECT_TIMEOUT", 3))
+# ldap3 SO_RCVTIMEO için tam sayı bekler
+RECEIVE_TIMEOUT = int(os.getenv("LDAP_RECEIVE_TIMEOUT", 30))
+PROBE_INTERVAL = float(os.getenv("LDAP_HEALTH_INTERVAL", 30))
+# Gecikme ortalaması için üstel ağırlık (yeni ölçümün payı)
+LATENCY_ALPHA = 0.3
+# Şema/DSE önbellek dizini ve şema sürümünün yeniden kontrol aralığı (saniye)
+SCHEMA_CACHE_DIR = os.getenv("LDAP_SCHEMA_CACHE_DIR") or os.path.join(os.path.dirname(__file__), "schema_cache")
+SCHEMA_CHECK_INTERVAL = float(os.getenv("LDAP_SCHEMA_CHECK_INTERVAL", 3600))
+
+DC_UP = Gauge("adpulse_ldap_dc_up", "Domain controller sağlık durumu (1: sağlıklı)", ("server",))
+DC_LATENCY = Gauge("adpulse_ldap_dc_latency_seconds", "Domain controller gecikmesi (üstel ortalama)", ("server",))
+DC_FAILOVERS = Counter("adpulse_ldap_dc_failovers_total", "Bağlantı kurulamayıp sıradaki DC'ye geçilen denemeler", ("server",))
+
+
+def _parse_server(value: str) -> Tuple[str, int, bool]:
+    """'ldaps://dc1:636' -> ('dc1', 636, True)"""
+    value = value.strip()
+    use_ssl = value.lower().startswith("ldaps://")
+    if "://" in value:
+        value = value.split("://", 1)[1]
+    value = value.rstrip("/")
+    if ":" in value:
+        host, port = value.rsplit(":", 1)
+        return host, int(port), use_ssl
+    return value, 636 if use_ssl else 389, use_ssl
+
+
+def _resolve_srv(name: str) -> List[str]:
+    """
+    SRV kaydından DC listesini çöz.
+    dnspython kuruluysa SRV kaydı (öncelik/ağırlık sırasıyla) kullanılır; değilse AD domain
+    adının A kayıtları tüm DC'leri döndürdüğünden getaddrinfo ile çözülür.
+    """
+    domain = name
+    if domain.startswith("_ldap._tcp."):
+        domain = domain[len("_ldap._tcp."):]
+        if domain.startswith("dc._msdcs."):
+            domain = domain[len("dc._msdcs."):]
+    try:
+        import dns.resolver
+        answers = dns.resolver.resolve(f"_ldap._tcp.dc._msdcs.{domain}", "SRV")
+        records = sorted(answers, key=lambda r: (r.priority, -r.weight))
+        return [f"{str(r.target).rstrip('.')}:{r.port}" for r in records]
+    except ImportError:
+        logger.info("dnspython kurulu değil, DC listesi domain A kayıtlarından çözülüyor")
+    except Exception as e:
+        logger.warning(f"SRV çözümleme hatası ({domain}): {str(e)}")
+    try:
+        addresses = socket.getaddrinfo(domain, 389, proto=socket.IPPROTO_TCP)
+        return list(dict.fromkeys(addr[4][0] for addr in addresses))
+    except Exception as e:
+        logger.error(f"DC listesi çözülemedi ({domain}): {str(e)}")
+        return [domain]
+
+
+def parse_server_list(setting: str) -> List[str]:
+    """LDAP_SERVER değerini DC adreslerine ayır"""
+    setting = (setting or "").strip()
+    if setting.lower().startswith("srv:"):
+        return _resolve_srv(setting[4:].strip())
+    if setting.startswith("_ldap._tcp."):
+        return _resolve_srv(setting)
+    return [part for part in setting.replace(";", ",").replace(" ", ",").split(",") if part]
+
+
+def derive_gc_setting(setting: str) -> str:
+    """
+    LDAP_SERVER'daki DC'lerden Global Catalog adreslerini türet
+    (ldap:// -> 3268, ldaps:// -> 3269). SRV biçiminde _gc._tcp kaydı kullanılır.
+    """
+    setting = (setting or "").strip()
+    if setting.lower().startswith("srv:"):
+        addresses = _resolve_srv(setting[4:].strip())
+    elif setting.startswith("_ldap._tcp."):
+        addresses = _resolve_srv(setting)
+    else:
+        addresses = parse_server_list(setting)
+    gc_addresses = []
+    for address in addresses:
+        host, _, use_ssl = _parse_server(address)
+        gc_addresses.append(f"ldaps://{host}:3269" if use_ssl else f"{host}:3268")
+    return ",".join(gc_addresses)
+
+
+def _first_str(value) -> Optional[str]:
+    """[b'20240101000000.0Z'] -> '20240101000000.0Z'"""
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if isinstance(value, bytes):
+        value = value.decode("utf-8")
+    return str(value) if value else None
+
+
+class DomainController:
+    """Havuzdaki tek bir DC ve sağlık durumu"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.host, self.port, self.use_ssl = _parse_server(address)
+        # get_info=NONE: bind sonrası şema/DSE okunmaz, önbellekten eklenir (bkz. prepare_connection)
+        self.server = Server(
+            self.host,
+            port=self.port,
+            use_ssl=self.use_ssl,
+            get_info=NONE,
+            connect_timeout=CONNECT_TIMEOUT
+        )
+        self.healthy = True
+        self.latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.last_checked: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._info_lock = threading.Lock()
+        # Önbellekteki şemanın sunucuyla son doğrulanma zamanı (0: bu süreçte doğrulanmadı)
+        self._schema_verified_at = 0.0
+        self._load_cached_info()
+
+    def _cache_path(self, kind: str) -> str:
+        name = f"{self.host}_{self.port}".replace(":", "_").replace("/", "_")
+        return os.path.join(SCHEMA_CACHE_DIR, f"{name}.{kind}.json")
+
+    def _load_cached_info(self):
+        """
+        Önceki çalıştırmalardan kalan şema/DSE bilgisini sunucuya ekle.
+        İki dosyadan biri okunamazsa önbellek yok sayılır (ikisi de eklenmez).
+        """
+        if not (os.path.exists(self._cache_path("dsa")) and os.path.exists(self._cache_path("schema"))):
+            return
+        try:
+            dsa_info = DsaInfo.from_file(self._cache_path("dsa"))
+            schema_info = SchemaInfo.from_file(self._cache_path("schema"))
+        except Exception as e:
+            logger.warning(f"Şema önbelleği okunamadı ({self.address}): {str(e)}")
+            return
+        self.server.attach_dsa_info(dsa_info)
+        self.server.attach_schema_info(schema_info)
+
+    def _save_cached_info(self):
+        for kind, info in (("dsa", self.server.info), ("schema", self.server.schema)):
+            # Aynı DC için birden fazla nesne/süreç yazabilir; yazım başına ayrı geçici dosya kullanılır
+            tmp_path = None
+            try:
+                os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=f".{kind}.", suffix=".tmp", dir=SCHEMA_CACHE_DIR)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(info.to_json())
+                os.replace(tmp_path, self._cache_path(kind))
+            except Exception as e:
+                logger.warning(f"Şema önbelleği yazılamadı ({self.address}): {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+
+    def _schema_version(self, conn) -> Optional[str]:
+        """Sunucudaki şemanın sürümü (subschema girdisinin modifyTimestamp değeri)"""
+        entry = self.server.schema.schema_entry if self.server.schema else None
+        if not entry:
+            return None
+        conn.search(entry, "(objectClass=subschema)", BASE, attributes=["modifyTimestamp"])
+        if not conn.response:
+            return None
+        # Ham değer kullanılır; biçimlendirilmiş değer şemaya göre datetime olabilir
+        return _first_str(conn.response[0].get("raw_attributes", {}).get("modifyTimestamp"))
+
+    def prepare_connection(self, conn):
+        """
+        Bind edilmiş bağlantı için şema/DSE bilgisinin hazır olmasını sağla.
+        Önbellek bu süreçte doğrulandıysa hiçbir ek istek yapılmaz; aksi halde tek bir küçük
+        sürüm sorgusu yapılır ve yalnızca sürüm değiştiyse tüm şema yeniden indirilir.
+        """
+        if not conn.strategy.sync:
+            # Asenkron (bildirim) bağlantıları sunucu nesnesindeki mevcut şemayı kullanır
+            return
+        if self._schema_verified_at and time.monotonic() - self._schema_verified_at < SCHEMA_CHECK_INTERVAL:
+            record_cache_access("ldap_schema", True)
+            return
+        with self._info_lock:
+            if self._schema_verified_at and time.monotonic() - self._schema_verified_at < SCHEMA_CHECK_INTERVAL:
+                record_cache_access("ldap_schema", True)
+                return
+            cached_version = _first_str(self.server.schema.modify_time_stamp) if self.server.schema else None
+            if cached_version and self.server.info:
+                try:
+                    if self._schema_version(conn) == cached_version:
+                        self._schema_verified_at = time.monotonic()
+                        record_cache_access("ldap_schema", True)
+                        return
+                except Exception as e:
+                    logger.warning(f"Şema sürümü okunamadı ({self.address}): {str(e)}")
+            record_cache_access("ldap_schema", False)
+            logger.info(f"Şema ve sunucu bilgisi indiriliyor: {self.address}")
+            self.server.get_info = ALL
+            try:
+                conn.refresh_server_info()
+            except Exception as e:
+                # Şema olmadan da çalışılabilir (attribute adı denetimi yapılmaz)
+                logger.warning(f"Şema okunamadı ({self.address}): {str(e)}")
+            finally:
+                self.server.get_info = NONE
+            if self.server.info and self.server.schema:
+                self._save_cached_info()
+                self._schema_verified_at = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "server": self.address,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error
+        }
+
+
+class DomainControllerPool:
+    """DC seçimi, hata sonrası geçiş ve sağlık kontrolü"""
+
+    def __init__(self, addresses: List[str], strategy: str = POOL_STRATEGY,
+                 probe_interval: float = PROBE_INTERVAL, track_metrics: bool = True):
+        self.controllers = [DomainController(address) for address in addresses]
+        self.strategy = strategy
+        self.probe_interval = probe_interval
+        # Geçici havuzlar (ör. bağlantı testi) metriklere sunucu etiketi eklemez
+        self.track_metrics = track_metrics
+        self._lock = threading.Lock()
+        self._next = 0
+        self._probe_thread: Optional[threading.Thread] = None
+        if self.track_metrics:
+            for dc in self.controllers:
+                DC_UP.set(1, server=dc.address)
+
+    def candidates(self) -> List[DomainController]:
+        """
+        Denenecek DC'ler sırasıyla: önce sağlıklılar (stratejiye göre sıralı), sonra
+        sağlıksızlar (hepsi düşmüşse yine de denenir).
+        """
+        with self._lock:
+            healthy = [dc for dc in self.controllers if dc.healthy]
+            unhealthy = [dc for dc in self.controllers if not dc.healthy]
+            if self.strategy == "round_robin" and healthy:
+                start = self._next % len(healthy)
+                self._next += 1
+                healthy = healthy[start:] + healthy[:start]
+            else:
+                # Ölçümü olmayan DC'ler bir kez denenebilsin diye öne alınır
+                healthy.sort(key=lambda dc: dc.latency if dc.latency is not None else -1)
+            unhealthy.sort(key=lambda dc: dc.consecutive_failures)
+            return healthy + unhealthy
+
+    def _record_latency(self, dc: DomainController, latency: float):
+        # Yalnızca TCP yoklama süresi kullanılır; bind süresi şema okumasını da içerdiğinden karşılaştırılamaz
+        dc.latency = latency if dc.latency is None else (1 - LATENCY_ALPHA) * dc.latency + LATENCY_ALPHA * latency
+        if self.track_metrics:
+            DC_LATENCY.set(dc.latency, server=dc.address)
+
+    def mark_success(self, dc: DomainController, latency: Optional[float] = None):
+        """DC yanıt verdi: sağlıklı say, gecikmeyi güncelle"""
+        with self._lock:
+            if not dc.healthy:
+                logger.info(f"DC tekrar havuza alındı: {dc.address}")
+            dc.healthy = True
+            dc.consecutive_failures = 0
+            dc.last_error = None
+            dc.last_checked = datetime.now().isoformat()
+            if latency is not None:
+                self._record_latency(dc, latency)
+        if self.track_metrics:
+            DC_UP.set(1, server=dc.address)
+
+    def mark_failure(self, dc: DomainController, error: Exception, failover: bool = True):
+        """DC'ye ulaşılamadı: havuzdan çıkar"""
+        with self._lock:
+            if dc.healthy:
+                logger.warning(f"DC havuzdan çıkarıldı: {dc.address} ({str(error)})")
+            dc.healthy = False
+            dc.consecutive_failures += 1
+            dc.last_error = str(error)
+            dc.last_checked = datetime.now().isoformat()
+        if self.track_metrics:
+            DC_UP.set(0, server=dc.address)
+            if failover:
+                DC_FAILOVERS.inc(server=dc.address)
+
+    def probe(self):
+        """Tüm DC'lere TCP bağlantısı açarak sağlık ve gecikmeyi ölç"""
+        for dc in list(self.controllers):
+            start = time.perf_counter()
+            try:
+                with socket.create_connection((dc.host, dc.port), timeout=CONNECT_TIMEOUT):
+                    pass
+                self.mark_success(dc, time.perf_counter() - start)
+            except Exception as e:
+                self.mark_failure(dc, e, failover=False)
+
+    def _probe_loop(self):
+        # İlk ölçüm hemen yapılır ki gecikme sıralaması ilk isteklerden itibaren geçerli olsun
+        while True:
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"DC sağlık kontrolü hatası: {str(e)}")
+            time.sleep(self.probe_interval)
+
+    def start(self):
+        """Birden fazla DC varsa arka plan sağlık kontrolünü başlat"""
+        with self._lock:
+            if self._probe_thread or len(self.controllers) < 2 or self.probe_interval <= 0:
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="dc-health-probe", daemon=True)
+            self._probe_thread.start()
+
+    def status(self) -> List[dict]:
+        with self._lock:
+            return [dc.to_dict() for dc in self.controllers]
+
+
+_pools: Dict[str, DomainControllerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_dc_pool(setting: str) -> DomainControllerPool:
+    """LDAP_SERVER değeri başına tek bir havuz (süreç boyunca paylaşılır)"""
+    with _pools_lock:
+        pool = _pools.get(setting)
+        if pool is None:
+            pool = DomainControllerPool(parse_server_list(setting))
+            _pools[setting] = pool
+            pool.start()
+        return pool
+
+
+def create_transient_pool(setting: str) -> DomainControllerPool:
+    """
+    Kayda alınmayan, sağlık kontrolü ve metrik üretmeyen havuz.
+    Kullanıcının girdiği sunucularla yapılan tek seferlik bağlantılar (bağlantı testi) içindir;
+    bağlantıyla birlikte çöpe gider.
+    """
+    return DomainControllerPool(parse_server_list(setting), probe_interval=0, track_metrics=False)
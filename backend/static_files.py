@@ -0,0 +1,189 @@
+"""
+Frontend Statik Dosyaları
+frontend/dist başlangıçta bir kez taranır; istekler bellekteki dosya tablosundan karşılanır
+(istek başına dosya sistemi yoklaması yapılmaz).
+
+- assets/ altındaki dosyaların adları Vite tarafından içerik hash'i ile üretilir: bir yıl
+  boyunca "immutable" önbelleğe alınır. index.html ve diğer kök dosyalar her seferinde ETag ile
+  doğrulanır (değişmediyse 304).
+- Dosyanın yanında .br / .gz sürümü varsa (build_exe.py paketlemeden önce üretir) Accept-Encoding'e
+  göre o gönderilir. .gz yoksa sıkıştırılabilir dosyaların gzip'i başlangıçta bellekte üretilir;
+  brotli modülü kuruluysa .br için de aynısı yapılır.
+"""
+
+import os
+import gzip
+import logging
+import mimetypes
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Hash'li dosyaların önbellek süresi (1 yıl)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Bundan küçük dosyalar sıkıştırılmaz (başlık maliyeti kazançtan büyük)
+COMPRESS_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml",
+                      "application/manifest+json", "application/xml")
+# Tercih sırası: brotli daha küçük, gzip her tarayıcıda var
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+mimetypes.add_type("application/javascript", ".js")
+mimetypes.add_type("application/javascript", ".mjs")
+mimetypes.add_type("image/svg+xml", ".svg")
+
+
+def _compressible(media_type: str) -> bool:
+    return media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _compress(encoding: str, data: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    # mtime=0: aynı içerik her başlangıçta aynı çıktıyı verir
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding başlığı: {kodlama: q}"""
+    accepted = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+class StaticFile:
+    """Tek bir frontend dosyası ve sıkıştırılmış sürümleri"""
+
+    __slots__ = ("path", "media_type", "etag", "cache_control", "files", "memory")
+
+    def __init__(self, path: str, media_type: str, etag: str, cache_control: str):
+        self.path = path
+        self.media_type = media_type
+        self.etag = etag
+        self.cache_control = cache_control
+        # kodlama -> diskteki önceden sıkıştırılmış dosya
+        self.files: Dict[str, str] = {}
+        # kodlama -> bellekte sıkıştırılmış içerik
+        self.memory: Dict[str, bytes] = {}
+
+    def variant(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[bytes]]:
+        """(kodlama, dosya yolu, bellekteki içerik); uygun sürüm yoksa kodlama None"""
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, _ in ENCODINGS:
+            # Açıkça q=0 verilen kodlama "*" ile kabul edilmiş sayılmaz
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                if encoding in self.files:
+                    return encoding, self.files[encoding], None
+                if encoding in self.memory:
+                    return encoding, None, self.memory[encoding]
+        return None, self.path, None
+
+
+class FrontendFiles:
+    """frontend/dist dosya tablosu"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.files: Dict[str, StaticFile] = {}
+        self.index: Optional[StaticFile] = None
+        self._scan()
+
+    def _scan(self):
+        compressed_bytes = 0
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith((".br", ".gz")):
+                    continue
+                path = os.path.join(root, name)
+                url_path = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                stat = os.stat(path)
+                media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                if media_type == "application/javascript":
+                    # text/* türlerine Starlette charset'i kendisi ekler
+                    media_type += "; charset=utf-8"
+                cache_control = IMMUTABLE_CACHE_CONTROL if url_path.startswith("assets/") else REVALIDATE_CACHE_CONTROL
+                static_file = StaticFile(path, media_type, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"', cache_control)
+                data = None
+                for encoding, suffix in ENCODINGS:
+                    if os.path.isfile(path + suffix):
+                        static_file.files[encoding] = path + suffix
+                    elif stat.st_size >= COMPRESS_MIN_SIZE and _compressible(media_type) \
+                            and (encoding == "gzip" or brotli is not None):
+                        if data is None:
+                            with open(path, "rb") as f:
+                                data = f.read()
+                        compressed = _compress(encoding, data)
+                        if len(compressed) < len(data):
+                            static_file.memory[encoding] = compressed
+                            compressed_bytes += len(compressed)
+                self.files[url_path] = static_file
+        self.index = self.files.get("index.html")
+        logger.info(f"Frontend dosyaları yüklendi: {len(self.files)} dosya, "
+                    f"bellekte {compressed_bytes // 1024} KB sıkıştırılmış içerik")
+
+    def response(self, full_path: str, request: Request) -> Response:
+        """Dosyayı (bilinmeyen yollarda SPA için index.html) en uygun kodlamayla döndür"""
+        static_file = self.files.get(full_path) or self.index
+        if static_file is None:
+            return Response(status_code=404)
+        headers = {
+            "Cache-Control": static_file.cache_control,
+            "ETag": static_file.etag,
+            "Vary": "Accept-Encoding",
+        }
+        if static_file.etag in (request.headers.get("if-none-match") or ""):
+            return Response(status_code=304, headers=headers)
+        encoding, path, content = static_file.variant(request.headers.get("accept-encoding"))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if content is not None:
+            return Response(content, media_type=static_file.media_type, headers=headers)
+        # FileResponse yalnızca eksik başlıkları ekler; buradaki ETag korunur
+        return FileResponse(path, media_type=static_file.media_type, headers=headers)
+
+
+def precompress(directory: str) -> int:
+    """
+    Sıkıştırılabilir dosyaların .gz (ve brotli kuruluysa .br) sürümlerini diske yaz
+    (paketlemeden önce). Yazılan dosya sayısını döndürür.
+    """
+    written = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith((".br", ".gz")):
+                continue
+            path = os.path.join(root, name)
+            media_type = mimetypes.guess_type(name)[0] or ""
+            if os.path.getsize(path) < COMPRESS_MIN_SIZE or not _compressible(media_type):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            for encoding, suffix in ENCODINGS:
+                if encoding == "br" and brotli is None:
+                    continue
+                compressed = _compress(encoding, data)
+                if len(compressed) < len(data):
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+                    written += 1
+    return written
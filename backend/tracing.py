@@ -0,0 +1,230 @@
+"""
+LDAP İzleme Modülü
+İstek başına LDAP işlemlerini (search/modify/add/delete/modify_dn) kaydeder ve
+aynı biçimdeki sorguların tek istekte tekrarlanmasını (N+1) işaretler.
+
+İzleme isteğe bağlıdır: LDAP_TRACE=true ile tüm istekler için ya da
+"X-LDAP-Trace: 1" başlığıyla tek bir istek için açılır. Özet yanıt başlıklarında
+döner, ayrıntılar /api/debug/trace/{trace_id} üzerinden okunur.
+"""
+
+import os
+import re
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_ALL_REQUESTS = os.getenv("LDAP_TRACE", "false").lower() == "true"
+# Aynı biçimdeki sorgu bir istekte bu sayıya ulaşırsa N+1 olarak işaretlenir
+REPEAT_THRESHOLD = int(os.getenv("LDAP_TRACE_REPEAT_THRESHOLD", 5))
+# Bellekte tutulan son izleme sayısı
+MAX_STORED_TRACES = int(os.getenv("LDAP_TRACE_HISTORY", 200))
+
+TRACE_REQUEST_HEADER = b"x-ldap-trace"
+TRACE_ID_HEADER = b"x-ldap-trace-id"
+TRACE_SUMMARY_HEADER = b"x-ldap-trace-summary"
+
+# Filtre içindeki değerleri "?" ile değiştirerek sorgu biçimini çıkarır
+_FILTER_VALUE_RE = re.compile(r"(<=|>=|~=|=)[^()]*\)")
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("ldap_trace", default=None)
+
+
+def filter_shape(search_filter: str) -> str:
+    """(&(objectClass=group)(member=CN=x,...)) -> (&(objectClass=?)(member=?))"""
+    return _FILTER_VALUE_RE.sub(lambda m: m.group(1) + "?)", search_filter or "")
+
+
+class RequestTrace:
+    """Tek bir HTTP isteği sırasında yapılan LDAP işlemleri"""
+
+    def __init__(self, method: str, path: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now().isoformat()
+        self.status_code: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+        self.operations: List[Dict] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, operation: Dict):
+        with self._lock:
+            operation["offset_ms"] = round((time.perf_counter() - self._start) * 1000 - operation["duration_ms"], 3)
+            self.operations.append(operation)
+
+    def finish(self, status_code: int):
+        self.status_code = status_code
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+
+    def repeated_queries(self) -> List[Dict]:
+        """Aynı biçimde (op + filtre biçimi + attribute'lar) tekrarlanan işlemleri bul"""
+        groups: Dict[tuple, Dict] = {}
+        with self._lock:
+            operations = list(self.operations)
+        for op in operations:
+            key = (op["op"], op.get("filter_shape", ""), tuple(op.get("attributes") or ()))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    "op": op["op"],
+                    "filter_shape": op.get("filter_shape", ""),
+                    "attributes": op.get("attributes"),
+                    "callers": [],
+                    "count": 0,
+                    "total_ms": 0.0,
+                }
+            group["count"] += 1
+            group["total_ms"] += op["duration_ms"]
+            if op["caller"] not in group["callers"]:
+                group["callers"].append(op["caller"])
+        flagged = [g for g in groups.values() if g["count"] >= REPEAT_THRESHOLD]
+        for group in flagged:
+            group["total_ms"] = round(group["total_ms"], 3)
+        return sorted(flagged, key=lambda g: g["count"], reverse=True)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            operations = list(self.operations)
+        by_op: Dict[str, int] = {}
+        for op in operations:
+            by_op[op["op"]] = by_op.get(op["op"], 0) + 1
+        return {
+            "ops": len(operations),
+            "by_op": by_op,
+            "ldap_ms": round(sum(op["duration_ms"] for op in operations), 3),
+            "entries": sum(op.get("entries", 0) for op in operations),
+            "repeated": len(self.repeated_queries()),
+        }
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            operations = list(self.operations)
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "summary": self.summary(),
+            "repeated_queries": self.repeated_queries(),
+            "operations": operations,
+        }
+
+
+class TraceStore:
+    """Son izlemeleri sınırlı bir sözlükte tutar (en eski önce silinir)"""
+
+    def __init__(self, max_items: int = MAX_STORED_TRACES):
+        self.max_items = max_items
+        self._traces: "OrderedDict[str, RequestTrace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, trace: RequestTrace):
+        with self._lock:
+            self._traces[trace.trace_id] = trace
+            while len(self._traces) > self.max_items:
+                self._traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> Optional[RequestTrace]:
+        with self._lock:
+            return self._traces.get(trace_id)
+
+    def recent(self, limit: int = 50) -> List[RequestTrace]:
+        with self._lock:
+            return list(reversed(self._traces.values()))[:limit]
+
+
+trace_store = TraceStore()
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Aktif isteğin izlemesi (izleme kapalıysa None)"""
+    return _current_trace.get()
+
+
+def record_operation(op: str, caller: str, base: str, duration_ms: float,
+                     search_filter: Optional[str] = None, attributes=None,
+                     entries: int = 0, result: Optional[str] = None):
+    """Aktif izleme varsa LDAP işlemini kaydet"""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    if attributes is not None and not isinstance(attributes, (list, tuple)):
+        attributes = [str(attributes)]
+    operation = {
+        "op": op,
+        "caller": caller,
+        "base": base,
+        "duration_ms": round(duration_ms, 3),
+        "entries": entries,
+        "result": result,
+    }
+    if search_filter is not None:
+        operation["filter"] = search_filter
+        operation["filter_shape"] = filter_shape(search_filter)
+    if attributes is not None:
+        operation["attributes"] = [str(a) for a in attributes]
+    trace.record(operation)
+
+
+class LDAPTraceMiddleware:
+    """
+    Saf ASGI middleware: izleme açıksa istek için RequestTrace oluşturur,
+    yanıta X-LDAP-Trace-Id ve X-LDAP-Trace-Summary başlıklarını ekler.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _enabled(self, scope) -> bool:
+        if TRACE_ALL_REQUESTS:
+            return True
+        for name, value in scope.get("headers", []):
+            if name == TRACE_REQUEST_HEADER:
+                return value.lower() in (b"1", b"true", b"yes")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope.get("method", ""), scope.get("path", ""))
+        token = _current_trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.finish(message["status"])
+                summary = trace.summary()
+                header = (
+                    f"ops={summary['ops']}; ldap_ms={summary['ldap_ms']}; "
+                    f"entries={summary['entries']}; repeated={summary['repeated']}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((TRACE_ID_HEADER, trace.trace_id.encode()))
+                headers.append((TRACE_SUMMARY_HEADER, header.encode()))
+                message = {**message, "headers": headers}
+                for group in trace.repeated_queries():
+                    logger.warning(
+                        f"Tekrarlanan LDAP sorgusu ({trace.method} {trace.path}): "
+                        f"{group['count']}x {group['op']} {group['filter_shape']} <- {', '.join(group['callers'])}"
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if trace.duration_ms is None:
+                trace.finish(500)
+            trace_store.add(trace)
+            _current_trace.reset(token)
@@ -6,7 +6,8 @@ import type {
   DashboardStats, AuditLogsResponse, AuditStatistics, ADChangesResponse,
   PasswordExpiryReport, InactiveComputersReport, ComputerInventoryReport,
   UserPaginatedResponse, ComputerPaginatedResponse, OUInfo,
-  GroupCreateRequest, ComputerMoveRequest
+  GroupCreateRequest, GroupMembersSetRequest, GroupMembersSetResult, ComputerMoveRequest, BulkComputerMoveRequest, BulkComputerMoveResponse, AuditLogEntry, DirectoryChangeEvent, BulkMoveProgressEvent,
+  LookupObjectType, LookupResponse, UserOverview
 } from '../types';
 
 const api = axios.create({
@@ -26,7 +27,7 @@ export const userApi = {
     return response.data;
   },
 
-  getUsersPaginated: async (params: { page?: number; page_size?: number; group?: string; search?: string }): Promise<UserPaginatedResponse> => {
+  getUsersPaginated: async (params: { page?: number; page_size?: number; group?: string; search?: string; sort_by?: 'sam_account_name' | 'display_name'; start_with?: string }): Promise<UserPaginatedResponse> => {
     const response = await api.get<UserPaginatedResponse>('/users/paginated', { params });
     return response.data;
   },
@@ -36,6 +37,13 @@ export const userApi = {
     return response.data;
   },
 
+  // Kullanıcı, gruplar listesi ve son audit kayıtları tek istekte
+  getUserOverview: async (samAccountName: string, historyLimit?: number): Promise<UserOverview> => {
+    const params = historyLimit ? { history_limit: historyLimit } : undefined;
+    const response = await api.get<UserOverview>(`/users/${samAccountName}/overview`, { params });
+    return response.data;
+  },
+
   resetPassword: async (samAccountName: string, request: PasswordResetRequest): Promise<void> => {
     await api.post(`/users/${samAccountName}/reset-password`, request);
   },
@@ -77,6 +85,11 @@ export const groupApi = {
     await api.post(`/groups/${groupName}/members/remove`, request);
   },
 
+  setGroupMembers: async (groupName: string, request: GroupMembersSetRequest): Promise<GroupMembersSetResult> => {
+    const response = await api.put<GroupMembersSetResult>(`/groups/${groupName}/members`, request);
+    return response.data;
+  },
+
   createGroup: async (request: GroupCreateRequest): Promise<void> => {
     await api.post('/groups', request);
   },
@@ -96,7 +109,7 @@ export const computerApi = {
     return response.data;
   },
 
-  getComputersPaginated: async (params: { page?: number; page_size?: number; search?: string; ou?: string }): Promise<ComputerPaginatedResponse> => {
+  getComputersPaginated: async (params: { page?: number; page_size?: number; search?: string; ou?: string; start_with?: string }): Promise<ComputerPaginatedResponse> => {
     const response = await api.get<ComputerPaginatedResponse>('/computers/paginated', { params });
     return response.data;
   },
@@ -122,6 +135,11 @@ export const computerApi = {
     await api.post(`/computers/${samAccountName}/move`, request);
   },
 
+  bulkMoveComputers: async (request: BulkComputerMoveRequest): Promise<BulkComputerMoveResponse> => {
+    const response = await api.post<BulkComputerMoveResponse>('/computers/bulk-move', request);
+    return response.data;
+  },
+
   getOUs: async (): Promise<OUInfo[]> => {
     const response = await api.get<OUInfo[]>('/ous');
     return response.data;
@@ -203,4 +221,55 @@ export const reportsApi = {
   },
 };
 
+// Canlı olaylar (Server-Sent Events)
+export interface EventHandlers {
+  onAudit?: (entry: AuditLogEntry) => void;
+  onDirectoryChange?: (event: DirectoryChangeEvent) => void;
+  onBulkMove?: (event: BulkMoveProgressEvent) => void;
+  // Kaçan olaylar iletilemedi: liste baştan yüklenmeli
+  onResync?: () => void;
+}
+
+// Otomatik tamamlama: her yeni sorgu aynı oturumun tamamlanmamış önceki sorgusunu iptal eder
+const lookupSession = Math.random().toString(36).slice(2);
+let lookupController: AbortController | null = null;
+
+export const lookupApi = {
+  lookup: async (q: string, types?: LookupObjectType[], limit?: number): Promise<LookupResponse> => {
+    lookupController?.abort();
+    const controller = new AbortController();
+    lookupController = controller;
+    const response = await api.get<LookupResponse>('/lookup', {
+      params: { q, types: types?.join(','), limit, session: lookupSession },
+      signal: controller.signal,
+    });
+    return response.data;
+  },
+};
+
+export const eventsApi = {
+  // Tarayıcı bağlantı koparsa Last-Event-ID ile otomatik yeniden bağlanır
+  subscribe: (handlers: EventHandlers): (() => void) => {
+    const types = [
+      handlers.onAudit ? 'audit' : null,
+      handlers.onDirectoryChange ? 'directory_change' : null,
+      handlers.onBulkMove ? 'bulk_move' : null,
+    ].filter(Boolean).join(',');
+    const source = new EventSource(`/api/events?types=${types}`);
+
+    if (handlers.onAudit) {
+      source.addEventListener('audit', (e) => handlers.onAudit!(JSON.parse((e as MessageEvent).data)));
+    }
+    if (handlers.onDirectoryChange) {
+      source.addEventListener('directory_change', (e) => handlers.onDirectoryChange!(JSON.parse((e as MessageEvent).data)));
+    }
+    if (handlers.onBulkMove) {
+      source.addEventListener('bulk_move', (e) => handlers.onBulkMove!(JSON.parse((e as MessageEvent).data)));
+    }
+    source.addEventListener('resync', () => handlers.onResync?.());
+
+    return () => source.close();
+  },
+};
+
 export default api;
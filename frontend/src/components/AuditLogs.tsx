@@ -1,5 +1,5 @@
-import { useState, useEffect } from 'react';
-import { auditApi, changesApi } from '../api/client';
+import { useState, useEffect, useRef } from 'react';
+import { auditApi, changesApi, eventsApi } from '../api/client';
 import type { AuditLogEntry, AuditLogsResponse, ADChange, ADChangesResponse } from '../types';
 import {
     ClockIcon,
@@ -84,6 +84,49 @@ const AuditLogs = () => {
         }
     }, [activeTab, offset, actionType, targetType, source, startDate, endDate, adChangesHours]);
 
+    // Canlı güncellemeler: yeni kayıtlar ilk sayfaya eklenir, AD değişikliklerinde liste yenilenir
+    const liveState = useRef({ activeTab, offset, filtered: false });
+    liveState.current = {
+        activeTab,
+        offset,
+        filtered: Boolean(search || actionType || targetType || source || startDate || endDate)
+    };
+    const loadRef = useRef({ loadLogs, loadAdChanges });
+    loadRef.current = { loadLogs, loadAdChanges };
+
+    useEffect(() => {
+        let changeTimer: ReturnType<typeof setTimeout> | undefined;
+        const unsubscribe = eventsApi.subscribe({
+            onAudit: (entry) => {
+                const state = liveState.current;
+                if (state.activeTab !== 'app_logs' || state.offset !== 0) return;
+                if (state.filtered) {
+                    loadRef.current.loadLogs();
+                    return;
+                }
+                setLogs((prev) => [entry, ...prev].slice(0, limit));
+                setTotalCount((prev) => prev + 1);
+            },
+            onDirectoryChange: () => {
+                if (liveState.current.activeTab !== 'ad_changes') return;
+                // Art arda gelen değişiklikler tek yüklemede toplanır
+                clearTimeout(changeTimer);
+                changeTimer = setTimeout(() => loadRef.current.loadAdChanges(), 2000);
+            },
+            onResync: () => {
+                if (liveState.current.activeTab === 'app_logs') {
+                    loadRef.current.loadLogs();
+                } else {
+                    loadRef.current.loadAdChanges();
+                }
+            },
+        });
+        return () => {
+            clearTimeout(changeTimer);
+            unsubscribe();
+        };
+    }, []);
+
     const handleSearch = (e: React.FormEvent) => {
         e.preventDefault();
         setOffset(0);
@@ -103,6 +146,7 @@ const AuditLogs = () => {
             'computer_group_remove': 'Bilgisayar Gruptan Çıkarma',
             'member_add': 'Üye Ekleme',
             'member_remove': 'Üye Çıkarma',
+            'member_sync': 'Üyelik Eşitleme',
             'ad_change_detected': 'AD Değişiklik Tespit'
         };
         return labels[action] || action;
@@ -326,6 +326,7 @@ const Reports = () => {
                                             <option value={7}>7 gün</option>
                                             <option value={14}>14 gün</option>
                                             <option value={30}>30 gün</option>
+                                            <option value={90}>90 gün</option>
                                         </select>
                                     </div>
                                 </div>
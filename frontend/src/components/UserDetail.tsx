@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
-import { userApi, groupApi } from '../api/client';
-import type { UserInfo, GroupInfo } from '../types';
+import { userApi } from '../api/client';
+import type { UserInfo, GroupInfo, AuditLogEntry } from '../types';
 import {
   ArrowLeftIcon,
   KeyIcon,
@@ -10,6 +10,7 @@ import {
   UserGroupIcon,
   XMarkIcon,
   CheckIcon,
+  ClockIcon,
 } from '@heroicons/react/24/outline';
 import Alert from './Alert';
 
@@ -17,6 +18,7 @@ export default function UserDetail() {
   const { samAccountName } = useParams<{ samAccountName: string }>();
   const [user, setUser] = useState<UserInfo | null>(null);
   const [allGroups, setAllGroups] = useState<GroupInfo[]>([]);
+  const [recentActivity, setRecentActivity] = useState<AuditLogEntry[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
@@ -31,7 +33,6 @@ export default function UserDetail() {
   useEffect(() => {
     if (samAccountName) {
       loadUserData();
-      loadGroups();
     }
   }, [samAccountName]);
 
@@ -40,8 +41,10 @@ export default function UserDetail() {
     try {
       setLoading(true);
       setError(null);
-      const userData = await userApi.getUser(samAccountName);
-      setUser(userData);
+      const overview = await userApi.getUserOverview(samAccountName, 10);
+      setUser(overview.user);
+      setAllGroups(overview.groups);
+      setRecentActivity(overview.recent_activity);
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Kullanıcı bilgileri yüklenirken bir hata oluştu');
     } finally {
@@ -49,15 +52,6 @@ export default function UserDetail() {
     }
   };
 
-  const loadGroups = async () => {
-    try {
-      const groupsData = await groupApi.getGroups();
-      setAllGroups(groupsData);
-    } catch (err) {
-      console.error('Gruplar yüklenirken hata:', err);
-    }
-  };
-
   const handlePasswordReset = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!samAccountName || !newPassword) return;
@@ -127,6 +121,14 @@ export default function UserDetail() {
     }
   };
 
+  const actionLabels: Record<string, string> = {
+    'password_reset': 'Şifre Sıfırlama',
+    'account_enable': 'Hesap Aktif',
+    'account_disable': 'Hesap Devre Dışı',
+    'group_add': 'Gruba Ekleme',
+    'group_remove': 'Gruptan Çıkarma',
+  };
+
   const availableGroups = allGroups.filter(
     (group) => !user?.groups.includes(group.name)
   );
@@ -366,6 +368,31 @@ export default function UserDetail() {
               </button>
             </div>
           </div>
+
+          {/* Son İşlemler */}
+          <div className="bg-white rounded-lg shadow-sm p-6">
+            <h2 className="text-lg font-semibold text-gray-900 mb-4 flex items-center">
+              <ClockIcon className="w-5 h-5 mr-2" />
+              Son İşlemler
+            </h2>
+            {recentActivity.length === 0 ? (
+              <p className="text-sm text-gray-500">Kayıt yok</p>
+            ) : (
+              <ul className="divide-y divide-gray-100">
+                {recentActivity.map((entry) => (
+                  <li key={entry.id} className="py-2">
+                    <div className="flex items-center justify-between">
+                      <span className={`text-sm font-medium ${entry.success ? 'text-gray-900' : 'text-red-600'}`}>
+                        {actionLabels[entry.action_type] || entry.action_type}
+                      </span>
+                      <span className="text-xs text-gray-500">{entry.performed_by}</span>
+                    </div>
+                    <p className="text-xs text-gray-500">{formatDate(entry.timestamp)}</p>
+                  </li>
+                ))}
+              </ul>
+            )}
+          </div>
         </div>
       </div>
 
@@ -86,6 +86,56 @@ export interface ComputerMoveRequest {
   target_ou_dn: string;
 }
 
+export interface GroupMembersSetRequest {
+  sam_account_names: string[];
+  dry_run?: boolean;
+}
+
+export interface GroupMembersSetResult {
+  group_name: string;
+  group_dn: string;
+  added: string[];
+  removed: string[];
+  unchanged: number;
+  preserved: number;
+  not_found: string[];
+  operations: number;
+  dry_run: boolean;
+}
+
+export interface BulkComputerMoveRequest {
+  sam_account_names: string[];
+  target_ou_dn: string;
+  max_workers?: number;
+  operation_id?: string;
+}
+
+export interface BulkMoveItemResult {
+  sam_account_name: string;
+  success: boolean;
+  skipped: boolean;
+  error: string | null;
+  old_dn: string | null;
+  new_dn: string | null;
+}
+
+export interface BulkComputerMoveResponse {
+  operation_id: string;
+  target_ou_dn: string;
+  total: number;
+  moved: number;
+  skipped: number;
+  failed: number;
+  results: BulkMoveItemResult[];
+}
+
+export interface BulkMoveProgressEvent {
+  operation_id: string;
+  done: number;
+  total: number;
+  item: BulkMoveItemResult;
+}
+
 export interface OUInfo {
   name: string;
   distinguished_name: string;
@@ -93,6 +143,21 @@ export interface OUInfo {
   path: string;
 }
 
+export type LookupObjectType = 'user' | 'group' | 'computer';
+
+export interface LookupResult {
+  type: LookupObjectType;
+  name: string;
+  sam_account_name: string;
+}
+
+export interface LookupResponse {
+  query: string;
+  results: LookupResult[];
+  source: 'index' | 'anr';
+  superseded?: boolean;
+}
+
 export interface GroupCreateRequest {
   name: string;
   description?: string;
@@ -167,6 +232,7 @@ export type AuditActionType =
   | 'computer_group_remove'
   | 'member_add'
   | 'member_remove'
+  | 'member_sync'
   | 'group_create'
   | 'group_delete'
   | 'computer_move'
@@ -194,6 +260,12 @@ export interface AuditLogsResponse {
   offset: number;
 }
 
+export interface UserOverview {
+  user: UserInfo;
+  groups: GroupInfo[];
+  recent_activity: AuditLogEntry[];
+}
+
 export interface AuditStatistics {
   total_actions: number;
   actions_by_type: Record<string, number>;
@@ -213,6 +285,19 @@ export interface ADChange {
   change_type: 'created' | 'modified';
 }
 
+export interface DirectoryChangeEvent {
+  type: 'directory_change';
+  dn?: string;
+  object_type?: 'user' | 'computer' | 'group' | 'ou' | 'other';
+  sam_account_name?: string | null;
+  name?: string | null;
+  usn?: number | null;
+  when_changed?: string | null;
+  deleted?: boolean;
+  resync?: boolean;
+  source: string;
+}
+
 export interface ADChangesResponse {
   changes: ADChange[];
   total_count: number;
@@ -225,9 +310,19 @@ export interface PasswordExpiryReport {
     sam_account_name: string;
     display_name: string;
     days_left: number;
+    password_expires?: string;
+    enabled?: boolean;
   }>;
   total_count: number;
   days_threshold: number;
+  summary?: {
+    total_users: number;
+    expired: number;
+    never_expires: number;
+    must_change: number;
+    max_password_age_days: number | null;
+    built_at: string;
+  };
 }
 
 export interface InactiveComputersReport {